@@ -0,0 +1,34 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from modeles import Membre, Tache
+
+# Origine commune des plannings construits par les tests
+DEBUT = datetime(2024, 1, 1)
+
+
+def creer_tache(
+    nom: str,
+    jours: int,
+    responsable: Membre,
+    debut: datetime = DEBUT,
+    statut: str = "Non commencée",
+) -> Tache:
+    return Tache(nom, "", debut, debut + timedelta(days=jours), responsable, statut)
+
+
+def creer_reseau(
+    n: int, graine: int, responsable: Membre, decalage_max: int = 0, duree_max: int = 10
+) -> List[Tache]:
+    # Réseau aléatoire dans l'ordre de création : chaque tâche dépend de
+    # zéro à trois tâches parmi les cinquante précédentes
+    aleatoire = random.Random(graine)
+    taches: List[Tache] = []
+    for i in range(n):
+        debut = DEBUT + timedelta(days=aleatoire.randint(0, decalage_max))
+        tache = creer_tache(f"T{i}", aleatoire.randint(1, duree_max), responsable, debut)
+        for dep in aleatoire.sample(taches[-50:], min(len(taches), aleatoire.randint(0, 3))):
+            tache.ajouter_dependance(dep)
+        taches.append(tache)
+    return taches
@@ -0,0 +1,66 @@
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chemin_critique import CheminCritiqueIncremental, calculer_cpm  # noqa: E402
+from gestion_projet import Membre, Tache  # noqa: E402
+
+
+DEBUT = datetime(2024, 1, 1)
+
+
+def construire(nb_chaines: int, longueur: int):
+    # Des chaînes parallèles qui convergent vers un jalon final : la forme
+    # habituelle d'un grand plan découpé en lots.
+    membre = Membre("Ousmane", "Développeur")
+    taches = []
+    fin = Tache("Fin", "", DEBUT, DEBUT + timedelta(days=1), membre, "Non commencée")
+    for c in range(nb_chaines):
+        precedente = None
+        for i in range(longueur):
+            tache = Tache(
+                f"C{c}-{i}",
+                "",
+                DEBUT,
+                DEBUT + timedelta(days=1 + (c + i) % 7),
+                membre,
+                "Non commencée",
+            )
+            if precedente is not None:
+                tache.ajouter_dependance(precedente)
+            taches.append(tache)
+            precedente = tache
+        fin.ajouter_dependance(precedente)
+    taches.append(fin)
+    return taches
+
+
+def mesurer(nb_chaines: int = 1000, longueur: int = 100, repetitions: int = 50):
+    taches = construire(nb_chaines, longueur)
+    planning = CheminCritiqueIncremental()
+    for tache in taches:
+        planning.ajouter(tache)
+    planning.chemin_critique()
+
+    debut = time.perf_counter()
+    calculer_cpm(taches)
+    complet = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    for r in range(repetitions):
+        tache = taches[(r * 7919) % len(taches)]
+        tache.date_fin = tache.date_fin + timedelta(days=1)
+        planning.chemin_critique()
+    incremental = (time.perf_counter() - debut) / repetitions
+
+    print(f"{len(taches)} tâches")
+    print(f"  passe complète       : {complet * 1000:.2f} ms")
+    print(f"  modification unique  : {incremental * 1000:.3f} ms")
+    print(f"  accélération         : {complet / incremental:.0f}x")
+
+
+if __name__ == "__main__":
+    mesurer()
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+
+# Budget de démarrage par module, en millisecondes (temps cumulé d'import)
+BUDGETS = {"gestion_projet": 60.0, "main": 60.0, "persistance": 80.0}
+
+
+def temps_import(module: str, repetitions: int = 5) -> float:
+    # Meilleur de plusieurs processus neufs, d'après -X importtime
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        sortie = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=RACINE,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for ligne in sortie.stderr.splitlines():
+            colonnes = ligne.split("|")
+            if len(colonnes) == 3 and colonnes[2].strip() == module:
+                meilleur = min(meilleur, int(colonnes[1]) / 1000)
+    return meilleur
+
+
+def mesurer() -> bool:
+    respecte = True
+    for module, budget in BUDGETS.items():
+        duree = temps_import(module)
+        etat = "ok" if duree <= budget else "DÉPASSÉ"
+        respecte &= duree <= budget
+        print(f"  {module:<16}: {duree:7.1f} ms (budget {budget:.0f} ms) {etat}")
+    return respecte
+
+
+if __name__ == "__main__":
+    sys.exit(0 if mesurer() else 1)
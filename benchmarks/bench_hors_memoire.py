@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graphe_compact import GrapheCompact  # noqa: E402
+from graphe_disque import ARETE, GrapheDisque  # noqa: E402
+
+
+def ecrire_treillis(dossier: str, largeur: int, hauteur: int) -> tuple:
+    # Niveaux de `largeur` tâches, deux dépendances vers le niveau précédent
+    n = largeur * hauteur
+    generateur = np.random.default_rng(3)
+    taches = os.path.join(dossier, "taches.bin")
+    aretes = os.path.join(dossier, "aretes.bin")
+    generateur.integers(1, 10, n, dtype=np.int32).tofile(taches)
+    with open(aretes, "wb") as fichier:
+        for niveau in range(1, hauteur):
+            cibles = np.repeat(np.arange(niveau * largeur, (niveau + 1) * largeur), 2)
+            enregistrements = np.empty(cibles.size, dtype=ARETE)
+            enregistrements["cible"] = cibles
+            enregistrements["source"] = (niveau - 1) * largeur + generateur.integers(0, largeur, cibles.size)
+            fichier.write(enregistrements.tobytes())
+    return taches, aretes
+
+
+def mesurer(largeur: int = 2000, hauteur: int = 1000) -> None:
+    n = largeur * hauteur
+    with tempfile.TemporaryDirectory() as dossier:
+        taches, aretes = ecrire_treillis(dossier, largeur, hauteur)
+        taille = (os.path.getsize(taches) + os.path.getsize(aretes)) / 1e6
+        print(f"{n} tâches, {2 * (n - largeur)} arêtes, {taille:.0f} Mo en entrée")
+        sortie = os.path.join(dossier, "resultat.bin")
+        for memoire in (1 << 20, 16 << 20, 256 << 20):
+            debut = time.perf_counter()
+            GrapheDisque(taches, aretes, memoire, dossier).calculer_cpm(sortie)
+            ecoule = time.perf_counter() - debut
+            # Pic mesuré à part : tracemalloc fausse les temps
+            tracemalloc.start()
+            GrapheDisque(taches, aretes, memoire, dossier).calculer_cpm(sortie)
+            pic = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  hors mémoire, plafond {memoire >> 20:>3} Mo : {ecoule:6.2f} s, pic {pic / 1e6:6.1f} Mo")
+
+        durees = np.fromfile(taches, dtype=np.int32)
+        arcs = np.fromfile(aretes, dtype=ARETE)
+        tracemalloc.start()
+        debut = time.perf_counter()
+        GrapheCompact(durees, arcs["source"], arcs["cible"]).calculer_cpm()
+        ecoule = time.perf_counter() - debut
+        pic = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  GrapheCompact en mémoire          : {ecoule:6.2f} s, pic {pic / 1e6:6.1f} Mo (avec tracemalloc)")
+
+
+if __name__ == "__main__":
+    mesurer()
@@ -0,0 +1,117 @@
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import Projet  # noqa: E402
+from modeles import Membre, Tache  # noqa: E402
+from notifications import NotificationStrategy  # noqa: E402
+
+DEBUT = datetime(2024, 1, 1)
+
+
+def ecrire_plan(chemin: str, n: int) -> None:
+    # DAG à dépendances locales ; une ligne sur dix est échangée avec sa
+    # voisine, ce qui crée des références en avant dans le fichier
+    aleatoire = random.Random(1)
+    ordre = list(range(n))
+    for i in range(0, n - 1, 2):
+        if aleatoire.random() < 0.1:
+            ordre[i], ordre[i + 1] = ordre[i + 1], ordre[i]
+    with open(chemin, "w", encoding="utf-8", newline="") as fichier:
+        ecrivain = csv.writer(fichier)
+        ecrivain.writerow(("nom", "date_debut", "date_fin", "responsable", "dependances"))
+        for i in ordre:
+            deps = {aleatoire.randrange(max(0, i - 50), i) for _ in range(2)} if i else ()
+            ecrivain.writerow((
+                f"T{i}",
+                DEBUT.date().isoformat(),
+                (DEBUT + timedelta(days=aleatoire.randint(1, 20))).date().isoformat(),
+                f"Membre {i % 100}",
+                ";".join(f"T{j}" for j in sorted(deps)),
+            ))
+
+
+def un_par_un(chemin: str) -> Projet:
+    # Chemin actuel : un ajouter_tache (et une notification) par ligne
+    projet = _projet()
+    membres = {membre.nom: membre for membre in projet.equipe.obtenir_membres()}
+    lignes = list(csv.DictReader(open(chemin, encoding="utf-8", newline="")))
+    par_nom = {}
+    for ligne in lignes:
+        tache = Tache(
+            ligne["nom"], "",
+            datetime.fromisoformat(ligne["date_debut"]),
+            datetime.fromisoformat(ligne["date_fin"]),
+            membres[ligne["responsable"]], "Non commencée",
+        )
+        par_nom[tache.nom] = tache
+        projet.ajouter_tache(tache)
+    for ligne in lignes:
+        for nom in filter(None, ligne["dependances"].split(";")):
+            par_nom[ligne["nom"]].ajouter_dependance(par_nom[nom])
+    return projet
+
+
+class Silencieuse(NotificationStrategy):
+    # Compte les envois sans rien écrire : seul le coût de la diffusion reste
+    def __init__(self):
+        self.envois = 0
+
+    def envoyer(self, message: str, destinataire: str) -> None:
+        self.envois += 1
+
+
+def _projet() -> Projet:
+    projet = Projet("Import", "", DEBUT, DEBUT + timedelta(days=3650))
+    projet.set_notification_strategy(Silencieuse())
+    for i in range(100):
+        projet.ajouter_membre_equipe(Membre(f"Membre {i}", "Développeur"))
+    return projet
+
+
+def _importer(chemin: str) -> Projet:
+    projet = _projet()
+    projet.importer_taches(chemin)
+    return projet
+
+
+def mesurer(n: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "plan.csv")
+        ecrire_plan(chemin, n)
+        print(f"{n} tâches, {os.path.getsize(chemin) / 1e6:.1f} Mo de CSV")
+        with open(os.devnull, "w") as muet:
+            sortie, sys.stdout = sys.stdout, muet
+            try:
+                resultats = {}
+                for libelle, charger in (
+                    ("ajouter_tache un par un", lambda: un_par_un(chemin)),
+                    ("importer_taches", lambda: _importer(chemin)),
+                ):
+                    # Temps et pic mémoire mesurés sur deux chargements :
+                    # tracemalloc fausserait le chronométrage
+                    debut = time.perf_counter()
+                    projet = charger()
+                    duree = time.perf_counter() - debut
+                    del projet
+                    tracemalloc.start()
+                    projet = charger()
+                    pic = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    resultats[libelle] = (duree, pic, projet.notification_context._strategy.envois)
+            finally:
+                sys.stdout = sortie
+        for libelle, (duree, pic, envois) in resultats.items():
+            print(f"  {libelle:<28}: {duree:8.2f} s, pic {pic / 1e6:7.1f} Mo, {envois} envois")
+
+
+if __name__ == "__main__":
+    mesurer(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
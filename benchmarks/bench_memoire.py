@@ -0,0 +1,61 @@
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modeles import Membre, Tache  # noqa: E402
+
+
+class TacheAvant:
+    # Reproduction de l'ancienne Tache : __dict__ par instance, liste de
+    # dépendances et statut dupliqué sur chaque objet.
+    def __init__(self, nom, description, date_debut, date_fin, responsable, statut):
+        self.nom = nom
+        self.description = description
+        self.date_debut = date_debut
+        self.date_fin = date_fin
+        self.responsable = responsable
+        self.statut = statut
+        self.dependances = []
+
+    def ajouter_dependance(self, tache):
+        self.dependances.append(tache)
+
+
+def octets_par_tache(classe, n: int) -> float:
+    membre = Membre("Ousmane", "Développeur")
+    debut = datetime(2024, 1, 1)
+    fin = debut + timedelta(days=10)
+    gc.collect()
+    tracemalloc.start()
+    taches = []
+    precedente = None
+    for i in range(n):
+        # Le statut est reconstruit comme s'il venait d'un fichier importé
+        statut = "Non commencée" if i % 2 else "En cours"
+        tache = classe("T", "", debut, fin, membre, statut.encode().decode())
+        if precedente is not None:
+            tache.ajouter_dependance(precedente)
+        # Les temps CPM que calculer_chemin_critique pose sur chaque tâche
+        tache.early_start = tache.early_finish = 0
+        tache.late_start = tache.late_finish = 0
+        taches.append(tache)
+        precedente = tache
+    courant, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return courant / n
+
+
+def mesurer(n: int = 1_000_000):
+    avant = octets_par_tache(TacheAvant, n)
+    apres = octets_par_tache(Tache, n)
+    print(f"{n} tâches")
+    print(f"  avant : {avant:.0f} octets/tâche")
+    print(f"  après : {apres:.0f} octets/tâche ({apres / avant:.0%})")
+
+
+if __name__ == "__main__":
+    mesurer(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
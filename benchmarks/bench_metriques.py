@@ -0,0 +1,54 @@
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import metriques  # noqa: E402
+from gestion_projet import Membre, Projet, Tache  # noqa: E402
+
+
+def scenario(n: int) -> float:
+    # Mutations, notifications (trois destinataires) puis chemin critique
+    projet = Projet("Bench", "", datetime(2024, 1, 1), datetime(2025, 1, 1))
+    membre = Membre("Ousmane", "Développeur")
+    debut = datetime(2024, 1, 1)
+    with redirect_stdout(io.StringIO()):
+        for nom in ("Ousmane", "Oumar", "Mouhamed"):
+            projet.ajouter_membre_equipe(nom)
+        chrono = time.perf_counter()
+        precedente = None
+        for i in range(n):
+            tache = Tache(f"T{i}", "", debut, debut + timedelta(days=1 + i % 5), membre, "En cours")
+            if precedente is not None and i % 10:
+                tache.ajouter_dependance(precedente)
+            projet.ajouter_tache(tache)
+            precedente = tache
+            if i % 100 == 0:
+                projet.calculer_chemin_critique()
+        return time.perf_counter() - chrono
+
+
+def mesurer(n: int = 20_000, tours: int = 7):
+    # Les trois configurations alternent pour que le bruit les touche autant
+    reference = actif = apres = float("inf")
+    original = Projet.ajouter_tache
+    for _ in range(tours):
+        reference = min(reference, scenario(n))
+        metriques.activer()
+        actif = min(actif, scenario(n))
+        metriques.desactiver()
+        apres = min(apres, scenario(n))
+    # Désactivé, ce sont les fonctions d'origine qui sont appelées
+    assert Projet.ajouter_tache is original
+    print(f"{n} mutations")
+    print(f"  avant activation     : {reference:.3f} s")
+    print(f"  activé               : {actif:.3f} s ({100 * (actif / reference - 1):+.1f} %)")
+    print(f"  après désactivation  : {apres:.3f} s ({100 * (apres / reference - 1):+.1f} %)")
+
+
+if __name__ == "__main__":
+    mesurer(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,70 @@
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chemin_critique import CheminCritiqueIncremental, CycleDependancesError  # noqa: E402
+from modeles import Membre, Tache  # noqa: E402
+
+DEBUT = datetime(2024, 1, 1)
+
+
+def planning_vide(n: int):
+    membre = Membre("Ousmane", "Développeur")
+    taches = [
+        Tache(f"T{i}", "", DEBUT, DEBUT + timedelta(days=1 + i % 10), membre, "Non commencée")
+        for i in range(n)
+    ]
+    planning = CheminCritiqueIncremental()
+    for tache in taches:
+        planning.ajouter(tache)
+    return planning, taches
+
+
+def inserer(taches, aretes) -> tuple:
+    refusees = 0
+    debut = time.perf_counter()
+    for source, cible in aretes:
+        try:
+            taches[cible].ajouter_dependance(taches[source])
+        except CycleDependancesError:
+            refusees += 1
+    return time.perf_counter() - debut, refusees
+
+
+def mesurer(n: int = 100_000, nb_aretes: int = 200_000) -> None:
+    aleatoire = random.Random(1)
+
+    def locale():
+        source = aleatoire.randrange(n - 1)
+        return source, aleatoire.randint(source + 1, min(n - 1, source + 50))
+
+    def dans_un_sens_quelconque():
+        source, cible = locale()
+        return (source, cible) if aleatoire.random() < 0.5 else (cible, source)
+
+    scenarios = (
+        # Dans le sens de l'ordre d'insertion : aucun réordonnancement
+        ("arêtes dans l'ordre", locale, nb_aretes),
+        # Dépendances locales tirées dans les deux sens (plan importé en vrac)
+        ("arêtes locales, sens aléatoire", dans_un_sens_quelconque, nb_aretes),
+        # Extrémités quelconques : le pire cas, chaque arête à rebours peut
+        # réordonner une grande partie du graphe ; dix fois moins d'arêtes
+        ("arêtes quelconques", lambda: tuple(aleatoire.sample(range(n), 2)), nb_aretes // 10),
+    )
+    print(f"{n} tâches")
+    for libelle, tirer, nombre in scenarios:
+        aretes = [tirer() for _ in range(nombre)]
+        _, taches = planning_vide(n)
+        duree, refusees = inserer(taches, aretes)
+        print(
+            f"  {libelle:<32}: {nombre:7} arêtes, {duree / nombre * 1e6:8.1f} µs/arête, "
+            f"{refusees} refusées"
+        )
+
+
+if __name__ == "__main__":
+    mesurer(*(int(argument) for argument in sys.argv[1:3]))
@@ -0,0 +1,66 @@
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gestion_projet import Membre, Projet, Tache  # noqa: E402
+from persistance import Depot  # noqa: E402
+
+
+def construire(n: int) -> Projet:
+    aleatoire = random.Random(1)
+    projet = Projet("Portefeuille", "", datetime(2024, 1, 1), datetime(2030, 1, 1))
+    membres = [Membre(f"Membre {i}", "Développeur") for i in range(100)]
+    debut = datetime(2024, 1, 1)
+    for i in range(n):
+        tache = Tache(
+            f"Tâche {i}",
+            "",
+            debut,
+            debut + timedelta(days=aleatoire.randint(1, 20)),
+            membres[i % len(membres)],
+            "Non commencée",
+        )
+        if i:
+            # Dépendances locales : des lots qui s'enchaînent
+            tache.ajouter_dependance(projet.taches[aleatoire.randrange(max(0, i - 50), i)])
+        projet.taches.append(tache)
+    return projet
+
+
+def chronometrer(libelle: str, fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    print(f"  {libelle:<32}: {time.perf_counter() - debut:8.3f} s")
+    return resultat
+
+
+def mesurer(n: int = 1_000_000):
+    print(f"{n} tâches")
+    projet = chronometrer("construction", lambda: construire(n))
+    with tempfile.TemporaryDirectory() as dossier:
+        depot = Depot(dossier)
+        chronometrer("instantané complet", lambda: depot.sauvegarder(projet))
+        taille = Path(depot.chemin_instantane).stat().st_size
+        print(f"  {'taille':<32}: {taille / n:8.1f} octets/tâche")
+        chronometrer(
+            "1000 mutations journalisées",
+            lambda: [projet.taches[i].mettre_a_jour_statut("En cours") for i in range(1000)],
+        )
+        depot.fermer()
+
+        charge = chronometrer("chargement (projection)", lambda: Depot(dossier).charger())
+        aleatoire = random.Random(2)
+        chronometrer(
+            "1000 accès aléatoires",
+            lambda: [charge.taches[aleatoire.randrange(n)] for _ in range(1000)],
+        )
+        chronometrer("matérialisation complète", lambda: sum(1 for _ in charge.taches))
+
+
+if __name__ == "__main__":
+    mesurer(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chemin_critique import calculer_cpm  # noqa: E402
+from generateurs import dag_aleatoire  # noqa: E402
+from persistance import ecrire_instantane  # noqa: E402
+from portefeuille import Portefeuille  # noqa: E402
+
+
+def mesurer(nb_projets: int = 2000, taille: int = 200):
+    projets = [dag_aleatoire(taille, graine=i) for i in range(nb_projets)]
+    print(f"{nb_projets} projets de {taille} tâches, {os.cpu_count()} cœurs")
+
+    debut = time.perf_counter()
+    for projet in projets:
+        calculer_cpm(projet.taches)
+    sequentiel = time.perf_counter() - debut
+    print(f"  séquentiel (sans rapport) : {nb_projets / sequentiel:8.0f} projets/s")
+
+    # Portefeuille déjà sur disque : les processus lisent eux-mêmes les
+    # instantanés, le processus principal ne sérialise rien
+    dossier = tempfile.TemporaryDirectory()
+    chemins = []
+    for i, projet in enumerate(projets):
+        chemins.append(os.path.join(dossier.name, f"projet_{i}.bin"))
+        ecrire_instantane(projet, chemins[-1])
+
+    nb_processus = 1
+    while nb_processus <= (os.cpu_count() or 1):
+        for source, entrees in (("objets", projets), ("fichiers", chemins)):
+            portefeuille = Portefeuille(nb_processus=nb_processus, rapports=False)
+            # Démarrage des processus hors chronomètre
+            list(portefeuille.traiter(entrees[:nb_processus]))
+            debut = time.perf_counter()
+            erreurs = sum(r.erreur is not None for r in portefeuille.traiter(entrees))
+            duree = time.perf_counter() - debut
+            portefeuille.fermer()
+            print(
+                f"  {nb_processus:3d} processus, {source:<9}: {nb_projets / duree:8.0f} projets/s"
+                f" ({erreurs} erreurs)"
+            )
+        nb_processus *= 2
+    dossier.cleanup()
+
+
+if __name__ == "__main__":
+    mesurer(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,28 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generateurs import dag_aleatoire  # noqa: E402
+from modeles import Risque  # noqa: E402
+
+
+def mesurer(nb_taches: int = 10_000, nb_echantillons: int = 100_000):
+    projet = dag_aleatoire(nb_taches, fenetre=200)
+    simulation = projet.simulation(graine=1)
+    for tache in projet.taches:
+        jours = (tache.date_fin - tache.date_debut).days
+        simulation.distribution(tache, jours * 0.8, jours, jours * 1.5)
+    simulation.risque(Risque("Retard fournisseur", 0.3, "Élevé"), projet.taches[:100])
+
+    debut = time.perf_counter()
+    resultat = simulation.executer(nb_echantillons)
+    duree = time.perf_counter() - debut
+    print(f"{nb_echantillons} scénarios x {nb_taches} tâches : {duree:.2f} s")
+    print(f"  P50 {resultat.p50:.1f} j, P80 {resultat.p80:.1f} j, P95 {resultat.p95:.1f} j")
+    print(f"  tâches critiques dans plus de 50 % des scénarios : {int((resultat.criticite > 0.5).sum())}")
+
+
+if __name__ == "__main__":
+    mesurer(*(int(a) for a in sys.argv[1:]))
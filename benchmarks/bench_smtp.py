@@ -0,0 +1,62 @@
+import smtplib
+import sys
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from notifications import NotificationContext, SMTPNotificationStrategy  # noqa: E402
+from test_smtp import ServeurSMTPLocal  # noqa: E402
+
+
+def connexion_par_message(port: int, messages: int, destinataires: list) -> None:
+    # Référence : une session SMTP ouverte et fermée pour chaque envoi
+    for i in range(messages):
+        for destinataire in destinataires:
+            courriel = EmailMessage()
+            courriel["From"] = "notifications@localhost"
+            courriel["To"] = destinataire
+            courriel["Subject"] = "Notification du projet"
+            courriel.set_content(f"Message {i}")
+            with smtplib.SMTP("127.0.0.1", port) as session:
+                session.send_message(courriel)
+
+
+def pool(port: int, messages: int, destinataires: list) -> None:
+    strategie = SMTPNotificationStrategy("127.0.0.1", port)
+    for i in range(messages):
+        for destinataire in destinataires:
+            strategie.envoyer(f"Message {i}", destinataire)
+    strategie.close()
+
+
+def pool_groupe(port: int, messages: int, destinataires: list) -> None:
+    strategie = SMTPNotificationStrategy("127.0.0.1", port)
+    contexte = NotificationContext(strategie)
+    for i in range(messages):
+        contexte.notifier(f"Message {i}", destinataires)
+    strategie.close()
+
+
+def mesurer(messages: int = 50, nb_destinataires: int = 10, latence: float = 0.001) -> None:
+    destinataires = [f"membre{i}@exemple.sn" for i in range(nb_destinataires)]
+    total = messages * nb_destinataires
+    print(f"{messages} messages x {nb_destinataires} destinataires, latence {latence * 1000:.1f} ms par commande")
+    for libelle, envoyer in (
+        ("connexion par message", connexion_par_message),
+        ("sessions en pool", pool),
+        ("pool + destinataires groupés", pool_groupe),
+    ):
+        with ServeurSMTPLocal(latence=latence) as serveur:
+            debut = time.perf_counter()
+            envoyer(serveur.port, messages, destinataires)
+            duree = time.perf_counter() - debut
+        print(
+            f"  {libelle:<30}: {duree:7.2f} s, {total / duree:8.0f} notifications/s, "
+            f"{serveur.connexions} connexions, {len(serveur.recus)} transactions"
+        )
+
+
+if __name__ == "__main__":
+    mesurer(*(int(argument) for argument in sys.argv[1:3]))
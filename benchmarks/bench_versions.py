@@ -0,0 +1,95 @@
+import copy
+import gc
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generateurs import dag_aleatoire  # noqa: E402
+
+MODIFICATIONS = 10
+VERSIONS = 20
+
+
+def copie_profonde(projet):
+    # Le cache partagé (et son verrou) n'appartient pas au projet
+    return copy.deepcopy(projet, {id(projet.cache): projet.cache})
+
+
+def modifier(projet, aleatoire: random.Random) -> None:
+    for tache in aleatoire.sample(projet.taches, MODIFICATIONS):
+        tache.date_fin = tache.date_fin + timedelta(days=1)
+
+
+def mesurer_versions(n: int) -> None:
+    aleatoire = random.Random(2)
+    projet = dag_aleatoire(n)
+    projet.enregistrer_changement("Import")
+
+    # Latence : une version figée après quelques modifications, face à une
+    # copie profonde du projet
+    temps_version = []
+    for i in range(VERSIONS):
+        modifier(projet, aleatoire)
+        debut = time.perf_counter()
+        projet.enregistrer_changement(f"Révision {i}")
+        temps_version.append(time.perf_counter() - debut)
+    debut = time.perf_counter()
+    copie_profonde(projet)
+    temps_copie = time.perf_counter() - debut
+
+    # Mémoire retenue par VERSIONS versions supplémentaires, puis par une copie
+    gc.collect()
+    tracemalloc.start()
+    for i in range(VERSIONS):
+        modifier(projet, aleatoire)
+        projet.enregistrer_changement(f"Mesure {i}")
+    par_version = tracemalloc.get_traced_memory()[0] / VERSIONS
+    tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    copie = copie_profonde(projet)
+    par_copie = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copie
+
+    # Branche « et si » et différences entre versions éloignées de 10
+    # Collectes faites hors chronomètre : une collecte complète du tas
+    # (100 000 tâches) masquerait le coût mesuré
+    noms = [tache.nom for tache in aleatoire.sample(projet.taches, MODIFICATIONS)]
+    gc.collect()
+    debut = time.perf_counter()
+    branche = projet.brancher(projet.version - 1)
+    for nom in noms:
+        etat = branche.etat.tache(nom)
+        branche.modifier_dates(nom, etat.date_debut, etat.date_fin + timedelta(days=3))
+    temps_branche = time.perf_counter() - debut
+    gc.collect()
+    debut = time.perf_counter()
+    differences = projet.comparer_versions(projet.version - 11, projet.version - 1)
+    temps_diff = time.perf_counter() - debut
+
+    print(f"{n:>7} tâches, {MODIFICATIONS} tâches modifiées par version")
+    print(f"  version     : {1e3 * sum(temps_version) / VERSIONS:8.3f} ms, {par_version / 1e3:9.1f} Ko retenus")
+    print(f"  deepcopy    : {1e3 * temps_copie:8.1f} ms, {par_copie / 1e3:9.1f} Ko retenus")
+    print(f"  branche     : {1e3 * temps_branche:8.3f} ms (création et {MODIFICATIONS} modifications)")
+    print(f"  différences : {1e3 * temps_diff:8.3f} ms ({len(differences.taches)} tâches, 10 versions d'écart)")
+
+
+def mesurer() -> None:
+    for n in (1_000, 10_000, 100_000):
+        mesurer_versions(n)
+
+
+if __name__ == "__main__":
+    # copy.deepcopy descend récursivement les chaînes de dépendances
+    sys.setrecursionlimit(1_000_000)
+    threading.stack_size(512 * 1024 * 1024)
+    fil = threading.Thread(target=mesurer)
+    fil.start()
+    fil.join()
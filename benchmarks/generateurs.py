@@ -0,0 +1,134 @@
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gestion_projet  # noqa: E402
+from main import Projet  # noqa: E402
+from modeles import Jalon, Membre, Risque, Tache  # noqa: E402
+
+DEBUT = datetime(2024, 1, 1)
+ROLES = ("Développeur", "Designer", "Testeur", "Chef de projet")
+
+
+def _ajouter(projet, methode: str, collection: str, element) -> None:
+    # Le Projet de gestion_projet prévient toute l'équipe à chaque ajout :
+    # ses collections sont remplies directement (son planning, construit à
+    # la première demande, les reprend alors)
+    if isinstance(projet, Projet):
+        getattr(projet, methode)(element)
+    else:
+        getattr(projet, collection).append(element)
+
+
+def _projet(nom: str, nb_membres: int = 10, classe: type = Projet):
+    projet = classe(nom, "Projet synthétique", DEBUT, DEBUT + timedelta(days=3650))
+    for i in range(nb_membres):
+        membre = Membre(f"Membre {i}", ROLES[i % len(ROLES)])
+        _ajouter(projet, "ajouter_membre_equipe", "equipe", membre)
+    return projet
+
+
+def _tache(projet, i: int, aleatoire: random.Random, dependances=()) -> Tache:
+    # Les dépendances sont posées avant l'ajout pour ne pas notifier le planning
+    membres = projet.equipe.membres if isinstance(projet, Projet) else projet.equipe
+    tache = Tache(
+        f"Tâche {i}",
+        "",
+        DEBUT,
+        DEBUT + timedelta(days=aleatoire.randint(1, 10)),
+        membres[i % len(membres)],
+        "Non commencée",
+    )
+    tache.dependances = tuple(dependances)
+    _ajouter(projet, "ajouter_tache", "taches", tache)
+    return tache
+
+
+def chaine(n: int, graine: int = 0, classe: type = Projet):
+    # Une seule longue chaîne : profondeur maximale
+    aleatoire = random.Random(graine)
+    projet = _projet("Chaîne", classe=classe)
+    precedente = ()
+    for i in range(n):
+        precedente = (_tache(projet, i, aleatoire, precedente),)
+    return projet
+
+
+def eventail(n: int, graine: int = 0, classe: type = Projet):
+    # Une source, n - 2 tâches parallèles, un puits : largeur maximale
+    aleatoire = random.Random(graine)
+    projet = _projet("Éventail", classe=classe)
+    source = _tache(projet, 0, aleatoire)
+    milieu = [_tache(projet, i, aleatoire, (source,)) for i in range(1, max(n - 1, 2))]
+    _tache(projet, len(milieu) + 1, aleatoire, milieu)
+    return projet
+
+
+def treillis(n: int, graine: int = 0, classe: type = Projet):
+    # Rangées de largeur sqrt(n), chaque tâche dépendant de deux voisines de
+    # la rangée précédente : des losanges imbriqués
+    aleatoire = random.Random(graine)
+    projet = _projet("Treillis", classe=classe)
+    largeur = max(int(math.isqrt(n)), 1)
+    precedente: List[Tache] = []
+    i = 0
+    while i < n:
+        rangee = []
+        m = len(precedente)
+        for k in range(min(largeur, n - i)):
+            deps = dict.fromkeys((precedente[k % m], precedente[(k + 1) % m])) if m else ()
+            rangee.append(_tache(projet, i, aleatoire, deps))
+            i += 1
+        precedente = rangee
+    return projet
+
+
+def dag_aleatoire(
+    n: int, graine: int = 0, degre: int = 3, fenetre: int = 1000, classe: type = Projet
+):
+    # Chaque tâche dépend de quelques tâches antérieures tirées dans une fenêtre
+    aleatoire = random.Random(graine)
+    projet = _projet("DAG aléatoire", classe=classe)
+    taches: List[Tache] = []
+    for i in range(n):
+        bas = max(0, i - fenetre)
+        nombre = min(i - bas, aleatoire.randint(0, degre))
+        deps = [taches[j] for j in aleatoire.sample(range(bas, i), nombre)] if nombre else ()
+        taches.append(_tache(projet, i, aleatoire, deps))
+    return projet
+
+
+def grande_equipe(n: int, graine: int = 0, classe: type = Projet):
+    # n membres, n risques et n / 10 jalons autour de quelques lots de tâches
+    aleatoire = random.Random(graine)
+    projet = _projet("Grande équipe", nb_membres=n, classe=classe)
+    precedente = ()
+    for i in range(max(n // 10, 1)):
+        precedente = (_tache(projet, i, aleatoire, precedente if i % 10 else ()),)
+        jalon = Jalon(f"Jalon {i}", DEBUT + timedelta(days=i))
+        _ajouter(projet, "ajouter_jalon", "jalons", jalon)
+    for i in range(n):
+        risque = Risque(f"Risque {i}", aleatoire.random(), "Moyen")
+        _ajouter(projet, "ajouter_risque", "risques", risque)
+    return projet
+
+
+GENERATEURS: Dict[str, Callable[[int], Projet]] = {
+    "chaine": chaine,
+    "eventail": eventail,
+    "treillis": treillis,
+    "dag_aleatoire": dag_aleatoire,
+    "grande_equipe": grande_equipe,
+}
+
+# Les mêmes réseaux pour le Projet de gestion_projet
+GENERATEURS_GESTION: Dict[str, Callable[[int], "gestion_projet.Projet"]] = {
+    nom: partial(generateur, classe=gestion_projet.Projet)
+    for nom, generateur in GENERATEURS.items()
+}
@@ -0,0 +1,218 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generateurs import GENERATEURS, GENERATEURS_GESTION  # noqa: E402
+from modeles import Membre, Tache  # noqa: E402
+from notifications import EmailNotificationStrategy, NotificationContext  # noqa: E402
+
+RACINE = Path(__file__).resolve().parent.parent
+TAILLES = (10, 100, 1_000, 10_000, 100_000)
+
+
+class Cas(NamedTuple):
+    nom: str
+    # preparer(n) construit l'état hors chronomètre, executer(etat) est mesuré
+    preparer: Callable[[int], object]
+    executer: Callable[[object], object]
+
+
+def _numpy_disponible() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _construire_taches(n: int) -> List[Tache]:
+    membre = Membre("Ousmane", "Développeur")
+    debut = datetime(2024, 1, 1)
+    return [
+        Tache(f"Tâche {i}", "", debut, debut, membre, "Non commencée") for i in range(n)
+    ]
+
+
+def _notifier(etat) -> None:
+    contexte, destinataires = etat
+    contexte.notifier("Livraison de la phase 1", destinataires)
+
+
+def cas_disponibles() -> List[Cas]:
+    cas = [
+        Cas("construction_taches", lambda n: n, _construire_taches),
+        Cas("construction_projet", lambda n: n, GENERATEURS["dag_aleatoire"]),
+    ]
+    moteurs = [("incremental", False)]
+    if _numpy_disponible():
+        moteurs.append(("vectorise", True))
+    for nom, generateur in GENERATEURS.items():
+        for moteur, vectorise in moteurs:
+            cas.append(Cas(
+                f"cpm_{moteur}/{nom}",
+                generateur,
+                lambda projet, v=vectorise: projet.calculer_chemin_critique(vectorise=v),
+            ))
+    # Le Projet de gestion_projet a son propre planning et son propre rapport
+    for nom, generateur in GENERATEURS_GESTION.items():
+        cas.append(Cas(
+            f"cpm_gestion/{nom}",
+            generateur,
+            lambda projet: projet.calculer_chemin_critique(),
+        ))
+    cas.append(Cas(
+        "rapport/grande_equipe",
+        GENERATEURS["grande_equipe"],
+        lambda projet: projet.generer_rapport_performance(),
+    ))
+    cas.append(Cas(
+        "rapport_gestion/grande_equipe",
+        GENERATEURS_GESTION["grande_equipe"],
+        lambda projet: projet.generer_rapport_performance(),
+    ))
+    cas.append(Cas(
+        "notification",
+        lambda n: (
+            NotificationContext(EmailNotificationStrategy()),
+            [f"Membre {i}" for i in range(n)],
+        ),
+        _notifier,
+    ))
+    return cas
+
+
+def _executer(cas: Cas, n: int, memoire: bool):
+    etat = cas.preparer(n)
+    gc.collect()
+    # Les affichages des fonctions mesurées partent dans le vide
+    with open(os.devnull, "w") as vide, redirect_stdout(vide):
+        if memoire:
+            tracemalloc.start()
+            cas.executer(etat)
+            pic = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return pic
+        debut = time.perf_counter()
+        cas.executer(etat)
+        return time.perf_counter() - debut
+
+
+def mesurer(cas: Cas, n: int, repetitions: int) -> Dict:
+    # Meilleur de plusieurs exécutions, puis une exécution sous tracemalloc
+    temps = min(_executer(cas, n, False) for _ in range(repetitions))
+    return {
+        "cas": cas.nom,
+        "taille": n,
+        "temps": temps,
+        "memoire_pic": _executer(cas, n, True),
+    }
+
+
+def exposant(resultats: List[Dict]) -> Optional[float]:
+    # Pente de log(temps) en fonction de log(n) par moindres carrés :
+    # ~1 pour un coût linéaire, ~2 pour un coût quadratique
+    points = [
+        (math.log(r["taille"]), math.log(r["temps"]))
+        for r in resultats
+        if r["temps"] > 0 and r["taille"] >= 100
+    ]
+    if len(points) < 2:
+        return None
+    moyenne_x = sum(x for x, _ in points) / len(points)
+    moyenne_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - moyenne_x) * (y - moyenne_y) for x, y in points)
+    variance = sum((x - moyenne_x) ** 2 for x, _ in points)
+    return covariance / variance if variance else None
+
+
+def _commit() -> Optional[str]:
+    try:
+        sortie = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=RACINE, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return sortie.stdout.strip() or None
+
+
+def comparer(ancien: Dict, nouveau: Dict, seuil: float) -> List[str]:
+    # Cas dont le temps a augmenté de plus de `seuil` (ex. 0.2 = 20 %)
+    references = {(r["cas"], r["taille"]): r["temps"] for r in ancien["resultats"]}
+    regressions = []
+    for resultat in nouveau["resultats"]:
+        reference = references.get((resultat["cas"], resultat["taille"]))
+        if reference and resultat["temps"] > reference * (1 + seuil):
+            regressions.append(
+                f"{resultat['cas']} n={resultat['taille']}: "
+                f"{reference * 1000:.2f} ms -> {resultat['temps'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banc d'essai des chemins critiques")
+    parser.add_argument("--tailles", type=int, nargs="+", default=list(TAILLES))
+    parser.add_argument("--cas", nargs="*", help="préfixes des cas à exécuter")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", default="resultats_benchmarks.json")
+    parser.add_argument("--comparer", help="résultats d'un commit précédent")
+    parser.add_argument("--seuil", type=float, default=0.2)
+    arguments = parser.parse_args(argv)
+
+    selection = [
+        cas for cas in cas_disponibles()
+        if not arguments.cas or any(cas.nom.startswith(p) for p in arguments.cas)
+    ]
+    resultats = []
+    exposants = {}
+    for cas in selection:
+        par_taille = []
+        for n in sorted(arguments.tailles):
+            # Les petites tailles sont bruitées : on les répète davantage
+            repetitions = arguments.repetitions if n >= 10_000 else arguments.repetitions * 3
+            resultat = mesurer(cas, n, repetitions)
+            par_taille.append(resultat)
+            print(
+                f"{cas.nom:<30} n={n:<8} {resultat['temps'] * 1000:10.2f} ms "
+                f"{resultat['memoire_pic'] / 1e6:9.2f} Mo",
+                flush=True,
+            )
+        resultats.extend(par_taille)
+        exposants[cas.nom] = exposant(par_taille)
+
+    document = {
+        "commit": _commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "resultats": resultats,
+        "exposants": exposants,
+    }
+    with open(arguments.sortie, "w", encoding="utf-8") as fichier:
+        json.dump(document, fichier, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {arguments.sortie}")
+
+    if arguments.comparer:
+        with open(arguments.comparer, encoding="utf-8") as fichier:
+            regressions = comparer(json.load(fichier), document, arguments.seuil)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
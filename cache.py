@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class CacheLRU:
+    # Une entrée par (projet, section) : la valeur est gardée avec la clé de
+    # version qui l'a produite et recalculée dès que cette clé change. Les
+    # entrées les moins récemment lues sont évincées au-delà de `capacite`,
+    # ce qui borne la mémoire quand de nombreux projets partagent le cache.
+    def __init__(self, capacite: int = 1024):
+        self.capacite = capacite
+        self._entrees: "OrderedDict[Hashable, Tuple[Hashable, object]]" = OrderedDict()
+        self._verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def obtenir(self, entree: Hashable, version: Hashable, calculer: Callable[[], object]):
+        with self._verrou:
+            trouvee = self._entrees.get(entree)
+            if trouvee is not None and trouvee[0] == version:
+                self._entrees.move_to_end(entree)
+                self.succes += 1
+                return trouvee[1]
+            self.echecs += 1
+        valeur = calculer()
+        with self._verrou:
+            self._entrees[entree] = (version, valeur)
+            self._entrees.move_to_end(entree)
+            while len(self._entrees) > self.capacite:
+                self._entrees.popitem(last=False)
+        return valeur
+
+    def vider(self) -> None:
+        with self._verrou:
+            self._entrees.clear()
+
+    def statistiques(self) -> Dict[str, int]:
+        with self._verrou:
+            return {"entrees": len(self._entrees), "succes": self.succes, "echecs": self.echecs}
+
+
+# Cache partagé par défaut entre tous les projets du processus
+CACHE_RESULTATS = CacheLRU()
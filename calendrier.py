@@ -0,0 +1,140 @@
+from array import array
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+# Lundi = 0 ... dimanche = 6, comme date.weekday()
+SEMAINE_OUVREE = (0, 1, 2, 3, 4)
+
+# Marge ajoutée de chaque côté quand la plage couverte doit s'étendre
+_MARGE = 366
+
+
+class Calendrier:
+    # Jours ouvrés du projet. Sur la plage couverte, `_cumul[k]` compte les
+    # jours ouvrés de [base, base + k) et `_ouvres[r]` donne le décalage
+    # depuis la base du r-ième jour ouvré : une date devient un rang de jour
+    # ouvré, et inversement, par une lecture de tableau. La plage s'étend à
+    # la demande ; les rangs sont comptés depuis le premier jour jamais
+    # couvert et restent donc stables quand elle grandit vers le passé.
+    def __init__(self, jours_ouvres: Iterable[int] = SEMAINE_OUVREE, feries: Iterable[date] = ()):
+        self.jours_ouvres = frozenset(jours_ouvres)
+        if not self.jours_ouvres or not self.jours_ouvres <= set(range(7)):
+            raise ValueError("Les jours ouvrés sont des jours de semaine 0..6, au moins un")
+        self.feries = frozenset(jour.toordinal() for jour in feries)
+        self._ancre: Optional[int] = None
+        self._base = 0
+        self._fin = 0
+        self._rang0 = 0
+        self._cumul = array("i", [0])
+        self._ouvres = array("i")
+
+    def __repr__(self) -> str:
+        return f"Calendrier({self.description()})"
+
+    def description(self) -> str:
+        return f"{len(self.jours_ouvres)} jours ouvrés par semaine, {len(self.feries)} jours fériés"
+
+    def est_ouvre(self, jour: date) -> bool:
+        numero = jour.toordinal()
+        return (numero - 1) % 7 in self.jours_ouvres and numero not in self.feries
+
+    def _couvrir(self, premier: int, dernier: int) -> None:
+        # Garantit que [premier, dernier] (ordinaux de date) est couvert
+        if self._ancre is not None and self._base <= premier and dernier < self._fin:
+            return
+        if self._ancre is None:
+            self._ancre = premier
+        else:
+            premier = min(premier, self._base)
+            dernier = max(dernier, self._fin - 1)
+        base = premier - _MARGE
+        fin = dernier + _MARGE + 1
+        jours_ouvres = self.jours_ouvres
+        feries = self.feries
+        cumul = array("i", bytes(4 * (fin - base + 1)))
+        ouvres = array("i")
+        nombre = 0
+        for k, numero in enumerate(range(base, fin)):
+            cumul[k] = nombre
+            if (numero - 1) % 7 in jours_ouvres and numero not in feries:
+                ouvres.append(k)
+                nombre += 1
+        cumul[fin - base] = nombre
+        self._base, self._fin = base, fin
+        self._cumul, self._ouvres = cumul, ouvres
+        self._rang0 = cumul[self._ancre - base]
+
+    def rang(self, jour: date) -> int:
+        # Nombre de jours ouvrés avant `jour` depuis l'origine des rangs
+        numero = jour.toordinal()
+        self._couvrir(numero, numero)
+        return self._cumul[numero - self._base] - self._rang0
+
+    def jours_ouvres_entre(self, debut: date, fin: date) -> int:
+        # Jours ouvrés de [debut, fin), négatif si fin < debut
+        a = debut.toordinal()
+        b = fin.toordinal()
+        if a > b:
+            return -self.jours_ouvres_entre(fin, debut)
+        self._couvrir(a, b)
+        return self._cumul[b - self._base] - self._cumul[a - self._base]
+
+    def duree(self, tache) -> int:
+        return self.jours_ouvres_entre(tache.date_debut, tache.date_fin)
+
+    def durees(self, taches: Iterable) -> List[int]:
+        # Conversion d'un lot : la plage est étendue une seule fois
+        taches = list(taches)
+        if not taches:
+            return []
+        debuts = [tache.date_debut.toordinal() for tache in taches]
+        fins = [tache.date_fin.toordinal() for tache in taches]
+        self._couvrir(min(min(debuts), min(fins)), max(max(debuts), max(fins)))
+        cumul = self._cumul
+        base = self._base
+        return [cumul[b - base] - cumul[a - base] for a, b in zip(debuts, fins)]
+
+    def decalages(self, dates: Iterable[date], origine: date) -> List[int]:
+        # Jours ouvrés séparant `origine` de chaque date
+        numeros = [jour.toordinal() for jour in dates]
+        zero = origine.toordinal()
+        self._couvrir(min(numeros + [zero]), max(numeros + [zero]))
+        cumul = self._cumul
+        base = self._base
+        reference = cumul[zero - base]
+        return [cumul[numero - base] - reference for numero in numeros]
+
+    def rangs_tableau(self, numeros):
+        # Version NumPy de rang() pour un tableau d'ordinaux de date
+        import numpy as np
+
+        numeros = np.asarray(numeros, dtype=np.int64)
+        if numeros.size:
+            self._couvrir(int(numeros.min()), int(numeros.max()))
+        cumul = np.frombuffer(self._cumul, dtype=np.int32)
+        return cumul[numeros - self._base].astype(np.int64) - self._rang0
+
+    def jour_ouvre(self, rang: int) -> date:
+        # Inverse de rang() : la date du jour ouvré de ce rang
+        while not 0 <= rang + self._rang0 < len(self._ouvres):
+            if rang + self._rang0 < 0:
+                self._couvrir(self._base - _MARGE, self._base)
+            else:
+                self._couvrir(self._fin, self._fin + _MARGE)
+        return date.fromordinal(self._base + self._ouvres[rang + self._rang0])
+
+    def decaler(self, origine: date, jours: int):
+        # Premier jour ouvré précédé de `jours` jours ouvrés depuis `origine`
+        # (heure conservée) : l'inverse de jours_ouvres_entre pour une date
+        # de fin exclusive, `origine` elle-même pour zéro.
+        if jours == 0:
+            return origine
+        cible = self.jour_ouvre(self.rang(origine) + jours)
+        return origine + timedelta(days=cible.toordinal() - origine.toordinal())
+
+
+def decaler(calendrier: Optional[Calendrier], origine, jours):
+    # Jours calendaires quand le projet n'a pas de calendrier
+    if calendrier is None:
+        return origine + timedelta(days=jours)
+    return calendrier.decaler(origine, jours)
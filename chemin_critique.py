@@ -0,0 +1,490 @@
+from typing import Dict, Iterable, List
+
+from metriques import instrumenter
+
+
+class CycleDependancesError(ValueError):
+    def __init__(self, cycle: List):
+        self.cycle = cycle
+        noms = " -> ".join(getattr(tache, "nom", str(tache)) for tache in cycle)
+        super().__init__(f"Cycle de dépendances détecté: {noms}")
+
+
+def duree(tache, calendrier=None) -> int:
+    # Jours calendaires, ou jours ouvrés si un Calendrier est fourni
+    if calendrier is None:
+        return (tache.date_fin - tache.date_debut).days
+    return calendrier.duree(tache)
+
+
+def _trouver_cycle(restantes: Iterable) -> List:
+    # Les tâches restantes après le tri contiennent au moins un cycle :
+    # on remonte les dépendances jusqu'à retomber sur une tâche déjà vue.
+    restantes = set(restantes)
+    tache = next(iter(restantes))
+    vues: Dict = {}
+    chemin = []
+    while tache not in vues:
+        vues[tache] = len(chemin)
+        chemin.append(tache)
+        tache = next(dep for dep in tache.dependances if dep in restantes)
+    cycle = chemin[vues[tache]:]
+    cycle.reverse()
+    return cycle + [cycle[0]]
+
+
+def ordre_topologique(taches: Iterable) -> List:
+    # Tri de Kahn en O(V+E). Les dépendances absentes de `taches` sont
+    # découvertes au passage pour que le graphe soit complet.
+    taches = list(taches)
+    connues = set(taches)
+    successeurs: Dict = {}
+    degre: Dict = {}
+    i = 0
+    while i < len(taches):
+        tache = taches[i]
+        i += 1
+        degre[tache] = len(tache.dependances)
+        for dep in tache.dependances:
+            successeurs.setdefault(dep, []).append(tache)
+            if dep not in connues:
+                connues.add(dep)
+                taches.append(dep)
+
+    ordre = [tache for tache in taches if degre[tache] == 0]
+    for tache in ordre:
+        for succ in successeurs.get(tache, ()):
+            degre[succ] -= 1
+            if degre[succ] == 0:
+                ordre.append(succ)
+
+    if len(ordre) != len(taches):
+        triees = set(ordre)
+        raise CycleDependancesError(
+            _trouver_cycle(t for t in taches if t not in triees)
+        )
+    return ordre
+
+
+class ResultatCPM:
+    def __init__(self, ordre: List):
+        self.ordre = ordre
+        self.debut_tot: Dict = {}
+        self.fin_tot: Dict = {}
+        self.debut_tard: Dict = {}
+        self.fin_tard: Dict = {}
+        self.marge: Dict = {}
+        self.duree = 0
+        self.chemin_critique: List = []
+
+    def est_critique(self, tache) -> bool:
+        return self.marge[tache] == 0
+
+
+def calculer_cpm(taches: Iterable, calendrier=None, ordonnees: bool = False) -> ResultatCPM:
+    # ordonnees : `taches` est déjà un ordre topologique complet (celui d'un
+    # CheminCritiqueIncremental), le tri est sauté
+    ordre = list(taches) if ordonnees else ordre_topologique(taches)
+    resultat = ResultatCPM(ordre)
+    if calendrier is None:
+        durees = {tache: duree(tache) for tache in ordre}
+    else:
+        durees = dict(zip(ordre, calendrier.durees(ordre)))
+
+    # Passe avant : temps au plus tôt
+    debut_tot = resultat.debut_tot
+    fin_tot = resultat.fin_tot
+    for tache in ordre:
+        debut = max((fin_tot[dep] for dep in tache.dependances), default=0)
+        debut_tot[tache] = debut
+        fin_tot[tache] = debut + durees[tache]
+
+    if not ordre:
+        return resultat
+    duree_projet = max(fin_tot.values())
+    resultat.duree = duree_projet
+
+    # Passe arrière : temps au plus tard (depuis la fin du projet)
+    debut_tard = resultat.debut_tard
+    fin_tard = resultat.fin_tard
+    for tache in ordre:
+        fin_tard[tache] = duree_projet
+    for tache in reversed(ordre):
+        debut = fin_tard[tache] - durees[tache]
+        debut_tard[tache] = debut
+        resultat.marge[tache] = debut - debut_tot[tache]
+        for dep in tache.dependances:
+            if debut < fin_tard[dep]:
+                fin_tard[dep] = debut
+
+    resultat.chemin_critique = _extraire_chemin(ordre, fin_tot, durees, duree_projet)
+    return resultat
+
+
+def _extraire_chemin(ordre: List, fin_tot: Dict, durees: Dict, duree_projet: int) -> List:
+    # On part de la première tâche qui termine le projet et on remonte par
+    # les dépendances qui la contraignent (marge nulle par construction).
+    tache = next(t for t in ordre if fin_tot[t] == duree_projet)
+    chemin = [tache]
+    while tache.dependances:
+        debut = fin_tot[tache] - durees[tache]
+        tache = next(dep for dep in tache.dependances if fin_tot[dep] == debut)
+        chemin.append(tache)
+    chemin.reverse()
+    return chemin
+
+
+def calculer_cpm_indices(durees: List[int], dependances: List[List[int]]) -> ResultatCPM:
+    # Même calcul que calculer_cpm sur des tâches numérotées 0..n-1 : pas
+    # d'objet à construire, les temps sont des listes indexées par numéro.
+    n = len(durees)
+    successeurs: List[List[int]] = [[] for _ in range(n)]
+    degre = [len(deps) for deps in dependances]
+    for i, deps in enumerate(dependances):
+        for dep in deps:
+            successeurs[dep].append(i)
+    ordre = [i for i in range(n) if degre[i] == 0]
+    for i in ordre:
+        for succ in successeurs[i]:
+            degre[succ] -= 1
+            if degre[succ] == 0:
+                ordre.append(succ)
+    if len(ordre) != n:
+        restantes = set(range(n)).difference(ordre)
+        vues: Dict[int, int] = {}
+        chemin = []
+        i = min(restantes)
+        while i not in vues:
+            vues[i] = len(chemin)
+            chemin.append(i)
+            i = next(dep for dep in dependances[i] if dep in restantes)
+        cycle = chemin[vues[i]:]
+        cycle.reverse()
+        raise CycleDependancesError(cycle + [cycle[0]])
+
+    resultat = ResultatCPM(ordre)
+    debut_tot = resultat.debut_tot = [0] * n
+    fin_tot = resultat.fin_tot = [0] * n
+    for i in ordre:
+        debut = max([fin_tot[dep] for dep in dependances[i]], default=0)
+        debut_tot[i] = debut
+        fin_tot[i] = debut + durees[i]
+    if not n:
+        return resultat
+    duree_projet = resultat.duree = max(fin_tot)
+
+    fin_tard = resultat.fin_tard = [duree_projet] * n
+    debut_tard = resultat.debut_tard = [0] * n
+    marge = resultat.marge = [0] * n
+    for i in reversed(ordre):
+        debut = fin_tard[i] - durees[i]
+        debut_tard[i] = debut
+        marge[i] = debut - debut_tot[i]
+        for dep in dependances[i]:
+            if debut < fin_tard[dep]:
+                fin_tard[dep] = debut
+
+    i = next(i for i in ordre if fin_tot[i] == duree_projet)
+    chemin = [i]
+    while dependances[i]:
+        i = next(dep for dep in dependances[i] if fin_tot[dep] == debut_tot[i])
+        chemin.append(i)
+    chemin.reverse()
+    resultat.chemin_critique = chemin
+    return resultat
+
+
+class CheminCritiqueIncremental:
+    # Planning CPM maintenu en continu. On stocke pour chaque tâche son début
+    # au plus tôt (qui ne dépend que de l'amont) et sa « queue », la durée du
+    # plus long chemin depuis son début jusqu'à la fin du projet (qui ne
+    # dépend que de l'aval). Une modification ne salit donc que le cône aval
+    # pour la passe avant et le cône amont pour la passe arrière ; les temps
+    # au plus tard s'en déduisent : debut_tard = duree_projet - queue.
+    #
+    # Un ordre topologique des tâches suivies est tenu à jour à chaque
+    # arête (Pearce-Kelly) : une arête déjà dans le sens de l'ordre ne
+    # coûte rien, sinon seule la zone comprise entre ses deux extrémités
+    # est explorée et réordonnée. Une arête qui fermerait un cycle est
+    # refusée dès Tache.ajouter_dependance.
+    def __init__(self, calendrier=None):
+        self.calendrier = calendrier
+        self._rang: Dict = {}
+        self._ordre: List = []
+        self._durees: Dict = {}
+        self._dependances: Dict = {}
+        self._successeurs: Dict = {}
+        self._debut_tot: Dict = {}
+        self._queue: Dict = {}
+        self._sales_avant = set()
+        self._sales_arriere = set()
+        self._duree_projet = 0
+        self._tache_finale = None
+        self._rescanner = False
+
+    def __len__(self) -> int:
+        return len(self._durees)
+
+    def __contains__(self, tache) -> bool:
+        return tache in self._durees
+
+    def ajouter(self, tache) -> None:
+        # La tâche et ses dépendances pas encore suivies forment un lot
+        # qu'aucune tâche suivie ne précède : trié à part (Kahn), il se
+        # place en fin d'ordre sans rien déranger.
+        if tache in self._durees:
+            return
+        lot = {tache: 0}
+        pile = [tache]
+        while pile:
+            for dep in pile.pop().dependances:
+                if dep not in lot and dep not in self._durees:
+                    lot[dep] = 0
+                    pile.append(dep)
+        successeurs: Dict = {}
+        for t in lot:
+            for dep in t.dependances:
+                if dep in lot:
+                    lot[t] += 1
+                    successeurs.setdefault(dep, []).append(t)
+        ordre = [t for t, degre in lot.items() if degre == 0]
+        for t in ordre:
+            for succ in successeurs.get(t, ()):
+                lot[succ] -= 1
+                if lot[succ] == 0:
+                    ordre.append(succ)
+        if len(ordre) != len(lot):
+            triees = set(ordre)
+            raise CycleDependancesError(_trouver_cycle(t for t in lot if t not in triees))
+
+        for tache in ordre:
+            self._rang[tache] = len(self._ordre)
+            self._ordre.append(tache)
+            self._durees[tache] = duree(tache, self.calendrier)
+            self._dependances[tache] = []
+            self._successeurs.setdefault(tache, [])
+            self._debut_tot[tache] = 0
+            self._queue[tache] = 0
+            tache.ajouter_observateur(self.marquer)
+            self._synchroniser_dependances(tache)
+            self._sales_avant.add(tache)
+            self._sales_arriere.add(tache)
+
+    def ordre(self) -> List:
+        # Tâches suivies, chacune après toutes ses dépendances
+        return list(self._ordre)
+
+    def _verifier(self, tache, dep) -> None:
+        # Appelé avant qu'une nouvelle dépendance ne soit publiée
+        if dep in self._durees:
+            self._ordonner(dep, tache)
+            return
+        # Dépendance pas encore suivie : il y a cycle si elle dépend, de
+        # proche en proche, de `tache`. Les tâches suivies rangées avant
+        # `tache` ne peuvent pas en dépendre et arrêtent la remontée.
+        rang = self._rang[tache]
+        parents = {dep: None}
+        pile = [dep]
+        while pile:
+            courante = pile.pop()
+            if courante in self._durees:
+                if self._rang[courante] < rang:
+                    continue
+                suivantes = self._dependances[courante]
+            else:
+                suivantes = courante.dependances
+            for precedente in suivantes:
+                if precedente is tache:
+                    cycle = [tache]
+                    while courante is not None:
+                        cycle.append(courante)
+                        courante = parents[courante]
+                    raise CycleDependancesError(cycle + [tache])
+                if precedente not in parents:
+                    parents[precedente] = courante
+                    pile.append(precedente)
+
+    def _ordonner(self, dep, tache) -> None:
+        # Place `dep` avant `tache` dans l'ordre (Pearce-Kelly)
+        rang = self._rang
+        bas, haut = rang[tache], rang[dep]
+        if haut < bas:
+            return
+        if dep is tache:
+            raise CycleDependancesError([tache, tache])
+        # Aval de `tache` jusqu'au rang de `dep` : atteindre `dep` = cycle
+        parents = {tache: None}
+        pile = [tache]
+        aval = []
+        while pile:
+            courante = pile.pop()
+            aval.append(courante)
+            for succ in self._successeurs[courante]:
+                if succ is dep:
+                    cycle = [dep]
+                    while courante is not None:
+                        cycle.append(courante)
+                        courante = parents[courante]
+                    cycle.reverse()
+                    raise CycleDependancesError([dep] + cycle)
+                if rang[succ] < haut and succ not in parents:
+                    parents[succ] = courante
+                    pile.append(succ)
+        # Amont de `dep` jusqu'au rang de `tache`
+        vues = {dep}
+        pile = [dep]
+        amont = []
+        while pile:
+            courante = pile.pop()
+            amont.append(courante)
+            for precedente in self._dependances[courante]:
+                if rang[precedente] > bas and precedente not in vues:
+                    vues.add(precedente)
+                    pile.append(precedente)
+        # L'amont prend les premières places libérées, l'aval les suivantes,
+        # chacun dans son ordre relatif actuel
+        amont.sort(key=rang.__getitem__)
+        aval.sort(key=rang.__getitem__)
+        places = sorted(rang[t] for t in amont + aval)
+        for t, place in zip(amont + aval, places):
+            rang[t] = place
+            self._ordre[place] = t
+
+    def definir_calendrier(self, calendrier) -> None:
+        # Les durées changent d'unité : seules celles qui bougent salissent le planning
+        self.calendrier = calendrier
+        taches = list(self._durees)
+        if calendrier is None:
+            nouvelles = [duree(tache) for tache in taches]
+        else:
+            nouvelles = calendrier.durees(taches)
+        for tache, nouvelle in zip(taches, nouvelles):
+            self._changer_duree(tache, nouvelle)
+
+    def _changer_duree(self, tache, nouvelle: int) -> None:
+        ancienne = self._durees[tache]
+        if nouvelle == ancienne:
+            return
+        # La passe avant ne voit plus l'ancienne fin : si la tâche qui
+        # termine le projet raccourcit, la fin du projet est recherchée
+        if tache is self._tache_finale and nouvelle < ancienne:
+            self._rescanner = True
+        self._durees[tache] = nouvelle
+        self._sales_avant.add(tache)
+        self._sales_arriere.add(tache)
+
+    def marquer(self, tache, attribut: str) -> None:
+        if attribut == "dependance_proposee":
+            self._verifier(tache, tache.dependances[-1])
+        elif attribut in ("date_debut", "date_fin"):
+            self._changer_duree(tache, duree(tache, self.calendrier))
+        elif attribut == "dependances":
+            for dep in self._synchroniser_dependances(tache):
+                if dep not in self._durees:
+                    self.ajouter(dep)
+                self._ordonner(dep, tache)
+                self._sales_arriere.add(dep)
+            self._sales_avant.add(tache)
+
+    def _synchroniser_dependances(self, tache) -> List:
+        connues = self._dependances[tache]
+        nouvelles = tache.dependances[len(connues):]
+        for dep in nouvelles:
+            connues.append(dep)
+            self._successeurs.setdefault(dep, []).append(tache)
+        return nouvelles
+
+    def _ordre_cone(self, graines, suivants: Dict, inverse: bool = False) -> List:
+        # Cône atteignable depuis `graines` via `suivants`, rangé selon
+        # l'ordre topologique tenu à jour (à rebours pour la passe arrière)
+        cone = set(graines)
+        pile = list(graines)
+        while pile:
+            for voisin in suivants[pile.pop()]:
+                if voisin not in cone:
+                    cone.add(voisin)
+                    pile.append(voisin)
+        return sorted(cone, key=self._rang.__getitem__, reverse=inverse)
+
+    def _propager(self) -> None:
+        if self._sales_avant or self._rescanner or self._sales_arriere:
+            self._recalculer()
+
+    def _recalculer(self) -> None:
+        if self._sales_avant:
+            ordre = self._ordre_cone(self._sales_avant, self._successeurs)
+            debut_tot = self._debut_tot
+            for tache in ordre:
+                ancienne_fin = debut_tot[tache] + self._durees[tache]
+                debut = max(
+                    (debut_tot[d] + self._durees[d] for d in self._dependances[tache]),
+                    default=0,
+                )
+                debut_tot[tache] = debut
+                fin = debut + self._durees[tache]
+                if fin > self._duree_projet or self._tache_finale is None:
+                    self._duree_projet = fin
+                    self._tache_finale = tache
+                elif tache is self._tache_finale and fin < ancienne_fin:
+                    self._rescanner = True
+            self._sales_avant.clear()
+
+        if self._rescanner:
+            debut_tot = self._debut_tot
+            self._tache_finale = max(
+                self._durees, key=lambda t: debut_tot[t] + self._durees[t]
+            )
+            self._duree_projet = debut_tot[self._tache_finale] + self._durees[
+                self._tache_finale
+            ]
+            self._rescanner = False
+
+        if self._sales_arriere:
+            ordre = self._ordre_cone(self._sales_arriere, self._dependances, inverse=True)
+            queue = self._queue
+            for tache in ordre:
+                queue[tache] = self._durees[tache] + max(
+                    (queue[s] for s in self._successeurs[tache]), default=0
+                )
+            self._sales_arriere.clear()
+
+    def duree_projet(self) -> int:
+        self._propager()
+        return self._duree_projet
+
+    def debut_tot(self, tache) -> int:
+        self._propager()
+        return self._debut_tot[tache]
+
+    def fin_tot(self, tache) -> int:
+        return self.debut_tot(tache) + self._durees[tache]
+
+    def debut_tard(self, tache) -> int:
+        self._propager()
+        return self._duree_projet - self._queue[tache]
+
+    def fin_tard(self, tache) -> int:
+        return self.debut_tard(tache) + self._durees[tache]
+
+    def marge(self, tache) -> int:
+        return self.debut_tard(tache) - self._debut_tot[tache]
+
+    def chemin_critique(self) -> List:
+        self._propager()
+        tache = self._tache_finale
+        if tache is None:
+            return []
+        chemin = [tache]
+        while self._dependances[tache]:
+            debut = self._debut_tot[tache]
+            tache = next(
+                dep
+                for dep in self._dependances[tache]
+                if self._debut_tot[dep] + self._durees[dep] == debut
+            )
+            chemin.append(tache)
+        chemin.reverse()
+        return chemin
+
+
+instrumenter(CheminCritiqueIncremental, "_recalculer", "cpm.incremental")
@@ -1,101 +1,47 @@
-from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Callable, Any
-
-
-class NotificationStrategy(ABC):
-    @abstractmethod
-    def envoyer(self, message: str, destinataire: str) -> None:
-        pass
-
-
-class EmailNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par email: {message}")
-
-
-class SMSNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par SMS: {message}")
-
-
-class PushNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par push notification: {message}")
-
-
-class NotificationContext:
-    def __init__(self, strategy: NotificationStrategy):
-        self._strategy = strategy
-
-    def set_strategy(self, strategy: NotificationStrategy):
-        self._strategy = strategy
-
-    def notifier(self, message: str, destinataires: List[str]) -> None:
-        for destinataire in destinataires:
-            self._strategy.envoyer(message, destinataire)
-
-
-class Membre:
-    def __init__(self, nom: str, role: str):
-        self.nom = nom
-        self.role = role
-
-
-class Tache:
-    def __init__(
-        self,
-        nom: str,
-        description: str,
-        date_debut: datetime,
-        date_fin: datetime,
-        responsable: Membre,
-        statut: str,
-    ):
-        self.nom = nom
-        self.description = description
-        self.date_debut = date_debut
-        self.date_fin = date_fin
-        self.responsable = responsable
-        self.statut = statut
-        self.dependances: List[Tache] = []
-
-    def ajouter_dependance(self, tache: "Tache"):
-        self.dependances.append(tache)
-
-    def mettre_a_jour_statut(self, statut: str):
-        self.statut = statut
-
-
-class Equipe:
-    def __init__(self):
-        self.membres: List[Membre] = []
-
-    def ajouter_membre(self, membre: Membre):
-        self.membres.append(membre)
-
-    def obtenir_membres(self) -> List[Membre]:
-        return self.membres
-
-
-class Risque:
-    def __init__(self, description: str, probabilite: float, impact: str):
-        self.description = description
-        self.probabilite = probabilite
-        self.impact = impact
-
-
-class Jalon:
-    def __init__(self, nom: str, date: datetime):
-        self.nom = nom
-        self.date = date
-
-
-class Changement:
-    def __init__(self, description: str, version: int, date: datetime):
-        self.description = description
-        self.version = version
-        self.date = date
+from typing import List, Dict, Callable, Any, Iterator, Optional, TextIO
+
+from calendrier import Calendrier
+from chemin_critique import (
+    CheminCritiqueIncremental,
+    CycleDependancesError,
+    ResultatCPM,
+    calculer_cpm,
+)
+from index_projet import IndexProjet
+from journal import (
+    BUDGET_DEFINI,
+    CHANGEMENT_ENREGISTRE,
+    JALON_AJOUTE,
+    MEMBRE_AJOUTE,
+    RISQUE_AJOUTE,
+    TACHE_AJOUTEE,
+    Evenement,
+    JournalActivites,
+)
+from metriques import instrumenter
+from modeles import (
+    Changement,
+    Equipe,
+    Impact,
+    Jalon,
+    Membre,
+    Risque,
+    Role,
+    Statut,
+    Tache,
+)
+from nivellement import PlanningNivele, niveler
+from notifications import (
+    DistributeurAsynchrone,
+    EmailNotificationStrategy,
+    NotificationContext,
+    NotificationStrategy,
+    PushNotificationStrategy,
+    SMSNotificationStrategy,
+)
 
 
 class Projet:
@@ -112,42 +58,141 @@ class Projet:
         self.jalons: List[Jalon] = []
         self.changements: List[str] = []
         self.notification_context = NotificationContext(EmailNotificationStrategy())
-        self.activites: List[str] = []
+        self.activites = JournalActivites()
+        self._activites_en_attente: Optional[List[Evenement]] = None
+        # Rappels (code, objet) appelés à chaque mutation, ex. la persistance
+        self.observateurs: List[Callable[[int, object], None]] = []
+        self._planning: Optional[CheminCritiqueIncremental] = None
+        self._index: Optional[IndexProjet] = None
+        # Sans calendrier, les durées sont en jours calendaires
+        self.calendrier: Optional[Calendrier] = None
+
+    @property
+    def planning(self) -> CheminCritiqueIncremental:
+        # Construit à la première demande : un projet chargé depuis le disque
+        # ne matérialise pas ses tâches tant que personne n'en a besoin.
+        if self._planning is None:
+            self._planning = CheminCritiqueIncremental(self.calendrier)
+            for tache in self.taches:
+                if isinstance(tache, Tache):
+                    self._planning.ajouter(tache)
+        return self._planning
+
+    @property
+    def index(self) -> IndexProjet:
+        if self._index is None:
+            self._index = IndexProjet()
+            for tache in self.taches:
+                if isinstance(tache, Tache):
+                    self._index.ajouter_tache(tache)
+            for jalon in self.jalons:
+                if isinstance(jalon, Jalon):
+                    self._index.ajouter_jalon(jalon)
+        return self._index
 
     def set_notification_strategy(self, strategy: NotificationStrategy) -> None:
-        self.notification_context = NotificationContext(strategy)
+        self.notification_context.set_strategy(strategy)
+
+    def activer_notifications_asynchrones(
+        self, distributeur: Optional[DistributeurAsynchrone] = None
+    ) -> DistributeurAsynchrone:
+        # Les mutations mettent les notifications en file et rendent la main
+        if distributeur is None:
+            distributeur = DistributeurAsynchrone()
+        self.notification_context.distributeur = distributeur
+        return distributeur
+
+    def _journaliser(self, code: int, reference: object) -> None:
+        for observateur in self.observateurs:
+            observateur(code, reference)
+        if self._activites_en_attente is not None:
+            self._activites_en_attente.append(
+                Evenement(code, time.time(), reference)
+            )
+        else:
+            self.activites.enregistrer(code, reference)
+
+    @contextmanager
+    def batch(self) -> Iterator["Projet"]:
+        # Les mutations s'appliquent tout de suite ; les notifications sont
+        # regroupées en un récapitulatif par destinataire et les activités
+        # ajoutées d'un seul coup à la sortie du bloc.
+        if self._activites_en_attente is not None:
+            yield self
+            return
+        self._activites_en_attente = []
+        try:
+            with self.notification_context.regrouper():
+                yield self
+        finally:
+            self.activites.etendre(self._activites_en_attente)
+            self._activites_en_attente = None
 
     def ajouter_membre_equipe(self, membre: str) -> None:
         self.equipe.append(membre)
-        self.activites.append(f"Membre ajouté: {membre}")
+        self._journaliser(MEMBRE_AJOUTE, membre)
         self.notification_context.notifier(
             f"{membre} a été ajouté à l'équipe", self.equipe
         )
 
+    def _surveiller(self, tache) -> None:
+        if isinstance(tache, Tache):
+            tache.ajouter_observateur(self._verifier_dependance)
+
+    def _verifier_dependance(self, tache: Tache, attribut: str) -> None:
+        # Une fois construit, le planning refuse lui-même les cycles. Avant,
+        # on remonte les dépendances de la nouvelle dépendance : si elles
+        # mènent à `tache`, l'arête fermerait un cycle.
+        if attribut != "dependance_proposee" or self._planning is not None:
+            return
+        dep = tache.dependances[-1]
+        parents = {dep: None}
+        pile = [dep]
+        while pile:
+            courante = pile.pop()
+            for precedente in courante.dependances:
+                if precedente is tache:
+                    cycle = [tache]
+                    while courante is not None:
+                        cycle.append(courante)
+                        courante = parents[courante]
+                    raise CycleDependancesError(cycle + [tache])
+                if precedente not in parents:
+                    parents[precedente] = courante
+                    pile.append(precedente)
+
     def ajouter_tache(self, tache: str) -> None:
         self.taches.append(tache)
-        self.activites.append(f"Tâche ajoutée: {tache}")
+        self._surveiller(tache)
+        if isinstance(tache, Tache):
+            if self._planning is not None:
+                self._planning.ajouter(tache)
+            if self._index is not None:
+                self._index.ajouter_tache(tache)
+        self._journaliser(TACHE_AJOUTEE, tache)
         self.notification_context.notifier(
             f"Nouvelle tâche ajoutée: {tache}", self.equipe
         )
 
     def definir_budget(self, budget: float) -> None:
         self.budget = budget
-        self.activites.append(f"Budget défini: {budget} Unité Monétaire")
+        self._journaliser(BUDGET_DEFINI, budget)
         self.notification_context.notifier(
             f"Le budget du projet a été défini à {budget} Unité Monétaire", self.equipe
         )
 
     def ajouter_risque(self, risque: str) -> None:
         self.risques.append(risque)
-        self.activites.append(f"Risque ajouté: {risque}")
+        self._journaliser(RISQUE_AJOUTE, risque)
         self.notification_context.notifier(
             f"Nouveau risque ajouté: {risque}", self.equipe
         )
 
     def ajouter_jalon(self, jalon: str) -> None:
         self.jalons.append(jalon)
-        self.activites.append(f"Jalon ajouté: {jalon}")
+        if isinstance(jalon, Jalon) and self._index is not None:
+            self._index.ajouter_jalon(jalon)
+        self._journaliser(JALON_AJOUTE, jalon)
         self.notification_context.notifier(
             f"Nouveau jalon ajouté: {jalon}", self.equipe
         )
@@ -155,79 +200,192 @@ class Projet:
     def enregistrer_changement(self, description: str, version: int) -> None:
         changement = f"{description} (version {version})"
         self.changements.append(changement)
-        self.activites.append(f"Changement enregistré: {changement}")
+        self._journaliser(CHANGEMENT_ENREGISTRE, changement)
         self.notification_context.notifier(
             f"Changement enregistré: {changement}", self.equipe
         )
 
-    def calculer_chemin_critique(self) -> List[str]:
-        # Utilisation de l'algorithme CPM pour calculer le chemin critique
-        chemins: Dict[str, int] = (
-            {}
-        )  # Dictionnaire pour stocker les chemins avec leurs durées
+    def importer_taches(self, source, format: Optional[str] = None) -> int:
+        # Chargement en masse depuis un CSV ou un JSON Lines : un seul lot
+        # d'activités et une seule notification récapitulative
+        from importation import lire_taches, pause_gc
+        # Les responsables déjà connus du projet sont repris tels quels
+        membres = {
+            membre.nom: membre
+            for membre in (*self.index.par_responsable, *self.equipe)
+            if isinstance(membre, Membre)
+        }
+        connus = len(membres)
+        noms = {getattr(membre, "nom", membre) for membre in self.equipe}
+        with pause_gc(), self.batch():
+            taches = lire_taches(source, format, membres, self.trouver_tache)
+            # Les responsables inconnus, créés à la lecture, rejoignent l'équipe
+            for membre in list(membres.values())[connus:]:
+                if membre.nom not in noms:
+                    self.equipe.append(membre.nom)
+                    self._journaliser(MEMBRE_AJOUTE, membre.nom)
+            for tache in taches:
+                self.taches.append(tache)
+                self._surveiller(tache)
+                if self._planning is not None:
+                    self._planning.ajouter(tache)
+                if self._index is not None:
+                    self._index.ajouter_tache(tache)
+                self._journaliser(TACHE_AJOUTEE, tache)
+        self.notification_context.notifier(
+            f"{len(taches)} tâches importées", self.equipe
+        )
+        return len(taches)
+
+    def definir_calendrier(self, calendrier: Optional[Calendrier]) -> None:
+        self.calendrier = calendrier
+        if self._planning is not None:
+            self._planning.definir_calendrier(calendrier)
+
+    def trouver_tache(self, nom: str) -> Optional[Tache]:
+        return self.index.tache(nom)
+
+    def taches_de(self, membre: Membre) -> List[Tache]:
+        return self.index.taches_de(membre)
+
+    def taches_par_statut(self, statut: str) -> List[Tache]:
+        return self.index.taches_par_statut(statut)
+
+    def taches_actives(self, debut: datetime, fin: datetime) -> List[Tache]:
+        return self.index.taches_actives(debut, fin)
+
+    def jalons_entre(self, debut: datetime, fin: datetime) -> List[Jalon]:
+        return self.index.jalons_entre(debut, fin)
+
+    def calculer_planning(self) -> ResultatCPM:
+        # Méthode du chemin critique en O(V+E) sur l'ordre topologique que
+        # le planning tient à jour : pas de tri à refaire
+        return calculer_cpm(self.planning.ordre(), self.calendrier, ordonnees=True)
+
+    def niveler_ressources(self, priorite: str = "debut_tard") -> PlanningNivele:
+        # Planning faisable : chaque responsable ne mène qu'une tâche à la fois
+        return niveler(self.taches, priorite, calendrier=self.calendrier)
+
+    def calculer_chemin_critique(self, vectorise: bool = False) -> List[str]:
+        # Seules les zones touchées depuis le dernier appel sont recalculées ;
+        # vectorisé, le réseau est compilé en tableaux NumPy (même calendrier,
+        # même ordre que le planning)
+        if vectorise:
+            from graphe_compact import GrapheCompact
+            graphe = GrapheCompact.depuis_taches(
+                self.planning.ordre(), self.calendrier, ordonnees=True
+            )
+            resultat = graphe.calculer_cpm()
+            taches, duree = graphe.chemin_critique(resultat), resultat.duree
+        else:
+            taches, duree = self.planning.chemin_critique(), self.planning.duree_projet()
+        chemin_critique = [tache.nom for tache in taches]
 
-        def dfs(tache: Tache, chemin: List[str], duree: int) -> None:
-            chemin.append(tache.nom)
-            duree += (tache.date_fin - tache.date_debut).days
+        print(
+            f"Chemin critique: {' -> '.join(chemin_critique)} avec une durée de {duree} jours"
+        )
+        return chemin_critique
+
+    def flux_rapport_performance(self) -> Iterator[str]:
+        # Le rapport est produit ligne par ligne, sans jamais être assemblé
+        yield f"Rapport d'activité du projet '{self.nom}':\n"
+        yield "\n"
+        yield f"Description: {self.description}\n"
+        yield f"Date de début: {self.date_debut}\n"
+        yield f"Date de fin: {self.date_fin}\n"
+        if hasattr(self, "budget"):
+            yield f"Budget: {self.budget} Unité Monétaire\n"
+        # Le contenu du projet, présent aussi pour un projet chargé depuis
+        # le disque, dont le journal d'activités repart à vide
+        for titre, elements in (
+            ("Équipe", self.equipe),
+            ("Tâches", self.taches),
+            ("Risques", self.risques),
+            ("Jalons", self.jalons),
+            ("Changements", self.changements),
+        ):
+            yield "\n"
+            yield f"{titre}:\n"
+            for element in elements:
+                yield _ligne(element)
+        yield "\n"
+        yield "Activités:\n"
+        for activite in self.activites:
+            yield f"- {activite}\n"
 
-            if not tache.dependances:
-                chemins[" -> ".join(chemin)] = duree
-            else:
-                for dependance in tache.dependances:
-                    dfs(dependance, chemin.copy(), duree)
+    def ecrire_rapport_performance(self, fichier: TextIO) -> None:
+        fichier.writelines(self.flux_rapport_performance())
 
-        for tache in self.taches:
-            if not tache.dependances:  # Si la tâche n'a pas de dépendances
-                dfs(tache, [], 0)
+    def generer_rapport_performance(self) -> str:
+        return "".join(self.flux_rapport_performance())
 
-        chemin_critique = max(chemins, key=lambda k: chemins[k])
-        duree_critique = chemins[chemin_critique]
 
-        print(
-            f"Chemin critique: {chemin_critique} avec une durée de {duree_critique} jours"
-        )
-        return chemin_critique.split(" -> ")
+def _ligne(element) -> str:
+    # Objets du modèle, ou simples chaînes pour les éléments saisis en texte
+    if isinstance(element, Tache):
+        responsable = getattr(element.responsable, "nom", element.responsable)
+        return f"- {element.nom}: {element.statut} (Début: {element.date_debut}, Fin: {element.date_fin}, Responsable: {responsable})\n"
+    if isinstance(element, Risque):
+        return f"- {element.description}: Probabilité {element.probabilite}, Impact {element.impact}\n"
+    if isinstance(element, Jalon):
+        return f"- {element.nom}: {element.date}\n"
+    if isinstance(element, Membre):
+        return f"- {element.nom} ({element.role})\n"
+    return f"- {element}\n"
 
-    def generer_rapport_performance(self) -> str:
-        rapport = f"Rapport d'activité du projet '{self.nom}':\n\n"
-        rapport += f"Description: {self.description}\n"
-        rapport += f"Date de début: {self.date_debut}\n"
-        rapport += f"Date de fin: {self.date_fin}\n\n"
-        rapport += "Activités:\n"
-        for activite in self.activites:
-            rapport += f"- {activite}\n"
-        return rapport
 
+# Points de mesure, enveloppés seulement quand metriques.activer() est appelé
+for _methode in (
+    "ajouter_membre_equipe",
+    "ajouter_tache",
+    "definir_budget",
+    "ajouter_risque",
+    "ajouter_jalon",
+    "enregistrer_changement",
+):
+    instrumenter(Projet, _methode, f"projet.{_methode}", mutation=True)
+instrumenter(Projet, "calculer_planning", "projet.calculer_planning")
+instrumenter(Projet, "calculer_chemin_critique", "projet.calculer_chemin_critique")
+instrumenter(Projet, "niveler_ressources", "projet.niveler_ressources")
+instrumenter(Projet, "flux_rapport_performance", "projet.rapport", taille=len)
 
-projet = Projet(
-    "FRAISEN",
-    "LA CRÉATION DU RÉSEAU FRAISEN A COMME BUT D'UNIFIER ET D'ACCOMPAGNER LES PRODUCTEURS DE FRAISES EN AFRIQUE SOUS UN LABEL DE QUALITÉ UNIQUE",
-    datetime(2024, 1, 1),
-    datetime(2024, 12, 31),
-)
 
-# Ajouter des membres
-projet.ajouter_membre_equipe("Ousmane Mbathie")
-projet.ajouter_membre_equipe("Oumar boune Khatabe Thiam")
-projet.ajouter_membre_equipe("Mouhamed Koné")
+def demo() -> None:
+    projet = Projet(
+        "FRAISEN",
+        "LA CRÉATION DU RÉSEAU FRAISEN A COMME BUT D'UNIFIER ET D'ACCOMPAGNER LES PRODUCTEURS DE FRAISES EN AFRIQUE SOUS UN LABEL DE QUALITÉ UNIQUE",
+        datetime(2024, 1, 1),
+        datetime(2024, 12, 31),
+    )
+
+    # Ajouter des membres
+    projet.ajouter_membre_equipe("Ousmane Mbathie")
+    projet.ajouter_membre_equipe("Oumar boune Khatabe Thiam")
+    projet.ajouter_membre_equipe("Mouhamed Koné")
+
+    # Ajouter des tâches
+    projet.ajouter_tache("Analyse des besoins")
+    projet.ajouter_tache("Développement")
+
+    # Définir le budget
+    projet.definir_budget(700000)
+
+    # Ajouter des risques
+    projet.ajouter_risque("Retard de livraison")
+
+    # Ajouter des jalons
+    projet.ajouter_jalon("Phase 1 terminée")
 
-# Ajouter des tâches
-projet.ajouter_tache("Analyse des besoins")
-projet.ajouter_tache("Développement")
+    # Enregistrer des changements
+    projet.enregistrer_changement("Changement de la portée du projet", 2)
 
-# Définir le budget
-projet.definir_budget(700000)
 
-# Ajouter des risques
-projet.ajouter_risque("Retard de livraison")
+    # Générer le rapport de performance
+    rapport = projet.generer_rapport_performance()
+    print(rapport)
 
-# Ajouter des jalons
-projet.ajouter_jalon("Phase 1 terminée")
 
-# Enregistrer des changements
-projet.enregistrer_changement("Changement de la portée du projet", 2)
+if __name__ == "__main__":
+    demo()
 
 
-# Générer le rapport de performance
-rapport = projet.generer_rapport_performance()
-print(rapport)
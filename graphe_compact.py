@@ -0,0 +1,190 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from chemin_critique import CycleDependancesError, ordre_topologique
+from metriques import instrumenter
+
+
+def _voisins(ptr: np.ndarray, idx: np.ndarray, noeuds: np.ndarray):
+    # Concatène les segments CSR des `noeuds` ; renvoie aussi la taille de
+    # chaque segment pour pouvoir répéter les valeurs sources.
+    debuts = ptr[noeuds]
+    tailles = ptr[noeuds + 1] - debuts
+    total = int(tailles.sum())
+    if total == 0:
+        return idx[:0], tailles
+    decalages = np.repeat(debuts - np.cumsum(tailles) + tailles, tailles)
+    return idx[decalages + np.arange(total)], tailles
+
+
+def _csr(n: int, lignes: np.ndarray, colonnes: np.ndarray):
+    ordre = np.argsort(lignes, kind="stable")
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(lignes, minlength=n), out=ptr[1:])
+    return ptr, colonnes[ordre].astype(np.int32)
+
+
+class ResultatCompact:
+    def __init__(self, debut_tot, fin_tot, debut_tard, fin_tard, duree: int):
+        self.debut_tot = debut_tot
+        self.fin_tot = fin_tot
+        self.debut_tard = debut_tard
+        self.fin_tard = fin_tard
+        self.marge = debut_tard - debut_tot
+        self.duree = duree
+        self.chemin_critique: List[int] = []
+
+
+class GrapheCompact:
+    def __init__(
+        self,
+        durees: np.ndarray,
+        sources: np.ndarray,
+        cibles: np.ndarray,
+        debuts: Optional[np.ndarray] = None,
+        origine: Optional[datetime] = None,
+        taches: Optional[Sequence] = None,
+    ):
+        # Arête sources[i] -> cibles[i] : cibles[i] dépend de sources[i]
+        n = len(durees)
+        self.durees = np.asarray(durees, dtype=np.int32)
+        self.debuts = (
+            np.zeros(n, dtype=np.int64)
+            if debuts is None
+            else np.asarray(debuts, dtype=np.int64)
+        )
+        self.origine = origine
+        self.taches = taches
+        sources = np.asarray(sources, dtype=np.int64)
+        cibles = np.asarray(cibles, dtype=np.int64)
+        self.pred_ptr, self.pred_idx = _csr(n, cibles, sources)
+        self.succ_ptr, self.succ_idx = _csr(n, sources, cibles)
+        self._niveaux: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def depuis_taches(
+        cls, taches: Sequence, calendrier=None, ordonnees: bool = False
+    ) -> "GrapheCompact":
+        ordre = list(taches) if ordonnees else ordre_topologique(taches)
+        index = {tache: i for i, tache in enumerate(ordre)}
+        n = len(ordre)
+        origine = min((tache.date_debut for tache in ordre), default=None)
+        if calendrier is None:
+            durees = np.fromiter(
+                ((t.date_fin - t.date_debut).days for t in ordre), np.int32, n
+            )
+            debuts = np.fromiter(
+                ((t.date_debut - origine).days for t in ordre), np.int64, n
+            )
+        else:
+            # Rangs de jours ouvrés, convertis d'un bloc
+            rangs_debut = calendrier.rangs_tableau(
+                np.fromiter((t.date_debut.toordinal() for t in ordre), np.int64, n)
+            )
+            rangs_fin = calendrier.rangs_tableau(
+                np.fromiter((t.date_fin.toordinal() for t in ordre), np.int64, n)
+            )
+            durees = (rangs_fin - rangs_debut).astype(np.int32)
+            debuts = rangs_debut - (rangs_debut.min() if n else 0)
+        nb_aretes = sum(len(t.dependances) for t in ordre)
+        sources = np.fromiter(
+            (index[dep] for t in ordre for dep in t.dependances), np.int64, nb_aretes
+        )
+        cibles = np.fromiter(
+            (i for i, t in enumerate(ordre) for _ in t.dependances),
+            np.int64,
+            nb_aretes,
+        )
+        return cls(durees, sources, cibles, debuts, origine, ordre)
+
+    def __len__(self) -> int:
+        return len(self.durees)
+
+    def niveaux(self) -> List[np.ndarray]:
+        # Tri de Kahn par vagues : chaque niveau ne dépend que des précédents
+        if self._niveaux is not None:
+            return self._niveaux
+        degre = np.diff(self.pred_ptr)
+        frontiere = np.flatnonzero(degre == 0).astype(np.int32)
+        niveaux = []
+        traites = 0
+        while frontiere.size:
+            niveaux.append(frontiere)
+            traites += frontiere.size
+            cibles, _ = _voisins(self.succ_ptr, self.succ_idx, frontiere)
+            candidats, nombres = np.unique(cibles, return_counts=True)
+            degre[candidats] -= nombres
+            frontiere = candidats[degre[candidats] == 0]
+        if traites != len(self):
+            raise CycleDependancesError(self._taches(self._trouver_cycle(degre)))
+        self._niveaux = niveaux
+        return niveaux
+
+    def _trouver_cycle(self, degre: np.ndarray) -> List[int]:
+        # Les noeuds jamais libérés ont tous un prédécesseur non libéré :
+        # en remontant ces prédécesseurs on finit par boucler.
+        noeud = int(np.flatnonzero(degre > 0)[0])
+        vus = {}
+        chemin = []
+        while noeud not in vus:
+            vus[noeud] = len(chemin)
+            chemin.append(noeud)
+            preds = self.pred_idx[self.pred_ptr[noeud]:self.pred_ptr[noeud + 1]]
+            noeud = int(preds[np.argmax(degre[preds] > 0)])
+        cycle = chemin[vus[noeud]:]
+        cycle.reverse()
+        return cycle + [cycle[0]]
+
+    def calculer_cpm(self) -> ResultatCompact:
+        n = len(self)
+        niveaux = self.niveaux()
+        durees = self.durees.astype(np.int64)
+
+        # Passe avant : chaque niveau pousse sa fin au plus tôt vers ses successeurs
+        debut_tot = np.zeros(n, dtype=np.int64)
+        fin_tot = np.zeros(n, dtype=np.int64)
+        for niveau in niveaux:
+            fin_tot[niveau] = debut_tot[niveau] + durees[niveau]
+            cibles, tailles = _voisins(self.succ_ptr, self.succ_idx, niveau)
+            if cibles.size:
+                np.maximum.at(debut_tot, cibles, np.repeat(fin_tot[niveau], tailles))
+
+        duree = int(fin_tot.max()) if n else 0
+
+        # Passe arrière : niveaux dans l'ordre inverse, vers les prédécesseurs
+        fin_tard = np.full(n, duree, dtype=np.int64)
+        debut_tard = np.empty(n, dtype=np.int64)
+        for niveau in reversed(niveaux):
+            debut_tard[niveau] = fin_tard[niveau] - durees[niveau]
+            sources, tailles = _voisins(self.pred_ptr, self.pred_idx, niveau)
+            if sources.size:
+                np.minimum.at(fin_tard, sources, np.repeat(debut_tard[niveau], tailles))
+
+        resultat = ResultatCompact(debut_tot, fin_tot, debut_tard, fin_tard, duree)
+        if n:
+            resultat.chemin_critique = self._extraire_chemin(fin_tot, duree)
+        return resultat
+
+    def _extraire_chemin(self, fin_tot: np.ndarray, duree: int) -> List[int]:
+        noeud = int(np.argmax(fin_tot == duree))
+        chemin = [noeud]
+        while self.pred_ptr[noeud] != self.pred_ptr[noeud + 1]:
+            preds = self.pred_idx[self.pred_ptr[noeud]:self.pred_ptr[noeud + 1]]
+            debut = fin_tot[noeud] - self.durees[noeud]
+            noeud = int(preds[np.argmax(fin_tot[preds] == debut)])
+            chemin.append(noeud)
+        chemin.reverse()
+        return chemin
+
+    def _taches(self, indices: List[int]) -> List:
+        if self.taches is None:
+            return indices
+        return [self.taches[i] for i in indices]
+
+    def chemin_critique(self, resultat: ResultatCompact) -> List:
+        return self._taches(resultat.chemin_critique)
+
+
+instrumenter(GrapheCompact, "calculer_cpm", "cpm.vectorise")
@@ -0,0 +1,320 @@
+import os
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from chemin_critique import CycleDependancesError
+from metriques import instrumenter
+
+# Fichiers d'entrée : enregistrements de taille fixe, petit-boutistes, sans
+# en-tête. La tâche i est le i-ème enregistrement du fichier des tâches ;
+# l'arête (source, cible) signifie que `cible` dépend de `source`.
+TACHE = np.dtype([("duree", "<i4")])
+ARETE = np.dtype([("source", "<u4"), ("cible", "<u4")])
+# Fichier de sortie : un enregistrement par tâche, dans le même ordre
+RESULTAT = np.dtype(
+    [
+        ("debut_tot", "<i8"),
+        ("fin_tot", "<i8"),
+        ("debut_tard", "<i8"),
+        ("fin_tard", "<i8"),
+        ("marge", "<i8"),
+    ]
+)
+
+MEMOIRE_DEFAUT = 64 * 1024 * 1024
+# Octets de mémoire de travail par élément d'un bloc (une dizaine de
+# tableaux int64 temporaires par tâche ou arête traitée)
+_OCTETS_PAR_ELEMENT = 128
+
+Chemin = Union[str, os.PathLike]
+
+
+def _projection(chemin: Chemin, dtype, nombre: int) -> np.ndarray:
+    # Fichier de travail de `nombre` éléments, créé à zéro (creux sur disque)
+    if nombre == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(chemin, dtype=dtype, mode="w+", shape=(nombre,))
+
+
+def _lire(chemin: Chemin, dtype) -> np.ndarray:
+    if os.path.getsize(chemin) % np.dtype(dtype).itemsize:
+        raise ValueError(f"{chemin}: taille incompatible avec des enregistrements de {np.dtype(dtype).itemsize} octets")
+    if os.path.getsize(chemin) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(chemin, dtype=dtype, mode="r")
+
+
+def _tranches(total: int, bloc: int) -> Iterator[Tuple[int, int]]:
+    for debut in range(0, total, bloc):
+        yield debut, min(debut + bloc, total)
+
+
+def _blocs_aretes(
+    ptr: np.ndarray, idx: np.ndarray, noeuds: np.ndarray, bloc: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    # Parcourt les segments CSR des `noeuds` par paquets d'au plus `bloc`
+    # arêtes, même quand un seul noeud en a davantage. Rend pour chaque
+    # arête la position de son noeud dans `noeuds` et le voisin.
+    debuts = np.asarray(ptr[noeuds])
+    tailles = np.asarray(ptr[noeuds + 1]) - debuts
+    cumul = np.cumsum(tailles)
+    total = int(cumul[-1]) if cumul.size else 0
+    for a, b in _tranches(total, bloc):
+        rangs = np.arange(a, b)
+        lignes = np.searchsorted(cumul, rangs, side="right")
+        positions = debuts[lignes] + rangs - (cumul[lignes] - tailles[lignes])
+        yield lignes, np.asarray(idx[positions], dtype=np.int64)
+
+
+class ResultatDisque:
+    def __init__(self, temps: np.ndarray, duree: int, chemin_critique: List[int]):
+        # `temps` est la projection du fichier de sortie (dtype RESULTAT)
+        self.temps = temps
+        self.debut_tot = temps["debut_tot"]
+        self.fin_tot = temps["fin_tot"]
+        self.debut_tard = temps["debut_tard"]
+        self.fin_tard = temps["fin_tard"]
+        self.marge = temps["marge"]
+        self.duree = duree
+        self.chemin_critique = chemin_critique
+
+
+class GrapheDisque:
+    # Chemin critique hors mémoire. Les tâches et les arêtes restent dans
+    # des fichiers projetés en mémoire ; les listes d'adjacence (CSR), le
+    # tri topologique et les temps sont eux aussi des fichiers de travail.
+    # Tout se fait par blocs dont la taille découle de `memoire` : la
+    # mémoire de travail est bornée quel que soit le graphe, le reste est
+    # laissé au cache de pages du système.
+    def __init__(
+        self,
+        taches: Chemin,
+        aretes: Chemin,
+        memoire: int = MEMOIRE_DEFAUT,
+        dossier_travail: Optional[Chemin] = None,
+    ):
+        self.chemin_taches = taches
+        self.chemin_aretes = aretes
+        self.bloc = max(memoire // _OCTETS_PAR_ELEMENT, 1)
+        self.dossier_travail = dossier_travail
+        self.durees = _lire(taches, TACHE)["duree"]
+        self.aretes = _lire(aretes, ARETE)
+
+    @classmethod
+    def depuis_taches(
+        cls,
+        taches: Sequence,
+        dossier: Chemin,
+        calendrier=None,
+        memoire: int = MEMOIRE_DEFAUT,
+    ) -> Tuple["GrapheDisque", List]:
+        # Écrit taches.bin et aretes.bin dans `dossier` ; rend aussi la
+        # liste des tâches, dont la position est le numéro dans les fichiers
+        from chemin_critique import duree
+
+        ordre = list(taches)
+        index = {tache: i for i, tache in enumerate(ordre)}
+        i = 0
+        while i < len(ordre):
+            for dep in ordre[i].dependances:
+                if dep not in index:
+                    index[dep] = len(ordre)
+                    ordre.append(dep)
+            i += 1
+        if calendrier is None:
+            durees = [duree(tache) for tache in ordre]
+        else:
+            durees = calendrier.durees(ordre)
+        chemin_taches = os.path.join(dossier, "taches.bin")
+        chemin_aretes = os.path.join(dossier, "aretes.bin")
+        np.fromiter(durees, TACHE["duree"], len(ordre)).tofile(chemin_taches)
+        with open(chemin_aretes, "wb") as fichier:
+            for a, b in _tranches(len(ordre), 65536):
+                aretes = [
+                    (index[dep], i)
+                    for i in range(a, b)
+                    for dep in ordre[i].dependances
+                ]
+                fichier.write(np.array(aretes, dtype=ARETE).tobytes())
+        return cls(chemin_taches, chemin_aretes, memoire), ordre
+
+    def __len__(self) -> int:
+        return len(self.durees)
+
+    def calculer_cpm(self, sortie: Chemin) -> ResultatDisque:
+        if self.dossier_travail is not None:
+            return self._calculer(sortie, self.dossier_travail)
+        with tempfile.TemporaryDirectory(prefix="cpm-") as dossier:
+            return self._calculer(sortie, dossier)
+
+    def _calculer(self, sortie: Chemin, dossier: Chemin) -> ResultatDisque:
+        n = len(self)
+        temps = _projection(sortie, RESULTAT, n)
+        if n == 0:
+            return ResultatDisque(temps, 0, [])
+        pred_ptr, pred_idx = self._csr(dossier, "pred", "cible", "source")
+        succ_ptr, succ_idx = self._csr(dossier, "succ", "source", "cible")
+        ordre, vagues = self._ordonner(dossier, pred_ptr, pred_idx, succ_ptr, succ_idx)
+        duree = self._passe_avant(ordre, vagues, pred_ptr, pred_idx, temps)
+        self._passe_arriere(ordre, vagues, succ_ptr, succ_idx, temps, duree)
+        if isinstance(temps, np.memmap):
+            temps.flush()
+        chemin = self._extraire_chemin(pred_ptr, pred_idx, temps, duree)
+        del pred_ptr, pred_idx, succ_ptr, succ_idx, ordre, vagues
+        return ResultatDisque(temps, duree, chemin)
+
+    def _csr(self, dossier: Chemin, nom: str, cle: str, valeur: str):
+        # Tri par dénombrement en deux passes sur le fichier des arêtes :
+        # on compte les arêtes de chaque noeud, puis on range chacune à la
+        # place suivante de son noeud
+        n, m, bloc = len(self), len(self.aretes), self.bloc
+        ptr = _projection(os.path.join(dossier, f"{nom}_ptr.bin"), np.int64, n + 1)
+        idx = _projection(os.path.join(dossier, f"{nom}_idx.bin"), np.uint32, m)
+        for a, b in _tranches(m, bloc):
+            cles = np.asarray(self.aretes[cle][a:b], dtype=np.int64)
+            if cles.size and (cles.max() >= n or np.asarray(self.aretes[valeur][a:b]).max() >= n):
+                raise ValueError(f"Arête vers une tâche inexistante (bloc {a}..{b}, {n} tâches)")
+            noeuds, nombres = np.unique(cles, return_counts=True)
+            ptr[noeuds + 1] += nombres
+        cumul = 0
+        for a, b in _tranches(n + 1, bloc):
+            tranche = np.cumsum(ptr[a:b]) + cumul
+            ptr[a:b] = tranche
+            cumul = int(tranche[-1])
+
+        curseur = _projection(os.path.join(dossier, f"{nom}_curseur.bin"), np.int64, n)
+        for a, b in _tranches(n, bloc):
+            curseur[a:b] = ptr[a:b]
+        for a, b in _tranches(m, bloc):
+            cles = np.asarray(self.aretes[cle][a:b], dtype=np.int64)
+            valeurs = np.asarray(self.aretes[valeur][a:b])
+            rangement = np.argsort(cles, kind="stable")
+            cles = cles[rangement]
+            noeuds, premiers, nombres = np.unique(cles, return_index=True, return_counts=True)
+            rangs = np.arange(cles.size) - np.repeat(premiers, nombres)
+            idx[curseur[cles] + rangs] = valeurs[rangement]
+            curseur[noeuds] += nombres
+        del curseur
+        return ptr, idx
+
+    def _ordonner(self, dossier: Chemin, pred_ptr, pred_idx, succ_ptr, succ_idx):
+        # Tri de Kahn dont la file est le fichier `ordre` lui-même. On en
+        # traite au plus `bloc` tâches à la fois ; les tâches libérées sont
+        # ajoutées en queue, donc après le bloc courant. Chaque bloc traité
+        # forme une vague : toutes les dépendances de ses tâches sont dans
+        # des vagues antérieures, ce qui permet de calculer une vague entière
+        # d'un coup dans les deux passes.
+        n, bloc = len(self), self.bloc
+        degre = _projection(os.path.join(dossier, "degre.bin"), np.int64, n)
+        ordre = _projection(os.path.join(dossier, "ordre.bin"), np.int64, n)
+        vagues = _projection(os.path.join(dossier, "vagues.bin"), np.int64, n + 1)
+        queue = 0
+        for a, b in _tranches(n, bloc):
+            degre[a:b] = np.diff(pred_ptr[a:b + 1])
+            sources = np.flatnonzero(degre[a:b] == 0) + a
+            ordre[queue:queue + sources.size] = sources
+            queue += sources.size
+
+        tete = nb_vagues = 0
+        while tete < queue:
+            fin = min(tete + bloc, queue)
+            vagues[nb_vagues] = tete
+            nb_vagues += 1
+            noeuds = np.asarray(ordre[tete:fin])
+            for _, cibles in _blocs_aretes(succ_ptr, succ_idx, noeuds, bloc):
+                candidats, nombres = np.unique(cibles, return_counts=True)
+                restants = degre[candidats] - nombres
+                degre[candidats] = restants
+                liberes = candidats[restants == 0]
+                ordre[queue:queue + liberes.size] = liberes
+                queue += liberes.size
+            tete = fin
+        vagues[nb_vagues] = queue
+
+        if queue != n:
+            raise CycleDependancesError(self._trouver_cycle(degre, pred_ptr, pred_idx))
+        del degre
+        return ordre, vagues[:nb_vagues + 1]
+
+    def _premier_predecesseur(self, pred_ptr, pred_idx, noeud: int, garder) -> int:
+        # Premier prédécesseur de `noeud` retenu par `garder`, lu par blocs
+        for a, b in _tranches(int(pred_ptr[noeud + 1]) - int(pred_ptr[noeud]), self.bloc):
+            a += int(pred_ptr[noeud])
+            b += int(pred_ptr[noeud])
+            preds = np.asarray(pred_idx[a:b], dtype=np.int64)
+            retenus = preds[garder(preds)]
+            if retenus.size:
+                return int(retenus[0])
+        raise AssertionError("aucun prédécesseur retenu")
+
+    def _trouver_cycle(self, degre, pred_ptr, pred_idx) -> List[int]:
+        # Comme GrapheCompact : les tâches jamais libérées ont toutes un
+        # prédécesseur non libéré, en les remontant on finit par boucler
+        noeud = next(
+            a + int(np.flatnonzero(degre[a:b] > 0)[0])
+            for a, b in _tranches(len(self), self.bloc)
+            if (degre[a:b] > 0).any()
+        )
+        vus = {}
+        chemin = []
+        while noeud not in vus:
+            vus[noeud] = len(chemin)
+            chemin.append(noeud)
+            noeud = self._premier_predecesseur(
+                pred_ptr, pred_idx, noeud, lambda preds: degre[preds] > 0
+            )
+        cycle = chemin[vus[noeud]:]
+        cycle.reverse()
+        return cycle + [cycle[0]]
+
+    def _passe_avant(self, ordre, vagues, pred_ptr, pred_idx, temps) -> int:
+        bloc = self.bloc
+        fin_tot = temps["fin_tot"]
+        duree = 0
+        for v in range(len(vagues) - 1):
+            noeuds = np.asarray(ordre[vagues[v]:vagues[v + 1]])
+            debut = np.zeros(noeuds.size, dtype=np.int64)
+            for lignes, preds in _blocs_aretes(pred_ptr, pred_idx, noeuds, bloc):
+                np.maximum.at(debut, lignes, fin_tot[preds])
+            fin = debut + self.durees[noeuds]
+            temps["debut_tot"][noeuds] = debut
+            fin_tot[noeuds] = fin
+            duree = max(duree, int(fin.max()))
+        return duree
+
+    def _passe_arriere(self, ordre, vagues, succ_ptr, succ_idx, temps, duree: int) -> None:
+        bloc = self.bloc
+        debut_tard = temps["debut_tard"]
+        for v in reversed(range(len(vagues) - 1)):
+            noeuds = np.asarray(ordre[vagues[v]:vagues[v + 1]])
+            fin = np.full(noeuds.size, duree, dtype=np.int64)
+            for lignes, succs in _blocs_aretes(succ_ptr, succ_idx, noeuds, bloc):
+                np.minimum.at(fin, lignes, debut_tard[succs])
+            debut = fin - self.durees[noeuds]
+            temps["fin_tard"][noeuds] = fin
+            debut_tard[noeuds] = debut
+            temps["marge"][noeuds] = debut - temps["debut_tot"][noeuds]
+
+    def _extraire_chemin(self, pred_ptr, pred_idx, temps, duree: int) -> List[int]:
+        # Première tâche (par numéro) qui termine le projet, puis remontée
+        # par les dépendances qui la contraignent
+        fin_tot = temps["fin_tot"]
+        noeud = next(
+            a + int(np.argmax(fin_tot[a:b] == duree))
+            for a, b in _tranches(len(self), self.bloc)
+            if (fin_tot[a:b] == duree).any()
+        )
+        chemin = [noeud]
+        while pred_ptr[noeud] != pred_ptr[noeud + 1]:
+            debut = temps["debut_tot"][noeud]
+            noeud = self._premier_predecesseur(
+                pred_ptr, pred_idx, noeud, lambda preds: fin_tot[preds] == debut
+            )
+            chemin.append(noeud)
+        chemin.reverse()
+        return chemin
+
+
+instrumenter(GrapheDisque, "calculer_cpm", "cpm.hors_memoire")
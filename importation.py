@@ -0,0 +1,157 @@
+import gc
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from chemin_critique import ordre_topologique
+from modeles import Membre, Role, Statut, Tache
+
+FORMATS = ("csv", "jsonl")
+
+# Séparateur des noms de dépendances dans une cellule CSV
+SEPARATEUR_DEPENDANCES = ";"
+
+_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class ErreurImportation(ValueError):
+    def __init__(self, ligne: int, message: str):
+        self.ligne = ligne
+        super().__init__(f"Ligne {ligne}: {message}")
+
+
+@contextmanager
+def pause_gc() -> Iterator[None]:
+    # Un chargement en masse crée des centaines de milliers d'objets qui
+    # survivent tous : le ramasse-miettes les parcourrait sans rien libérer
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if actif:
+            gc.enable()
+
+
+def _lignes_csv(fichier: TextIO) -> Iterator[Tuple[int, Dict]]:
+    import csv
+
+    lecteur = csv.DictReader(fichier)
+    for enregistrement in lecteur:
+        yield lecteur.line_num, enregistrement
+
+
+def _lignes_jsonl(fichier: TextIO) -> Iterator[Tuple[int, Dict]]:
+    import json
+
+    for numero, ligne in enumerate(fichier, 1):
+        if not ligne.strip():
+            continue
+        try:
+            enregistrement = json.loads(ligne)
+        except ValueError as erreur:
+            raise ErreurImportation(numero, f"JSON invalide ({erreur})") from None
+        if not isinstance(enregistrement, dict):
+            raise ErreurImportation(numero, "un objet JSON est attendu")
+        yield numero, enregistrement
+
+
+def _noms_dependances(valeur) -> List[str]:
+    if not valeur:
+        return []
+    if isinstance(valeur, str):
+        valeur = valeur.split(SEPARATEUR_DEPENDANCES)
+    return [nom.strip() for nom in valeur if nom.strip()]
+
+
+def _date(numero: int, enregistrement: Dict, colonne: str) -> datetime:
+    valeur = enregistrement.get(colonne)
+    if not valeur:
+        raise ErreurImportation(numero, f"colonne '{colonne}' manquante")
+    try:
+        return datetime.fromisoformat(valeur)
+    except (TypeError, ValueError):
+        raise ErreurImportation(numero, f"date invalide pour '{colonne}': {valeur!r}") from None
+
+
+def lire_taches(
+    source: Union[str, os.PathLike, TextIO],
+    format: Optional[str] = None,
+    membres: Optional[Dict[str, Membre]] = None,
+    existante: Optional[Callable[[str], Optional[Tache]]] = None,
+) -> List[Tache]:
+    # Une passe sur le fichier, ligne par ligne : seules les tâches créées
+    # restent en mémoire. Une dépendance vers une tâche pas encore lue est
+    # mise en attente sous son nom et résolue quand celle-ci arrive ; les
+    # noms inconnus du fichier sont cherchés dans le projet (`existante`),
+    # où une tâche du fichier ne doit pas déjà figurer.
+    # Les tâches sont rendues dans l'ordre du fichier, dépendances posées,
+    # sans cycle. Colonnes : nom, date_debut et date_fin (ISO 8601)
+    # obligatoires ; description, responsable, role, statut, dependances.
+    if format is None:
+        if not isinstance(source, (str, os.PathLike)):
+            raise ValueError("Format obligatoire pour un flux déjà ouvert")
+        format = _SUFFIXES.get(os.path.splitext(os.fspath(source))[1].lower())
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu: {format} (attendu: {', '.join(FORMATS)})")
+    if membres is None:
+        membres = {}
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", newline="") as fichier:
+            return lire_taches(fichier, format, membres, existante)
+
+    lignes = _lignes_csv(source) if format == "csv" else _lignes_jsonl(source)
+    taches: List[Tache] = []
+    par_nom: Dict[str, Tache] = {}
+    # Nom attendu -> (tâches qui en dépendent, première ligne qui le cite)
+    en_attente: Dict[str, Tuple[List[Tache], int]] = {}
+    for numero, enregistrement in lignes:
+        nom = (enregistrement.get("nom") or "").strip()
+        if not nom:
+            raise ErreurImportation(numero, "colonne 'nom' manquante")
+        if nom in par_nom:
+            raise ErreurImportation(numero, f"tâche en double: {nom}")
+        if existante is not None and existante(nom) is not None:
+            raise ErreurImportation(numero, f"tâche déjà présente dans le projet: {nom}")
+
+        responsable = None
+        nom_responsable = (enregistrement.get("responsable") or "").strip()
+        if nom_responsable:
+            responsable = membres.get(nom_responsable)
+            if responsable is None:
+                role = enregistrement.get("role") or Role.DEVELOPPEUR
+                responsable = membres[nom_responsable] = Membre(nom_responsable, role)
+
+        tache = Tache(
+            nom,
+            enregistrement.get("description") or "",
+            _date(numero, enregistrement, "date_debut"),
+            _date(numero, enregistrement, "date_fin"),
+            responsable,
+            enregistrement.get("statut") or Statut.NON_COMMENCEE,
+        )
+        dependances = []
+        for nom_dep in _noms_dependances(enregistrement.get("dependances")):
+            dep = par_nom.get(nom_dep)
+            if dep is None and existante is not None:
+                dep = existante(nom_dep)
+            if dep is None:
+                en_attente.setdefault(nom_dep, ([], numero))[0].append(tache)
+            else:
+                dependances.append(dep)
+        # Pas encore observée : les dépendances sont posées sans notification
+        tache.dependances = tuple(dependances)
+
+        for successeur in en_attente.pop(nom, ((), 0))[0]:
+            successeur.poser_dependance(tache)
+        par_nom[nom] = tache
+        taches.append(tache)
+
+    if en_attente:
+        nom, (_, numero) = min(en_attente.items(), key=lambda element: element[1][1])
+        raise ErreurImportation(numero, f"dépendance inconnue: {nom}")
+    # Lève CycleDependancesError si le fichier décrit un cycle
+    ordre_topologique(taches)
+    return taches
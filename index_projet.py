@@ -0,0 +1,133 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from modeles import Jalon, Membre, Statut, Tache
+
+
+class IndexIntervalles:
+    # Intervalles [debut, fin] triés par début, avec un arbre des fins
+    # maximales : une requête descend seulement dans les sous-arbres qui
+    # contiennent un chevauchement, soit O(log n) par résultat.
+    # Les ajouts récents attendent dans un tampon parcouru linéairement ; il
+    # est fusionné dans l'arbre à la requête suivante s'il dépasse sqrt(n)
+    # éléments, ce qui garde les chargements en masse en O(1) par tâche.
+    def __init__(self):
+        self._intervalles: Dict[object, tuple] = {}
+        self._elements: List = []
+        self._debuts: List[datetime] = []
+        self._fins: List[datetime] = []
+        self._arbre: List[Optional[datetime]] = []
+        self._taille_feuilles = 0
+        self._recents: Dict[object, None] = {}
+        self._perimes = 0
+
+    def __len__(self) -> int:
+        return len(self._intervalles)
+
+    def placer(self, element, debut: datetime, fin: datetime) -> None:
+        ancien = self._intervalles.get(element)
+        if ancien is not None and element not in self._recents:
+            self._perimes += 1
+        self._intervalles[element] = (debut, fin)
+        self._recents[element] = None
+
+    def _reconstruire(self) -> None:
+        elements = sorted(self._intervalles, key=lambda e: self._intervalles[e][0])
+        self._elements = elements
+        self._debuts = [self._intervalles[e][0] for e in elements]
+        self._fins = [self._intervalles[e][1] for e in elements]
+        taille = 1
+        while taille < len(elements):
+            taille *= 2
+        arbre: List[Optional[datetime]] = [None] * (2 * taille)
+        arbre[taille:taille + len(elements)] = self._fins
+        for noeud in range(taille - 1, 0, -1):
+            gauche, droite = arbre[2 * noeud], arbre[2 * noeud + 1]
+            arbre[noeud] = gauche if droite is None or (
+                gauche is not None and gauche >= droite
+            ) else droite
+        self._arbre = arbre
+        self._taille_feuilles = taille
+        self._recents = {}
+        self._perimes = 0
+
+    def chevauchant(self, debut: datetime, fin: datetime) -> Iterator:
+        # Éléments dont l'intervalle coupe [debut, fin]
+        if len(self._recents) ** 2 > len(self._intervalles) or (
+            self._perimes > len(self._elements) // 2
+        ):
+            self._reconstruire()
+        limite = bisect_right(self._debuts, fin)
+        if limite:
+            pile = [(1, 0, self._taille_feuilles)]
+            while pile:
+                noeud, bas, haut = pile.pop()
+                maximum = self._arbre[noeud]
+                if bas >= limite or maximum is None or maximum < debut:
+                    continue
+                if haut - bas == 1:
+                    element = self._elements[bas]
+                    if element not in self._recents:
+                        yield element
+                    continue
+                milieu = (bas + haut) // 2
+                pile.append((2 * noeud + 1, milieu, haut))
+                pile.append((2 * noeud, bas, milieu))
+        for element in self._recents:
+            debut_element, fin_element = self._intervalles[element]
+            if debut_element <= fin and fin_element >= debut:
+                yield element
+
+
+class IndexProjet:
+    def __init__(self):
+        self.par_nom: Dict[str, List[Tache]] = {}
+        self.par_responsable: Dict[Membre, Dict[Tache, None]] = {}
+        self.par_statut: Dict[Statut, Dict[Tache, None]] = {}
+        self.par_dates = IndexIntervalles()
+        self._statuts: Dict[Tache, Statut] = {}
+        self._dates_jalons: List[tuple] = []
+        self._jalons: List[Jalon] = []
+
+    def ajouter_tache(self, tache: Tache) -> None:
+        self.par_nom.setdefault(tache.nom, []).append(tache)
+        self.par_responsable.setdefault(tache.responsable, {})[tache] = None
+        self.par_statut.setdefault(tache.statut, {})[tache] = None
+        self._statuts[tache] = tache.statut
+        self.par_dates.placer(tache, tache.date_debut, tache.date_fin)
+        tache.ajouter_observateur(self._sur_modification)
+
+    def _sur_modification(self, tache: Tache, attribut: str) -> None:
+        if attribut == "statut":
+            ancien = self._statuts[tache]
+            if ancien is not tache.statut:
+                del self.par_statut[ancien][tache]
+                self.par_statut.setdefault(tache.statut, {})[tache] = None
+                self._statuts[tache] = tache.statut
+        elif attribut in ("date_debut", "date_fin"):
+            self.par_dates.placer(tache, tache.date_debut, tache.date_fin)
+
+    def ajouter_jalon(self, jalon: Jalon) -> None:
+        cle = (jalon.date, len(self._jalons))
+        position = bisect_right(self._dates_jalons, cle)
+        insort(self._dates_jalons, cle)
+        self._jalons.insert(position, jalon)
+
+    def tache(self, nom: str) -> Optional[Tache]:
+        taches = self.par_nom.get(nom)
+        return taches[0] if taches else None
+
+    def taches_de(self, membre: Membre) -> List[Tache]:
+        return list(self.par_responsable.get(membre, ()))
+
+    def taches_par_statut(self, statut: str) -> List[Tache]:
+        return list(self.par_statut.get(statut, ()))
+
+    def taches_actives(self, debut: datetime, fin: datetime) -> List[Tache]:
+        return list(self.par_dates.chevauchant(debut, fin))
+
+    def jalons_entre(self, debut: datetime, fin: datetime) -> List[Jalon]:
+        bas = bisect_left(self._dates_jalons, (debut,))
+        haut = bisect_left(self._dates_jalons, (fin, len(self._jalons) + 1))
+        return self._jalons[bas:haut]
@@ -0,0 +1,132 @@
+import os
+import struct
+import time
+import weakref
+from collections import deque
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional
+
+MEMBRE_AJOUTE = 0
+TACHE_AJOUTEE = 1
+BUDGET_DEFINI = 2
+RISQUE_AJOUTE = 3
+JALON_AJOUTE = 4
+CHANGEMENT_ENREGISTRE = 5
+
+FORMATS = {
+    MEMBRE_AJOUTE: "Membre ajouté: {}",
+    TACHE_AJOUTEE: "Tâche ajoutée: {}",
+    BUDGET_DEFINI: "Budget défini: {} Unité Monétaire",
+    RISQUE_AJOUTE: "Risque ajouté: {}",
+    JALON_AJOUTE: "Jalon ajouté: {}",
+    CHANGEMENT_ENREGISTRE: "Changement enregistré: {}",
+}
+
+# Enregistrement sur disque : code, horodatage, longueur de la référence
+_ENTETE = struct.Struct("<BdI")
+_TAILLE_LECTURE = 1 << 16
+
+
+class Evenement(NamedTuple):
+    code: int
+    horodatage: float
+    reference: object
+
+    def formater(self) -> str:
+        return FORMATS[self.code].format(self.reference)
+
+
+class JournalActivites:
+    # Journal structuré : les événements récents restent en mémoire dans un
+    # tampon circulaire ; quand il est plein, la moitié la plus ancienne est
+    # déversée dans un fichier en ajout seul. Le texte n'est produit qu'à
+    # la lecture. Le fichier est fermé par `fermer`, ou à défaut quand le
+    # journal est libéré.
+    def __init__(self, capacite: int = 10_000, chemin: Optional[str] = None):
+        self.capacite = max(capacite, 2)
+        self.chemin = chemin
+        self._memoire: deque = deque()
+        self._fichier: Optional[BinaryIO] = None
+        self._fermeture: Optional[weakref.finalize] = None
+        self._nb_sur_disque = 0
+        if chemin is not None and os.path.exists(chemin):
+            self._ouvrir()
+            self._nb_sur_disque = sum(1 for _ in self._lire_disque(os.path.getsize(chemin)))
+
+    def __len__(self) -> int:
+        return self._nb_sur_disque + len(self._memoire)
+
+    def __iter__(self) -> Iterator[str]:
+        for evenement in self.evenements():
+            yield evenement.formater()
+
+    def enregistrer(self, code: int, reference: object) -> None:
+        self._memoire.append(Evenement(code, time.time(), reference))
+        if len(self._memoire) >= self.capacite:
+            self._deverser()
+
+    def etendre(self, evenements: Iterable[Evenement]) -> None:
+        self._memoire.extend(evenements)
+        while len(self._memoire) >= self.capacite:
+            self._deverser()
+
+    def _ouvrir(self) -> BinaryIO:
+        if self._fichier is None:
+            if self.chemin is None:
+                # Importé au premier déversement : tempfile coûte au démarrage
+                import tempfile
+                self._fichier = tempfile.TemporaryFile()
+            else:
+                self._fichier = open(self.chemin, "a+b")
+            self._fermeture = weakref.finalize(self, self._fichier.close)
+        return self._fichier
+
+    def _deverser(self, nombre: Optional[int] = None) -> None:
+        segment = bytearray()
+        for _ in range(self.capacite // 2 if nombre is None else nombre):
+            code, horodatage, reference = self._memoire.popleft()
+            donnees = str(reference).encode("utf-8")
+            segment += _ENTETE.pack(code, horodatage, len(donnees))
+            segment += donnees
+            self._nb_sur_disque += 1
+        fichier = self._ouvrir()
+        fichier.seek(0, os.SEEK_END)
+        fichier.write(segment)
+
+    def _lire_disque(self, fin: int) -> Iterator[Evenement]:
+        position = 0
+        reste = b""
+        while position < fin:
+            self._fichier.seek(position)
+            bloc = self._fichier.read(min(_TAILLE_LECTURE, fin - position))
+            position += len(bloc)
+            tampon = reste + bloc
+            curseur = 0
+            while curseur + _ENTETE.size <= len(tampon):
+                code, horodatage, longueur = _ENTETE.unpack_from(tampon, curseur)
+                debut = curseur + _ENTETE.size
+                if debut + longueur > len(tampon):
+                    break
+                yield Evenement(
+                    code, horodatage, tampon[debut:debut + longueur].decode("utf-8")
+                )
+                curseur = debut + longueur
+            reste = tampon[curseur:]
+
+    def evenements(self) -> Iterator[Evenement]:
+        # Instantané cohérent : la taille du fichier et une copie du tampon
+        # (bornée par la capacité) sont figées au début du parcours.
+        memoire: List[Evenement] = list(self._memoire)
+        if self._nb_sur_disque:
+            fichier = self._ouvrir()
+            fichier.flush()
+            fin = fichier.seek(0, os.SEEK_END)
+            yield from self._lire_disque(fin)
+        yield from memoire
+
+    def fermer(self) -> None:
+        # Un journal nommé est complet sur disque une fois fermé
+        if self.chemin is not None and self._memoire:
+            self._deverser(len(self._memoire))
+        if self._fichier is not None:
+            self._fermeture()
+            self._fichier = None
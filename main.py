@@ -1,82 +1,56 @@
-from abc import ABC, abstractmethod
+import os
+import sys
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Set, TextIO
+
+from cache import CACHE_RESULTATS, CacheLRU
+from calendrier import Calendrier
+from chemin_critique import CheminCritiqueIncremental
+from index_projet import IndexProjet
+from metriques import instrumenter
+from modeles import (
+    Changement,
+    Equipe,
+    Impact,
+    Jalon,
+    Membre,
+    Risque,
+    Role,
+    Statut,
+    Tache,
+)
+from nivellement import PlanningNivele, niveler
+from notifications import (
+    DistributeurAsynchrone,
+    EmailNotificationStrategy,
+    NotificationContext,
+    NotificationStrategy,
+    PushNotificationStrategy,
+    SMSNotificationStrategy,
+)
+from versions import (
+    Branche,
+    Differences,
+    EtatChangement,
+    EtatJalon,
+    EtatRisque,
+    EtatTache,
+    Version,
+    version_vide,
+)
+
+# Identifiant unique de chaque projet dans le cache partagé
+_jetons = count()
+
+# Au-delà, une section du rapport est produite à la volée plutôt que gardée
+_LIGNES_MAX_CACHE = 10_000
+
+# Aspects du projet suivis séparément, pour n'invalider que ce qui dépend
+# de la partie modifiée
+_ASPECTS = ("planning", "taches", "equipe", "budget", "risques", "jalons", "changements")
 
-class NotificationStrategy(ABC):
-    @abstractmethod
-    def envoyer(self, message: str, destinataire: str) -> None:
-        pass
-
-class EmailNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par email: {message}")
-
-class SMSNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par SMS: {message}")
-
-class PushNotificationStrategy(NotificationStrategy):
-    def envoyer(self, message: str, destinataire: str) -> None:
-        print(f"Notification envoyée à {destinataire} par push notification: {message}")
-
-class NotificationContext:
-    def __init__(self, strategy: NotificationStrategy):
-        self._strategy = strategy
-
-    def set_strategy(self, strategy: NotificationStrategy):
-        self._strategy = strategy
-
-    def notifier(self, message: str, destinataires: List[str]) -> None:
-        for destinataire in destinataires:
-            self._strategy.envoyer(message, destinataire)
-
-class Membre:
-    def __init__(self, nom: str, role: str):
-        self.nom = nom
-        self.role = role
-
-class Tache:
-    def __init__(self, nom: str, description: str, date_debut: datetime, date_fin: datetime, responsable: Membre, statut: str):
-        self.nom = nom
-        self.description = description
-        self.date_debut = date_debut
-        self.date_fin = date_fin
-        self.responsable = responsable
-        self.statut = statut
-        self.dependances: List[Tache] = []
-
-    def ajouter_dependance(self, tache: 'Tache'):
-        self.dependances.append(tache)
-
-    def mettre_a_jour_statut(self, statut: str):
-        self.statut = statut
-
-class Equipe:
-    def __init__(self):
-        self.membres: List[Membre] = []
-
-    def ajouter_membre(self, membre: Membre):
-        self.membres.append(membre)
-
-    def obtenir_membres(self) -> List[Membre]:
-        return self.membres
-
-class Risque:
-    def __init__(self, description: str, probabilite: float, impact: str):
-        self.description = description
-        self.probabilite = probabilite
-        self.impact = impact
-
-class Jalon:
-    def __init__(self, nom: str, date: datetime):
-        self.nom = nom
-        self.date = date
-
-class Changement:
-    def __init__(self, description: str, version: int, date: datetime):
-        self.description = description
-        self.version = version
-        self.date = date
 
 class Projet:
     def __init__(self, nom: str, description: str, date_debut: datetime, date_fin: datetime):
@@ -92,154 +66,542 @@ class Projet:
         self.version = 1
         self.changements: List[Changement] = []
         self.chemin_critique: List[Tache] = []
+        self.planning = CheminCritiqueIncremental()
+        self.index = IndexProjet()
         self.notification_context: NotificationContext = None
+        # Sans calendrier, les durées sont en jours calendaires
+        self.calendrier: Optional[Calendrier] = None
+        # Version structurelle : incrémentée par toute mutation, avec la
+        # révision de chaque aspect touché
+        self.revision = 0
+        self._revisions = dict.fromkeys(_ASPECTS, 0)
+        self._jeton = next(_jetons)
+        self.cache: CacheLRU = CACHE_RESULTATS
+        # Versions figées par enregistrer_changement. Entre deux, on retient
+        # seulement les tâches touchées ; les collections ne font que
+        # grandir, leur partie nouvelle est ce qui dépasse la version figée.
+        self.versions: Dict[int, Version] = {}
+        self._figee = version_vide(self.version, nom, description, date_debut, date_fin)
+        # Les tâches modifiées sont retenues par clé stable (voir _cle)
+        self._taches_modifiees: Dict[str, Tache] = {}
+        self._cles: Dict[Tache, str] = {}
+        self._cles_prises: Set[str] = set()
+        # Tâches observées : celles du projet, et les dépendances prises
+        # hors du projet, qui comptent aussi dans le planning et sont
+        # figées avec les versions
+        self._suivies: Set[Tache] = set()
+
+    def _modifier(self, *aspects: str):
+        self.revision += 1
+        for aspect in aspects:
+            self._revisions[aspect] = self.revision
+
+    def _sur_modification_tache(self, tache: Tache, attribut: str):
+        if attribut == "dependance_proposee":
+            return
+        self._taches_modifiees[self._cle(tache)] = tache
+        if attribut in ("statut", "responsable"):
+            self._modifier("taches")
+        else:
+            if attribut == "dependances":
+                self._suivre_dependances(tache)
+            self._modifier("planning", "taches")
+
+    def _sur_modification_externe(self, tache: Tache, attribut: str):
+        if attribut == "dependance_proposee":
+            return
+        self._taches_modifiees[self._cle(tache)] = tache
+        if attribut in ("statut", "responsable"):
+            return
+        if attribut == "dependances":
+            self._suivre_dependances(tache)
+        self._modifier("planning")
+
+    def _cle(self, tache: Tache) -> str:
+        # Clé de la tâche dans les versions, attribuée une fois pour toutes :
+        # son nom, suffixé si une autre tâche le porte déjà
+        cle = self._cles.get(tache)
+        if cle is None:
+            cle, n = tache.nom, 1
+            while cle in self._cles_prises:
+                n += 1
+                cle = f"{tache.nom}#{n}"
+            self._cles[tache] = cle
+            self._cles_prises.add(cle)
+        return cle
+
+    def _suivre(self, tache: Tache):
+        self._suivies.add(tache)
+        tache.ajouter_observateur(self._sur_modification_tache)
+        self._taches_modifiees[self._cle(tache)] = tache
+
+    def _suivre_dependances(self, tache: Tache):
+        pile = [tache]
+        while pile:
+            for dep in pile.pop().dependances:
+                if dep not in self._suivies:
+                    self._suivies.add(dep)
+                    dep.ajouter_observateur(self._sur_modification_externe)
+                    self._taches_modifiees[self._cle(dep)] = dep
+                    pile.append(dep)
+
+    def _memoiser(self, section: str, version, calculer):
+        return self.cache.obtenir((self._jeton, section), version, calculer)
 
     def set_notification_strategy(self, strategy: NotificationStrategy):
-        self.notification_context = NotificationContext(strategy)
+        if self.notification_context is None:
+            self.notification_context = NotificationContext(strategy)
+        else:
+            self.notification_context.set_strategy(strategy)
+
+    def activer_notifications_asynchrones(self, distributeur: Optional[DistributeurAsynchrone] = None) -> DistributeurAsynchrone:
+        # Les mutations mettent les notifications en file et rendent la main
+        if distributeur is None:
+            distributeur = DistributeurAsynchrone()
+        if self.notification_context is None:
+            self.notification_context = NotificationContext(EmailNotificationStrategy())
+        self.notification_context.distributeur = distributeur
+        return distributeur
+
+    @contextmanager
+    def batch(self) -> Iterator['Projet']:
+        # Notifications regroupées en un récapitulatif par destinataire
+        if self.notification_context is None:
+            yield self
+            return
+        with self.notification_context.regrouper():
+            yield self
 
     def ajouter_tache(self, tache: Tache):
         self.taches.append(tache)
+        self.planning.ajouter(tache)
+        self.index.ajouter_tache(tache)
+        self._suivre(tache)
+        self._suivre_dependances(tache)
+        self._modifier("planning", "taches")
         self.notifier(f"Nouvelle tâche ajoutée: {tache.nom}", self.equipe.obtenir_membres())
 
     def ajouter_membre_equipe(self, membre: Membre):
         self.equipe.ajouter_membre(membre)
+        self._modifier("equipe")
         self.notifier(f"{membre.nom} a été ajouté à l'équipe", [membre])
 
     def definir_budget(self, budget: float):
         self.budget = budget
+        self._modifier("budget")
         self.notifier(f"Le budget du projet a été défini à {budget} Unité Monétaire", self.equipe.obtenir_membres())
 
     def ajouter_risque(self, risque: Risque):
         self.risques.append(risque)
+        self._modifier("risques")
         self.notifier(f"Nouveau risque ajouté: {risque.description}", self.equipe.obtenir_membres())
 
     def ajouter_jalon(self, jalon: Jalon):
         self.jalons.append(jalon)
+        self.index.ajouter_jalon(jalon)
+        self._modifier("jalons")
         self.notifier(f"Nouveau jalon ajouté: {jalon.nom}", self.equipe.obtenir_membres())
 
     def enregistrer_changement(self, description: str):
         changement = Changement(description, self.version, datetime.now())
         self.changements.append(changement)
+        # La version qui se termine est figée avec le changement qui la clôt
+        self.versions[self.version] = self._figer()
         self.version += 1
+        self._modifier("changements")
         self.notifier(f"Changement enregistré: {description} (version {self.version})", self.equipe.obtenir_membres())
 
-    def calculer_chemin_critique(self):
-        # Initialiser les temps au plus tôt et au plus tard
-        for tache in self.taches:
-            tache.early_start = 0
-            tache.early_finish = 0
-            tache.late_start = float('inf')
-            tache.late_finish = float('inf')
-
-        # Calcul des temps au plus tôt
-        for tache in self.taches:
-            if not tache.dependances:
-                tache.early_finish = (tache.date_fin - tache.date_debut).days
-            else:
-                tache.early_start = max([dep.early_finish for dep in tache.dependances])
-                tache.early_finish = tache.early_start + (tache.date_fin - tache.date_debut).days
-
-        # Calcul des temps au plus tard (on commence par la fin du projet)
-        project_duration = max(tache.early_finish for tache in self.taches)
-        for tache in reversed(self.taches):
-            if tache.late_finish == float('inf'):
-                tache.late_finish = project_duration
-            tache.late_start = tache.late_finish - (tache.date_fin - tache.date_debut).days
-            for dep in tache.dependances:
-                dep.late_finish = min(dep.late_finish, tache.late_start)
-
-        # Identifier le chemin critique
-        self.chemin_critique = [tache for tache in self.taches if tache.early_start == tache.late_start]
+    def _figer(self) -> Version:
+        # Reporte sur la dernière version figée les seuls éléments modifiés
+        # depuis : le reste de la structure est partagé
+        figee = self._figee
+        taches = figee.taches.mettre_a_jour(
+            (cle, EtatTache.depuis(tache, self._cle)) for cle, tache in self._taches_modifiees.items()
+        )
+        self._taches_modifiees = {}
+        membres = self.equipe.obtenir_membres()
+        self._figee = Version(
+            self.version, self.nom, self.description, self.date_debut, self.date_fin, self.budget,
+            figee.equipe.etendre(membres[len(figee.equipe):]),
+            taches,
+            figee.risques.etendre(map(EtatRisque.depuis, self.risques[len(figee.risques):])),
+            figee.jalons.etendre(map(EtatJalon.depuis, self.jalons[len(figee.jalons):])),
+            figee.changements.etendre(map(EtatChangement.depuis, self.changements[len(figee.changements):])),
+        )
+        return self._figee
+
+    def instantane(self, version: Optional[int] = None) -> Version:
+        # L'état courant, ou celui d'une version close par enregistrer_changement
+        if version is None or version == self.version:
+            return self._figer()
+        if version not in self.versions:
+            raise ValueError(f"Version inconnue: {version}")
+        return self.versions[version]
+
+    def brancher(self, version: Optional[int] = None) -> Branche:
+        # Scénario « et si » à partir d'une version, sans copier le projet ;
+        # une version close se poursuit dans la branche sous le numéro suivant
+        origine = self.instantane(version)
+        return Branche(origine, None if origine.numero == self.version else origine.numero + 1, self._cles)
+
+    def comparer_versions(self, avant: int, apres: Optional[int] = None) -> Differences:
+        return self.instantane(avant).differences(self.instantane(apres))
+
+    def importer_taches(self, source, format: Optional[str] = None) -> int:
+        # Chargement en masse depuis un CSV ou un JSON Lines : les tâches
+        # sont insérées d'un bloc, avec une seule notification récapitulative
+        from importation import lire_taches, pause_gc
+        membres = {membre.nom: membre for membre in self.equipe.obtenir_membres()}
+        connus = len(membres)
+        with pause_gc():
+            taches = lire_taches(source, format, membres, self.index.tache)
+            # Les responsables inconnus, créés à la lecture, rejoignent l'équipe
+            nouveaux = list(membres.values())[connus:]
+            for membre in nouveaux:
+                self.equipe.ajouter_membre(membre)
+            if nouveaux:
+                self._modifier("equipe")
+            self._inserer_taches(taches)
+        self.notifier(f"{len(taches)} tâches importées", self.equipe.obtenir_membres())
+        return len(taches)
+
+    def _inserer_taches(self, taches: List[Tache]):
+        # Ajout d'un bloc, sans notification : import ou relecture d'un instantané
+        self.taches.extend(taches)
+        for tache in taches:
+            self.planning.ajouter(tache)
+            self.index.ajouter_tache(tache)
+            self._suivre(tache)
+        for tache in taches:
+            self._suivre_dependances(tache)
+        self._modifier("planning", "taches")
+
+    def definir_calendrier(self, calendrier: Optional[Calendrier]):
+        self.calendrier = calendrier
+        self.planning.definir_calendrier(calendrier)
+        self._modifier("planning", "taches")
+
+    def trouver_tache(self, nom: str) -> Optional[Tache]:
+        return self.index.tache(nom)
+
+    def taches_de(self, membre: Membre) -> List[Tache]:
+        return self.index.taches_de(membre)
+
+    def taches_par_statut(self, statut: str) -> List[Tache]:
+        return self.index.taches_par_statut(statut)
+
+    def taches_actives(self, debut: datetime, fin: datetime) -> List[Tache]:
+        return self.index.taches_actives(debut, fin)
+
+    def jalons_entre(self, debut: datetime, fin: datetime) -> List[Jalon]:
+        return self.index.jalons_entre(debut, fin)
+
+    def niveler_ressources(self, priorite: str = "debut_tard") -> PlanningNivele:
+        # Planning faisable : chaque responsable ne mène qu'une tâche à la fois
+        return niveler(self.taches, priorite, calendrier=self.calendrier)
+
+    def compiler_graphe(self):
+        # Représentation tabulaire (NumPy) pour les très grands plannings
+        from graphe_compact import GrapheCompact
+        return GrapheCompact.depuis_taches(self.planning.ordre(), self.calendrier, ordonnees=True)
+
+    def simulation(self, graine: Optional[int] = None):
+        # Monte-Carlo sur les durées et les risques (NumPy, chargé à la demande)
+        from simulation import Simulation
+        return Simulation(self.taches, graine, self.calendrier)
+
+    def calculer_chemin_critique(self, vectorise: bool = False):
+        # Recalculé seulement si le planning a changé depuis le dernier appel ;
+        # les temps restent reportés sur les tâches entre deux calculs.
+        # Chaque moteur a son entrée : l'ordre des tâches du texte diffère.
+        self.chemin_critique, texte = self._memoiser(
+            ("chemin_critique", vectorise),
+            self._revisions["planning"],
+            lambda: self._calculer_chemin_critique(vectorise),
+        )
 
         # Afficher le chemin critique
-        print("Chemin critique :")
-        for tache in self.chemin_critique:
-            print(f"{tache.nom} (début : {tache.early_start}, fin : {tache.early_finish})")
+        sys.stdout.write(texte)
+
+    def _calculer_chemin_critique(self, vectorise: bool):
+        if vectorise:
+            graphe = self.compiler_graphe()
+            resultat = graphe.calculer_cpm()
+            ordre = graphe.taches
+            temps = zip(
+                resultat.debut_tot.tolist(),
+                resultat.fin_tot.tolist(),
+                resultat.debut_tard.tolist(),
+                resultat.fin_tard.tolist(),
+            )
+        else:
+            # Planning incrémental : seules les zones modifiées sont recalculées
+            ordre = self.taches
+            temps = (
+                (
+                    self.planning.debut_tot(tache),
+                    self.planning.fin_tot(tache),
+                    self.planning.debut_tard(tache),
+                    self.planning.fin_tard(tache),
+                )
+                for tache in ordre
+            )
+
+        # Reporter les temps au plus tôt et au plus tard sur les tâches
+        for tache, (debut_tot, fin_tot, debut_tard, fin_tard) in zip(ordre, temps):
+            tache.early_start = debut_tot
+            tache.early_finish = fin_tot
+            tache.late_start = debut_tard
+            tache.late_finish = fin_tard
 
-    def generer_rapport_performance(self):
-        rapport = f"Rapport de performance du projet '{self.nom}':\n"
-        rapport += f"Description: {self.description}\n"
-        rapport += f"Dates: {self.date_debut} - {self.date_fin}\n"
-        rapport += f"Budget: {self.budget} EUR\n"
-        rapport += f"Version: {self.version}\n"
-        rapport += f"Équipe: {[membre.nom for membre in self.equipe.obtenir_membres()]}\n"
+        # Identifier le chemin critique
+        chemin_critique = [tache for tache in ordre if tache.early_start == tache.late_start]
+        texte = "Chemin critique :\n" + "".join(
+            f"{tache.nom} (début : {tache.early_start}, fin : {tache.early_finish})\n"
+            for tache in chemin_critique
+        )
+        return chemin_critique, texte
+
+    def _section(self, nom: str, elements: list, formater) -> Iterator[str]:
+        # Les lignes d'une section sont gardées jusqu'à la prochaine mutation
+        # de l'aspect correspondant ; une très grande section est produite à
+        # la volée pour ne pas la matérialiser en mémoire. Seules les tâches
+        # signalent leurs modifications : les autres sections, dont les
+        # éléments peuvent changer sans que le projet le sache, ne passent
+        # pas par ici.
+        if len(elements) > _LIGNES_MAX_CACHE:
+            return map(formater, elements)
+        return self._memoiser(
+            nom, self._revisions[nom], lambda: tuple(map(formater, elements))
+        )
+
+    def _entete(self) -> tuple:
+        lignes = (
+            f"Rapport de performance du projet '{self.nom}':\n",
+            f"Description: {self.description}\n",
+            f"Dates: {self.date_debut} - {self.date_fin}\n",
+            f"Budget: {self.budget} EUR\n",
+            f"Version: {self.version}\n",
+            f"Équipe: {[membre.nom for membre in self.equipe.obtenir_membres()]}\n",
+        )
+        if self.calendrier is not None:
+            lignes += (f"Calendrier: {self.calendrier.description()}\n",)
+        return lignes
+
+    def flux_rapport_performance(self) -> Iterator[str]:
+        # Le rapport est produit ligne par ligne, sans jamais être assemblé
+        yield from self._memoiser(
+            "entete",
+            (self.nom, self.description, self.date_debut, self.date_fin, self.budget,
+             self.version, tuple(membre.nom for membre in self.equipe.obtenir_membres()),
+             self.calendrier),
+            self._entete,
+        )
 
         # Détails des tâches
-        rapport += "\nTâches:\n"
-        for tache in self.taches:
-            rapport += f"- {tache.nom}: {tache.statut} (Début: {tache.date_debut}, Fin: {tache.date_fin}, Responsable: {tache.responsable.nom})\n"
+        yield "\nTâches:\n"
+        calendrier = self.calendrier
+        yield from self._section("taches", self.taches, lambda tache: _ligne_tache(tache, calendrier))
 
         # Détails des risques
-        rapport += "\nRisques:\n"
-        for risque in self.risques:
-            rapport += f"- {risque.description}: Probabilité {risque.probabilite}, Impact {risque.impact}\n"
+        yield "\nRisques:\n"
+        yield from map(_ligne_risque, self.risques)
 
         # Détails des jalons
-        rapport += "\nJalons:\n"
-        for jalon in self.jalons:
-            rapport += f"- {jalon.nom}: {jalon.date}\n"
+        yield "\nJalons:\n"
+        yield from map(_ligne_jalon, self.jalons)
 
         # Détails des changements
-        rapport += "\nChangements:\n"
-        for changement in self.changements:
-            rapport += f"- {changement.description}: Version {changement.version}, Date {changement.date}\n"
+        yield "\nChangements:\n"
+        yield from map(_ligne_changement, self.changements)
 
-        print(rapport)
+    def ecrire_rapport_performance(self, fichier: TextIO):
+        fichier.writelines(self.flux_rapport_performance())
+
+    def generer_rapport_performance(self):
+        self.ecrire_rapport_performance(sys.stdout)
+        sys.stdout.write("\n")
 
     def notifier(self, message: str, destinataires: List[Membre]):
         if self.notification_context:
             self.notification_context.notifier(message, [membre.nom for membre in destinataires])
 
-# Créer des membres de l'équipe
-membre1 = Membre("Ousmane", "Développeur")
-membre2 = Membre("Oumar", "Chef de projet")
-membre3 = Membre("Mouhamed", "Testeur")
 
-# Créer une équipe et ajouter des membres
-equipe = Equipe()
-equipe.ajouter_membre(membre1)
-equipe.ajouter_membre(membre2)
-equipe.ajouter_membre(membre3)
+def _ligne_tache(tache: Tache, calendrier: Optional[Calendrier] = None) -> str:
+    duree = "" if calendrier is None else f", Durée: {calendrier.duree(tache)} jours ouvrés"
+    return f"- {tache.nom}: {tache.statut} (Début: {tache.date_debut}, Fin: {tache.date_fin}, Responsable: {getattr(tache.responsable, 'nom', None)}{duree})\n"
+
+
+def _ligne_risque(risque: Risque) -> str:
+    return f"- {risque.description}: Probabilité {risque.probabilite}, Impact {risque.impact}\n"
+
+
+def _ligne_jalon(jalon: Jalon) -> str:
+    return f"- {jalon.nom}: {jalon.date}\n"
+
+
+def _ligne_changement(changement: Changement) -> str:
+    return f"- {changement.description}: Version {changement.version}, Date {changement.date}\n"
+
+
+# Points de mesure, enveloppés seulement quand metriques.activer() est appelé
+for _methode in (
+    "ajouter_membre_equipe",
+    "ajouter_tache",
+    "definir_budget",
+    "ajouter_risque",
+    "ajouter_jalon",
+    "enregistrer_changement",
+):
+    instrumenter(Projet, _methode, f"projet.{_methode}", mutation=True)
+instrumenter(Projet, "calculer_chemin_critique", "projet.calculer_chemin_critique")
+instrumenter(Projet, "niveler_ressources", "projet.niveler_ressources")
+instrumenter(Projet, "flux_rapport_performance", "projet.rapport", taille=len)
+
+
+def demo():
+    # Créer des membres de l'équipe
+    membre1 = Membre("Ousmane", "Développeur")
+    membre2 = Membre("Oumar", "Chef de projet")
+    membre3 = Membre("Mouhamed", "Testeur")
+
+    # Créer une équipe et ajouter des membres
+    equipe = Equipe()
+    equipe.ajouter_membre(membre1)
+    equipe.ajouter_membre(membre2)
+    equipe.ajouter_membre(membre3)
+
+    # Créer un projet
+    projet = Projet("Nouveau Projet", "Description du projet", datetime(2024, 1, 1), datetime(2024, 12, 31))
+
+    # Définir une stratégie de notification par email
+    projet.set_notification_strategy(EmailNotificationStrategy())
+
+    # Ajouter des tâches au projet
+    tache1 = Tache("Tâche 1", "Description de la tâche 1", datetime(2024, 2, 1), datetime(2024, 3, 1), membre1, "Non commencée")
+    projet.ajouter_tache(tache1)
+
+    # Ajouter un risque
+    risque = Risque("Risque 1", 0.5, "Impact élevé")
+    projet.ajouter_risque(risque)
+
+    # Enregistrer un changement
+    projet.enregistrer_changement("Changement de version")
+
+    # Calculer le chemin critique
+    projet.calculer_chemin_critique()
+
+    # Générer un rapport de performance
+    projet.generer_rapport_performance()
+
+    # Afficher la liste des membres de l'équipe
+    print("\nListe des membres de l'équipe :")
+    for membre in projet.equipe.obtenir_membres():
+        print(f"- {membre.nom}, {membre.role}")
 
+    # Enregistrer un changement
+    projet.enregistrer_changement("Changement de version")
 
+    # Calculer le chemin critique
+    projet.calculer_chemin_critique()
 
+    # Générer un rapport de performance
+    projet.generer_rapport_performance()
 
-# Créer un projet
-projet = Projet("Nouveau Projet", "Description du projet", datetime(2024, 1, 1), datetime(2024, 12, 31))
 
-# Définir une stratégie de notification par email
-projet.set_notification_strategy(EmailNotificationStrategy())
+def charger_projet(chemin: str):
+    # Un dossier de dépôt (instantané + journal) ou un instantané seul
+    from persistance import Depot, Instantane
+    if os.path.isdir(chemin):
+        return Depot(chemin).charger()
+    return Instantane(chemin).projet()
 
-# Ajouter des tâches au projet
-tache1 = Tache("Tâche 1", "Description de la tâche 1", datetime(2024, 2, 1), datetime(2024, 3, 1), membre1, "Non commencée")
-projet.ajouter_tache(tache1)
 
-# Ajouter un risque
-risque = Risque("Risque 1", 0.5, "Impact élevé")
-projet.ajouter_risque(risque)
+def _commande_chemin_critique(arguments) -> int:
+    projet = charger_projet(arguments.fichier)
+    projet.calculer_chemin_critique(vectorise=arguments.vectorise)
+    return 0
 
-# Enregistrer un changement
-projet.enregistrer_changement("Changement de version")
 
-# Calculer le chemin critique
-projet.calculer_chemin_critique()
+def _commande_chemin_critique_disque(arguments) -> int:
+    # Fichiers binaires de taille fixe, sans charger de projet en mémoire
+    from graphe_disque import GrapheDisque
+    graphe = GrapheDisque(arguments.taches, arguments.aretes, arguments.memoire * 1024 * 1024)
+    resultat = graphe.calculer_cpm(arguments.sortie)
+    chemin = " -> ".join(str(i) for i in resultat.chemin_critique)
+    print(f"Chemin critique: {chemin} avec une durée de {resultat.duree} jours")
+    return 0
 
-# Générer un rapport de performance
-projet.generer_rapport_performance()
 
-# Afficher la liste des membres de l'équipe
-print("\nListe des membres de l'équipe :")
-for membre in projet.equipe.obtenir_membres():
-    print(f"- {membre.nom}, {membre.role}")
+def _commande_rapport(arguments) -> int:
+    projet = charger_projet(arguments.fichier)
+    if arguments.sortie is None:
+        projet.ecrire_rapport_performance(sys.stdout)
+    else:
+        with open(arguments.sortie, "w", encoding="utf-8") as fichier:
+            projet.ecrire_rapport_performance(fichier)
+    return 0
+
+
+def _commande_notifier(arguments) -> int:
+    strategies = {
+        "email": EmailNotificationStrategy,
+        "sms": SMSNotificationStrategy,
+        "push": PushNotificationStrategy,
+    }
+    projet = charger_projet(arguments.fichier)
+    contexte = NotificationContext(strategies[arguments.canal]())
+    contexte.notifier(arguments.message, list(projet.equipe))
+    contexte.close()
+    return 0
 
 
-# Enregistrer un changement
-projet.enregistrer_changement("Changement de version")
+def _commande_demo(arguments) -> int:
+    demo()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # argparse n'est chargé que pour la ligne de commande
+    import argparse
 
-# Calculer le chemin critique
-projet.calculer_chemin_critique()
+    parser = argparse.ArgumentParser(prog="python -m main", description="Gestion de projet")
+    commandes = parser.add_subparsers(dest="commande")
 
-# Générer un rapport de performance
-projet.generer_rapport_performance()
+    commande = commandes.add_parser("chemin-critique", help="calculer le chemin critique")
+    commande.add_argument("fichier", help="instantané ou dossier de dépôt")
+    commande.add_argument("--vectorise", action="store_true", help="utiliser le moteur NumPy")
+    commande.set_defaults(executer=_commande_chemin_critique)
 
+    commande = commandes.add_parser(
+        "chemin-critique-disque", help="chemin critique hors mémoire sur des fichiers binaires"
+    )
+    commande.add_argument("taches", help="durées des tâches (int32)")
+    commande.add_argument("aretes", help="arêtes source, cible (uint32, uint32)")
+    commande.add_argument("-o", "--sortie", required=True, help="fichier des temps calculés")
+    commande.add_argument("--memoire", type=int, default=64, help="mémoire de travail en Mo")
+    commande.set_defaults(executer=_commande_chemin_critique_disque)
+
+    commande = commandes.add_parser("rapport", help="écrire le rapport de performance")
+    commande.add_argument("fichier", help="instantané ou dossier de dépôt")
+    commande.add_argument("-o", "--sortie", help="fichier de sortie (défaut : stdout)")
+    commande.set_defaults(executer=_commande_rapport)
 
+    commande = commandes.add_parser("notifier", help="notifier l'équipe du projet")
+    commande.add_argument("fichier", help="instantané ou dossier de dépôt")
+    commande.add_argument("message")
+    commande.add_argument("--canal", choices=("email", "sms", "push"), default="email")
+    commande.set_defaults(executer=_commande_notifier)
+
+    commande = commandes.add_parser("demo", help="dérouler le projet de démonstration")
+    commande.set_defaults(executer=_commande_demo)
+
+    arguments = parser.parse_args(argv)
+    if arguments.commande is None:
+        # Comportement historique de `python main.py`
+        return _commande_demo(arguments)
+    return arguments.executer(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
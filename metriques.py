@@ -0,0 +1,244 @@
+import functools
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Registre:
+    # Compteurs et mesures (nombre, somme, maximum) tenus en mémoire ; le
+    # verrou ne coûte que lorsque l'instrumentation est active.
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.compteurs: Dict[str, float] = {}
+        self.mesures: Dict[str, List[float]] = {}
+
+    def incrementer(self, nom: str, n: float = 1) -> None:
+        with self._verrou:
+            self.compteurs[nom] = self.compteurs.get(nom, 0) + n
+
+    def observer(self, nom: str, valeur: float) -> None:
+        with self._verrou:
+            mesure = self.mesures.get(nom)
+            if mesure is None:
+                self.mesures[nom] = [1, valeur, valeur]
+            else:
+                mesure[0] += 1
+                mesure[1] += valeur
+                if valeur > mesure[2]:
+                    mesure[2] = valeur
+
+    def reinitialiser(self) -> None:
+        with self._verrou:
+            self.compteurs.clear()
+            self.mesures.clear()
+
+    def instantane(self) -> Dict[str, Dict]:
+        with self._verrou:
+            return {
+                "compteurs": dict(self.compteurs),
+                "mesures": {
+                    nom: {"nombre": nombre, "somme": somme, "max": maximum}
+                    for nom, (nombre, somme, maximum) in self.mesures.items()
+                },
+            }
+
+    def texte_prometheus(self) -> str:
+        # Format d'exposition texte de Prometheus : compteurs et résumés
+        instantane = self.instantane()
+        lignes = []
+        for nom, valeur in sorted(instantane["compteurs"].items()):
+            nom = _nom_prometheus(nom)
+            lignes.append(f"# TYPE {nom}_total counter")
+            lignes.append(f"{nom}_total {valeur}")
+        for nom, mesure in sorted(instantane["mesures"].items()):
+            nom = _nom_prometheus(nom)
+            lignes.append(f"# TYPE {nom} summary")
+            lignes.append(f"{nom}_count {mesure['nombre']}")
+            lignes.append(f"{nom}_sum {mesure['somme']}")
+            lignes.append(f"# TYPE {nom}_max gauge")
+            lignes.append(f"{nom}_max {mesure['max']}")
+        return "\n".join(lignes) + "\n"
+
+    def exporter_json(self, chemin: str) -> None:
+        import json
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump(self.instantane(), fichier, indent=2, ensure_ascii=False)
+
+    def exporter_prometheus(self, chemin: str) -> None:
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            fichier.write(self.texte_prometheus())
+
+
+def _nom_prometheus(nom: str) -> str:
+    import re
+    return re.sub(r"[^a-zA-Z0-9_]", "_", nom)
+
+
+REGISTRE = Registre()
+
+# Points d'instrumentation déclarés par les modules : rien n'est enveloppé
+# tant que personne n'appelle activer(), les méthodes d'origine restent en
+# place et le coût est nul.
+_POINTS: List[Tuple[type, str, str, Dict]] = []
+_originaux: Dict[Tuple[type, str], Callable] = {}
+_registre_actif: Optional[Registre] = None
+# Notifications déclenchées par le thread courant (envois et mises en file)
+_local = threading.local()
+
+
+def instrumenter(
+    classe: type,
+    methode: str,
+    nom: str,
+    taille: Optional[Callable[[object], float]] = None,
+    mutation: bool = False,
+    envoi: bool = False,
+    sous_classes: bool = False,
+) -> None:
+    # taille : mesure du résultat (ou de chaque élément d'un générateur)
+    # mutation : compte aussi les notifications déclenchées par l'appel
+    # envoi : l'appel est une notification envoyée ou mise en file
+    # sous_classes : enveloppe les redéfinitions dans les sous-classes
+    options = {"taille": taille, "mutation": mutation, "envoi": envoi, "sous_classes": sous_classes}
+    _POINTS.append((classe, methode, nom, options))
+    if _registre_actif is not None:
+        _installer(classe, methode, nom, options, _registre_actif)
+
+
+def _sous_classes(classe: type):
+    for sous_classe in classe.__subclasses__():
+        yield sous_classe
+        yield from _sous_classes(sous_classe)
+
+
+def _installer(classe: type, methode: str, nom: str, options: Dict, registre: Registre) -> None:
+    cibles = [(classe, nom)]
+    if options["sous_classes"]:
+        cibles = [
+            (sous_classe, f"{nom}.{sous_classe.__name__}")
+            for sous_classe in _sous_classes(classe)
+            if methode in vars(sous_classe)
+        ]
+    for cible, nom_cible in cibles:
+        if (cible, methode) in _originaux or methode not in vars(cible):
+            continue
+        original = vars(cible)[methode]
+        _originaux[(cible, methode)] = original
+        setattr(cible, methode, _envelopper(original, nom_cible, options, registre))
+
+
+def _envelopper(fonction: Callable, nom: str, options: Dict, registre: Registre) -> Callable:
+    taille = options["taille"]
+    mutation = options["mutation"]
+    envoi = options["envoi"]
+    nom_secondes = nom + ".secondes"
+
+    @functools.wraps(fonction)
+    def mesure(*args, **kwargs):
+        if envoi:
+            _local.envois = getattr(_local, "envois", 0) + 1
+        avant = getattr(_local, "envois", 0)
+        debut = time.perf_counter()
+        try:
+            resultat = fonction(*args, **kwargs)
+        finally:
+            registre.observer(nom_secondes, time.perf_counter() - debut)
+        if mutation:
+            registre.observer(nom + ".envois", getattr(_local, "envois", 0) - avant)
+        if isinstance(resultat, types.GeneratorType):
+            return _mesurer_flux(resultat, nom, taille, registre)
+        if taille is not None:
+            registre.observer(nom + ".taille", taille(resultat))
+        return resultat
+
+    return mesure
+
+
+def _mesurer_flux(flux, nom: str, taille, registre: Registre):
+    # Un générateur est mesuré jusqu'à son épuisement
+    debut = time.perf_counter()
+    total = 0
+    for element in flux:
+        if taille is not None:
+            total += taille(element)
+        yield element
+    registre.observer(nom + ".flux_secondes", time.perf_counter() - debut)
+    if taille is not None:
+        registre.observer(nom + ".taille", total)
+
+
+def activer(registre: Registre = REGISTRE) -> Registre:
+    global _registre_actif
+    if _registre_actif is not None:
+        return _registre_actif
+    _registre_actif = registre
+    for classe, methode, nom, options in _POINTS:
+        _installer(classe, methode, nom, options, registre)
+    return registre
+
+
+def desactiver() -> None:
+    # Remet les méthodes d'origine : plus aucun surcoût
+    global _registre_actif
+    for (classe, methode), original in _originaux.items():
+        setattr(classe, methode, original)
+    _originaux.clear()
+    _registre_actif = None
+
+
+def est_actif() -> bool:
+    return _registre_actif is not None
+
+
+class ProfileurEchantillonnage:
+    # Profileur statistique optionnel : un thread relève toutes les
+    # `intervalle` secondes la pile des autres threads et compte les piles
+    # repliées (format « a;b;c n » des flamegraphs).
+    def __init__(self, intervalle: float = 0.005, profondeur: int = 64):
+        self.intervalle = intervalle
+        self.profondeur = profondeur
+        self.piles: Counter = Counter()
+        self._arret = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def demarrer(self) -> "ProfileurEchantillonnage":
+        self._arret.clear()
+        self._thread = threading.Thread(target=self._echantillonner, name="profileur", daemon=True)
+        self._thread.start()
+        return self
+
+    def _echantillonner(self) -> None:
+        moi = threading.get_ident()
+        while not self._arret.wait(self.intervalle):
+            for ident, cadre in sys._current_frames().items():
+                if ident == moi:
+                    continue
+                pile = []
+                while cadre is not None and len(pile) < self.profondeur:
+                    code = cadre.f_code
+                    pile.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    cadre = cadre.f_back
+                pile.reverse()
+                self.piles[";".join(pile)] += 1
+
+    def arreter(self) -> Counter:
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.piles
+
+    def fonctions_chaudes(self, nombre: int = 10) -> List[Tuple[str, int]]:
+        # Fonctions le plus souvent au sommet de la pile
+        sommets: Counter = Counter()
+        for pile, n in self.piles.items():
+            sommets[pile.rsplit(";", 1)[-1]] += n
+        return sommets.most_common(nombre)
+
+    def ecrire(self, chemin: str) -> None:
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            for pile, n in self.piles.most_common():
+                fichier.write(f"{pile} {n}\n")
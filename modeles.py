@@ -0,0 +1,264 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple, Union
+
+
+class ValeurInternee(str):
+    # Chaîne partagée : deux valeurs égales sont toujours le même objet, ce
+    # qui évite de dupliquer « Non commencée » sur chaque tâche.
+    __slots__ = ()
+    _instances: Dict[str, "ValeurInternee"] = {}
+
+    def __new__(cls, valeur: str):
+        if type(valeur) is cls:
+            return valeur
+        instance = cls._instances.get(valeur)
+        if instance is None:
+            instance = super().__new__(cls, valeur)
+            cls._instances[instance] = instance
+        return instance
+
+
+class Statut(ValeurInternee):
+    __slots__ = ()
+    _instances: Dict[str, "Statut"] = {}
+
+
+class Role(ValeurInternee):
+    __slots__ = ()
+    _instances: Dict[str, "Role"] = {}
+
+
+class Impact(ValeurInternee):
+    __slots__ = ()
+    _instances: Dict[str, "Impact"] = {}
+
+
+Statut.NON_COMMENCEE = Statut("Non commencée")
+Statut.EN_COURS = Statut("En cours")
+Statut.TERMINEE = Statut("Terminée")
+
+Role.MANAGER = Role("Manager")
+Role.CHEF_DE_PROJET = Role("Chef de projet")
+Role.DEVELOPPEUR = Role("Développeur")
+Role.DESIGNER = Role("Designer")
+Role.TESTEUR = Role("Testeur")
+
+Impact.FAIBLE = Impact("Faible")
+Impact.MOYEN = Impact("Moyen")
+Impact.ELEVE = Impact("Élevé")
+
+
+class Membre:
+    __slots__ = ("nom", "role")
+
+    def __init__(self, nom: str, role: str):
+        self.nom = nom
+        self.role = Role(role)
+
+
+Observateur = Callable[["Tache", str], None]
+
+# Au-delà, une tâche qui gagne des dépendances une à une les range dans
+# une liste : agrandir un tuple le recopie, soit O(k²) pour k ajouts
+_SEUIL_TUPLE = 8
+
+
+class Dependances(Sequence):
+    # Vue en lecture seule sur la liste des dépendances d'une tâche à fort
+    # nombre de prédécesseurs, comparable à un tuple
+    __slots__ = ("_liste",)
+
+    def __init__(self, elements=()):
+        self._liste = list(elements)
+
+    def __len__(self) -> int:
+        return len(self._liste)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self._liste[i])
+        return self._liste[i]
+
+    def __iter__(self):
+        return iter(self._liste)
+
+    def __contains__(self, tache) -> bool:
+        return tache in self._liste
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, (tuple, Dependances)):
+            return tuple(self._liste) == tuple(autre)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, autre) -> tuple:
+        return tuple(self._liste) + tuple(autre)
+
+    def __repr__(self) -> str:
+        return f"Dependances({self._liste!r})"
+
+
+class Tache:
+    __slots__ = (
+        "_nom",
+        "description",
+        "_date_debut",
+        "_date_fin",
+        "_responsable",
+        "statut",
+        "dependances",
+        "_observateurs",
+        # Renseignés par calculer_chemin_critique
+        "early_start",
+        "early_finish",
+        "late_start",
+        "late_finish",
+    )
+
+    def __init__(
+        self,
+        nom: str,
+        description: str,
+        date_debut: datetime,
+        date_fin: datetime,
+        responsable: Membre,
+        statut: str,
+    ):
+        self._nom = nom
+        self.description = description
+        self._date_debut = date_debut
+        self._date_fin = date_fin
+        self._responsable = responsable
+        self.statut = Statut(statut)
+        # Tuples : le tuple vide est partagé et un tuple plein n'a pas de
+        # capacité de réserve, contrairement à une liste. Passé _SEUIL_TUPLE
+        # ajouts, une liste (derrière une vue Dependances) prend le relais.
+        self.dependances: Union[Tuple["Tache", ...], Dependances] = ()
+        # Rappels (tache, attribut) des plannings qui suivent cette tâche
+        self._observateurs: Union[Tuple[Observateur, ...], List[Observateur]] = ()
+
+    def ajouter_observateur(self, observateur: Observateur) -> None:
+        observateurs = self._observateurs
+        if type(observateurs) is list:
+            observateurs.append(observateur)
+        elif len(observateurs) < _SEUIL_TUPLE:
+            self._observateurs = observateurs + (observateur,)
+        else:
+            self._observateurs = [*observateurs, observateur]
+
+    def _notifier(self, attribut: str) -> None:
+        # Parcours d'une copie : un rappel peut ajouter un observateur
+        for observateur in tuple(self._observateurs):
+            observateur(self, attribut)
+
+    @property
+    def nom(self) -> str:
+        return self._nom
+
+    @nom.setter
+    def nom(self, nom: str) -> None:
+        self._nom = nom
+        self._notifier("nom")
+
+    @property
+    def responsable(self) -> Membre:
+        return self._responsable
+
+    @responsable.setter
+    def responsable(self, responsable: Membre) -> None:
+        self._responsable = responsable
+        self._notifier("responsable")
+
+    @property
+    def date_debut(self) -> datetime:
+        return self._date_debut
+
+    @date_debut.setter
+    def date_debut(self, date_debut: datetime) -> None:
+        self._date_debut = date_debut
+        self._notifier("date_debut")
+
+    @property
+    def date_fin(self) -> datetime:
+        return self._date_fin
+
+    @date_fin.setter
+    def date_fin(self, date_fin: datetime) -> None:
+        self._date_fin = date_fin
+        self._notifier("date_fin")
+
+    def modifier_dates(self, date_debut: datetime, date_fin: datetime) -> None:
+        self._date_debut = date_debut
+        self._date_fin = date_fin
+        self._notifier("date_fin")
+
+    def ajouter_dependance(self, tache: "Tache"):
+        # Proposée d'abord aux observateurs : un planning peut la refuser
+        # (cycle), elle est alors retirée avant d'avoir été publiée
+        self.poser_dependance(tache)
+        try:
+            self._notifier("dependance_proposee")
+        except Exception:
+            dependances = self.dependances
+            if type(dependances) is Dependances:
+                dependances._liste.pop()
+            else:
+                self.dependances = dependances[:-1]
+            raise
+        self._notifier("dependances")
+
+    def poser_dependance(self, tache: "Tache") -> None:
+        # Ajout sans notification, pour une tâche pas encore observée ou
+        # la relecture d'un journal
+        dependances = self.dependances
+        if type(dependances) is Dependances:
+            dependances._liste.append(tache)
+        elif len(dependances) < _SEUIL_TUPLE:
+            self.dependances = dependances + (tache,)
+        else:
+            self.dependances = Dependances((*dependances, tache))
+
+    def mettre_a_jour_statut(self, statut: str):
+        self.statut = Statut(statut)
+        self._notifier("statut")
+
+
+class Equipe:
+    __slots__ = ("membres",)
+
+    def __init__(self):
+        self.membres: List[Membre] = []
+
+    def ajouter_membre(self, membre: Membre):
+        self.membres.append(membre)
+
+    def obtenir_membres(self) -> List[Membre]:
+        return self.membres
+
+
+class Risque:
+    __slots__ = ("description", "probabilite", "impact")
+
+    def __init__(self, description: str, probabilite: float, impact: str):
+        self.description = description
+        self.probabilite = probabilite
+        self.impact = Impact(impact)
+
+
+class Jalon:
+    __slots__ = ("nom", "date")
+
+    def __init__(self, nom: str, date: datetime):
+        self.nom = nom
+        self.date = date
+
+
+class Changement:
+    __slots__ = ("description", "version", "date")
+
+    def __init__(self, description: str, version: int, date: datetime):
+        self.description = description
+        self.version = version
+        self.date = date
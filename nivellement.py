@@ -0,0 +1,115 @@
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from calendrier import Calendrier, decaler
+from chemin_critique import calculer_cpm
+
+PRIORITES = ("debut_tard", "marge")
+
+
+class PlanningNivele:
+    def __init__(self, ordre: List, origine: Optional[datetime], calendrier: Optional[Calendrier] = None):
+        # Tâches dans l'ordre où elles ont été lancées
+        self.ordre = ordre
+        self.origine = origine
+        # Les décalages sont en jours ouvrés de ce calendrier, s'il y en a un
+        self.calendrier = calendrier
+        self.debut: Dict = {}
+        self.fin: Dict = {}
+        self.duree = 0
+
+    def date_debut(self, tache) -> datetime:
+        return decaler(self.calendrier, self.origine, self.debut[tache])
+
+    def date_fin(self, tache) -> datetime:
+        return decaler(self.calendrier, self.origine, self.fin[tache])
+
+    @property
+    def date_fin_projet(self) -> Optional[datetime]:
+        if self.origine is None:
+            return None
+        return decaler(self.calendrier, self.origine, self.duree)
+
+    def appliquer(self) -> None:
+        # Reporte les dates nivelées sur les tâches (les plannings qui les
+        # observent sont prévenus)
+        for tache in self.ordre:
+            tache.modifier_dates(self.date_debut(tache), self.date_fin(tache))
+
+
+def niveler(
+    taches: Iterable,
+    priorite: str = "debut_tard",
+    origine: Optional[datetime] = None,
+    calendrier: Optional[Calendrier] = None,
+) -> PlanningNivele:
+    # Ordonnancement par liste, piloté par les événements : à chaque date
+    # où une tâche se termine, les tâches devenues prêtes rejoignent le tas
+    # de leur responsable, et tout responsable libre lance la plus urgente
+    # des siennes (plus petit début au plus tard, ou plus petite marge, du
+    # chemin critique sans contrainte de ressources). Chaque tâche entre et
+    # sort une fois d'un tas : O(n log n + E).
+    if priorite not in PRIORITES:
+        raise ValueError(f"Priorité inconnue: {priorite} (attendu: {', '.join(PRIORITES)})")
+    cpm = calculer_cpm(taches, calendrier)
+    ordre = cpm.ordre
+    numeros = {tache: i for i, tache in enumerate(ordre)}
+    cles = cpm.debut_tard if priorite == "debut_tard" else cpm.marge
+    if origine is None:
+        origine = min((tache.date_debut for tache in ordre), default=None)
+    resultat = PlanningNivele([], origine, calendrier)
+
+    durees = [cpm.fin_tot[tache] - cpm.debut_tot[tache] for tache in ordre]
+    restantes = [len(tache.dependances) for tache in ordre]
+    successeurs: List[List[int]] = [[] for _ in ordre]
+    for i, tache in enumerate(ordre):
+        for dep in tache.dependances:
+            successeurs[numeros[dep]].append(i)
+
+    # Tâches prêtes, par responsable : (priorité, marge, numéro)
+    pretes: Dict[object, list] = {}
+    occupes = set()
+    evenements: list = []  # (date de fin, numéro)
+    a_lancer = []
+
+    def rendre_prete(i: int) -> None:
+        tache = ordre[i]
+        heapq.heappush(
+            pretes.setdefault(tache.responsable, []), (cles[tache], cpm.marge[tache], i)
+        )
+        a_lancer.append(tache.responsable)
+
+    def lancer(date: int) -> None:
+        while a_lancer:
+            responsable = a_lancer.pop()
+            tas = pretes.get(responsable)
+            # Sans responsable, les tâches ne se gênent pas entre elles
+            while tas and (responsable is None or responsable not in occupes):
+                _, _, i = heapq.heappop(tas)
+                tache = ordre[i]
+                resultat.debut[tache] = date
+                resultat.fin[tache] = date + durees[i]
+                resultat.ordre.append(tache)
+                if responsable is not None:
+                    occupes.add(responsable)
+                heapq.heappush(evenements, (date + durees[i], i))
+
+    for i in range(len(ordre)):
+        if not restantes[i]:
+            rendre_prete(i)
+    lancer(0)
+    while evenements:
+        date, i = heapq.heappop(evenements)
+        resultat.duree = max(resultat.duree, date)
+        responsable = ordre[i].responsable
+        occupes.discard(responsable)
+        a_lancer.append(responsable)
+        for succ in successeurs[i]:
+            restantes[succ] -= 1
+            if not restantes[succ]:
+                rendre_prete(succ)
+        # Toutes les fins à la même date sont traitées avant de relancer
+        if not evenements or evenements[0][0] != date:
+            lancer(date)
+    return resultat
@@ -0,0 +1,437 @@
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from metriques import instrumenter
+
+
+class NotificationStrategy(ABC):
+    @abstractmethod
+    def envoyer(self, message: str, destinataire: str) -> None:
+        pass
+
+    def envoyer_groupe(self, message: str, destinataires: Sequence[str]) -> None:
+        # Un envoi par destinataire ; une stratégie capable d'adresser un
+        # même message à plusieurs destinataires à la fois la redéfinit
+        for destinataire in destinataires:
+            self.envoyer(message, destinataire)
+
+
+class EmailNotificationStrategy(NotificationStrategy):
+    def envoyer(self, message: str, destinataire: str) -> None:
+        print(f"Notification envoyée à {destinataire} par email: {message}")
+
+
+class SMSNotificationStrategy(NotificationStrategy):
+    def envoyer(self, message: str, destinataire: str) -> None:
+        print(f"Notification envoyée à {destinataire} par SMS: {message}")
+
+
+class PushNotificationStrategy(NotificationStrategy):
+    def envoyer(self, message: str, destinataire: str) -> None:
+        print(f"Notification envoyée à {destinataire} par push notification: {message}")
+
+
+class _Limiteur:
+    # Débit maximal d'une stratégie : ses envois sont espacés d'au moins
+    # `intervalle` secondes, quel que soit le thread qui les fait
+    def __init__(self, debit: float):
+        self.intervalle = 1.0 / debit
+        self._prochain = 0.0
+        self._verrou = threading.Lock()
+
+    def attendre(self) -> None:
+        with self._verrou:
+            maintenant = time.monotonic()
+            depart = max(maintenant, self._prochain)
+            self._prochain = depart + self.intervalle
+        if depart > maintenant:
+            time.sleep(depart - maintenant)
+
+
+class SMTPNotificationStrategy(NotificationStrategy):
+    # Envoi réel par SMTP. Les sessions sont gardées ouvertes dans un pool
+    # borné et réutilisées d'un envoi à l'autre ; un même message pour
+    # plusieurs destinataires part en une seule transaction (au plus
+    # `max_destinataires` RCPT par transaction). Une session coupée par le
+    # serveur est rouverte et la transaction rejouée ; les refus définitifs
+    # (codes 5xx) remontent tels quels, et la session reste dans le pool.
+    # Les destinataires refusés d'une transaction acceptée pour les autres
+    # sont relevés dans `refus`. Le débit (`messages_par_seconde`) est
+    # propre à la stratégie : deux stratégies vers un même serveur ont
+    # chacune le leur.
+    def __init__(
+        self,
+        hote: str,
+        port: int = 25,
+        expediteur: str = "notifications@localhost",
+        annuaire: Optional[Mapping[str, str]] = None,
+        taille_pool: int = 4,
+        max_destinataires: int = 50,
+        messages_par_seconde: Optional[float] = None,
+        tentatives: int = 3,
+        delai: float = 10.0,
+        starttls: bool = False,
+        identifiants: Optional[Tuple[str, str]] = None,
+        sujet: str = "Notification du projet",
+    ):
+        self.hote = hote
+        self.port = port
+        self.expediteur = expediteur
+        # Nom d'un membre -> adresse ; un destinataire contenant « @ » est
+        # pris tel quel
+        self.annuaire = annuaire or {}
+        self.max_destinataires = max_destinataires
+        self.tentatives = tentatives
+        self.delai = delai
+        self.starttls = starttls
+        self.identifiants = identifiants
+        self.sujet = sujet
+        self._limiteur = (
+            None if messages_par_seconde is None else _Limiteur(messages_par_seconde)
+        )
+        self._places = threading.BoundedSemaphore(taille_pool)
+        self._libres: List = []
+        self._verrou = threading.Lock()
+        self.connexions = 0
+        # Sessions ouvertes pour remplacer une session perdue
+        self.reconnexions = 0
+        self._perdues = 0
+        self.transactions = 0
+        # Adresse -> (code, message) du dernier refus du serveur
+        self.refus: Dict[str, Tuple[int, bytes]] = {}
+
+    def adresse(self, destinataire: str) -> str:
+        adresse = self.annuaire.get(destinataire, destinataire)
+        if "@" not in adresse:
+            raise ValueError(f"Adresse email inconnue pour {destinataire}")
+        return adresse
+
+    def _ouvrir(self):
+        import smtplib
+
+        session = smtplib.SMTP(self.hote, self.port, timeout=self.delai)
+        if self.starttls:
+            session.starttls()
+        if self.identifiants is not None:
+            session.login(*self.identifiants)
+        with self._verrou:
+            self.connexions += 1
+            if self._perdues:
+                self._perdues -= 1
+                self.reconnexions += 1
+        return session
+
+    @contextmanager
+    def _session(self) -> Iterator:
+        # Au plus `taille_pool` sessions en usage ; la dernière rendue est
+        # la première reprise (elle a le moins de chances d'avoir expiré)
+        with self._places:
+            with self._verrou:
+                session = self._libres.pop() if self._libres else None
+            if session is None:
+                session = self._ouvrir()
+            try:
+                yield session
+            except BaseException as erreur:
+                # Un refus du serveur laisse la session utilisable : seule
+                # une connexion perdue, ou dans un état inconnu, est fermée
+                if self._connexion_perdue(erreur):
+                    self._abandonner(session)
+                    with self._verrou:
+                        self._perdues += 1
+                else:
+                    with self._verrou:
+                        self._libres.append(session)
+                raise
+            with self._verrou:
+                self._libres.append(session)
+
+    @staticmethod
+    def _abandonner(session) -> None:
+        try:
+            session.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _connexion_perdue(erreur: BaseException) -> bool:
+        import smtplib
+
+        if isinstance(erreur, smtplib.SMTPServerDisconnected):
+            return True
+        return not isinstance(erreur, smtplib.SMTPException)
+
+    @staticmethod
+    def _transitoire(erreur: Exception) -> bool:
+        import smtplib
+
+        if isinstance(erreur, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(erreur, smtplib.SMTPResponseException):
+            return 400 <= erreur.smtp_code < 500
+        # Les erreurs réseau, mais pas les autres refus SMTP
+        return isinstance(erreur, OSError) and not isinstance(erreur, smtplib.SMTPException)
+
+    def _construire(self, message: str):
+        from email.message import EmailMessage
+
+        courriel = EmailMessage()
+        courriel["From"] = self.expediteur
+        courriel["To"] = "undisclosed-recipients:;"
+        courriel["Subject"] = self.sujet
+        courriel.set_content(message)
+        return courriel
+
+    def _transmettre(self, courriel, adresses: List[str]) -> None:
+        for tentative in range(self.tentatives):
+            if self._limiteur is not None:
+                self._limiteur.attendre()
+            try:
+                with self._session() as session:
+                    refus = session.send_message(courriel, self.expediteur, adresses)
+                with self._verrou:
+                    self.transactions += 1
+                    self.refus.update(refus)
+                return
+            except Exception as erreur:
+                if not self._transitoire(erreur) or tentative + 1 == self.tentatives:
+                    raise
+
+    def envoyer(self, message: str, destinataire: str) -> None:
+        self._distribuer(message, [destinataire])
+
+    def envoyer_groupe(self, message: str, destinataires: Sequence[str]) -> None:
+        self._distribuer(message, destinataires)
+
+    def _distribuer(self, message: str, destinataires: Sequence[str]) -> None:
+        adresses = [self.adresse(destinataire) for destinataire in destinataires]
+        if not adresses:
+            return
+        courriel = self._construire(message)
+        for debut in range(0, len(adresses), self.max_destinataires):
+            self._transmettre(courriel, adresses[debut:debut + self.max_destinataires])
+
+    def close(self) -> None:
+        # Ferme proprement les sessions au repos
+        with self._verrou:
+            libres, self._libres = self._libres, []
+        for session in libres:
+            try:
+                session.quit()
+            except Exception:
+                self._abandonner(session)
+
+
+_ARRET = object()
+
+
+class DistributeurAsynchrone:
+    # File bornée vidée par un pool de threads : `soumettre` rend la main dès
+    # que la notification est en file et ne bloque que si la file est pleine.
+    # Un message pour plusieurs destinataires forme un seul élément quand la
+    # stratégie sait les adresser d'un coup (envoyer_groupe redéfini).
+    def __init__(
+        self,
+        nb_workers: int = 4,
+        taille_file: int = 10_000,
+        concurrence_par_strategie: int = 2,
+    ):
+        self._file: queue.Queue = queue.Queue(maxsize=taille_file)
+        self._concurrence_par_strategie = concurrence_par_strategie
+        self._semaphores: Dict[int, threading.BoundedSemaphore] = {}
+        self._verrou = threading.Lock()
+        self._ferme = False
+        self.envoyes = 0
+        self.echecs = 0
+        self.latence_totale = 0.0
+        self.latence_max = 0.0
+        self.profondeur_max = 0
+        self._workers = [
+            threading.Thread(
+                target=self._travailler, name=f"notification-{i}", daemon=True
+            )
+            for i in range(nb_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _semaphore(self, strategy: NotificationStrategy) -> threading.BoundedSemaphore:
+        with self._verrou:
+            semaphore = self._semaphores.get(id(strategy))
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._concurrence_par_strategie)
+                self._semaphores[id(strategy)] = semaphore
+            return semaphore
+
+    def soumettre(
+        self,
+        strategy: NotificationStrategy,
+        message: str,
+        destinataire: str,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._mettre_en_file(strategy, message, (destinataire,), timeout)
+
+    def soumettre_groupe(
+        self,
+        strategy: NotificationStrategy,
+        message: str,
+        destinataires: Sequence[str],
+        timeout: Optional[float] = None,
+    ) -> None:
+        if type(strategy).envoyer_groupe is NotificationStrategy.envoyer_groupe:
+            # Pas d'envoi groupé : les destinataires restent servis en parallèle
+            for destinataire in destinataires:
+                self._mettre_en_file(strategy, message, (destinataire,), timeout)
+        elif destinataires:
+            self._mettre_en_file(strategy, message, tuple(destinataires), timeout)
+
+    def _mettre_en_file(
+        self,
+        strategy: NotificationStrategy,
+        message: str,
+        destinataires: Tuple[str, ...],
+        timeout: Optional[float],
+    ) -> None:
+        if self._ferme:
+            raise RuntimeError("Le distributeur de notifications est fermé")
+        # Contre-pression : bloque (ou lève queue.Full après `timeout`)
+        self._file.put(
+            (strategy, message, destinataires, time.perf_counter()), timeout=timeout
+        )
+        profondeur = self._file.qsize()
+        if profondeur > self.profondeur_max:
+            self.profondeur_max = profondeur
+
+    def _travailler(self) -> None:
+        while True:
+            element = self._file.get()
+            try:
+                if element is _ARRET:
+                    return
+                strategy, message, destinataires, soumis = element
+                with self._semaphore(strategy):
+                    try:
+                        strategy.envoyer_groupe(message, destinataires)
+                        succes = True
+                    except Exception:
+                        succes = False
+                latence = time.perf_counter() - soumis
+                with self._verrou:
+                    if succes:
+                        self.envoyes += len(destinataires)
+                    else:
+                        self.echecs += len(destinataires)
+                    self.latence_totale += latence
+                    if latence > self.latence_max:
+                        self.latence_max = latence
+            finally:
+                self._file.task_done()
+
+    @property
+    def profondeur(self) -> int:
+        return self._file.qsize()
+
+    def statistiques(self) -> Dict[str, float]:
+        with self._verrou:
+            traites = self.envoyes + self.echecs
+            return {
+                "envoyes": self.envoyes,
+                "echecs": self.echecs,
+                "profondeur": self._file.qsize(),
+                "profondeur_max": self.profondeur_max,
+                "latence_moyenne": self.latence_totale / traites if traites else 0.0,
+                "latence_max": self.latence_max,
+            }
+
+    def flush(self) -> None:
+        # Attend la fin de toutes les livraisons en file ou en cours
+        self._file.join()
+
+    def close(self) -> None:
+        if self._ferme:
+            return
+        self.flush()
+        self._ferme = True
+        for _ in self._workers:
+            self._file.put(_ARRET)
+        for worker in self._workers:
+            worker.join()
+
+
+class NotificationContext:
+    def __init__(
+        self,
+        strategy: NotificationStrategy,
+        distributeur: Optional[DistributeurAsynchrone] = None,
+    ):
+        self._strategy = strategy
+        self.distributeur = distributeur
+        # Pendant un regroupement : stratégie -> destinataire -> messages
+        self._tampon: Optional[Dict[NotificationStrategy, Dict[str, List[str]]]] = None
+
+    def set_strategy(self, strategy: NotificationStrategy):
+        self._strategy = strategy
+
+    def notifier(self, message: str, destinataires: List[str]) -> None:
+        if self._tampon is not None:
+            tampon = self._tampon.setdefault(self._strategy, {})
+            for destinataire in destinataires:
+                tampon.setdefault(destinataire, []).append(message)
+            return
+        self._envoyer(self._strategy, message, destinataires)
+
+    def _envoyer(
+        self, strategy: NotificationStrategy, message: str, destinataires: List[str]
+    ) -> None:
+        if self.distributeur is not None:
+            self.distributeur.soumettre_groupe(strategy, message, destinataires)
+            return
+        strategy.envoyer_groupe(message, destinataires)
+
+    @contextmanager
+    def regrouper(self) -> Iterator["NotificationContext"]:
+        # Les notifications émises dans le bloc sont envoyées à la sortie,
+        # en un seul récapitulatif par destinataire et par stratégie.
+        if self._tampon is not None:
+            yield self
+            return
+        self._tampon = {}
+        try:
+            yield self
+        finally:
+            tampon, self._tampon = self._tampon, None
+            for strategy, messages_par_destinataire in tampon.items():
+                # Les destinataires au récapitulatif identique partent ensemble
+                par_recapitulatif: Dict[str, List[str]] = {}
+                for destinataire, messages in messages_par_destinataire.items():
+                    par_recapitulatif.setdefault(resumer(messages), []).append(destinataire)
+                for recapitulatif, destinataires in par_recapitulatif.items():
+                    self._envoyer(strategy, recapitulatif, destinataires)
+
+    def flush(self) -> None:
+        if self.distributeur is not None:
+            self.distributeur.flush()
+
+    def close(self) -> None:
+        if self.distributeur is not None:
+            self.distributeur.close()
+
+
+def resumer(messages: List[str]) -> str:
+    if len(messages) == 1:
+        return messages[0]
+    lignes = "\n".join(f"- {message}" for message in messages)
+    return f"Récapitulatif de {len(messages)} notifications:\n{lignes}"
+
+
+# Chaque livraison, par stratégie, et chaque mise en file comptent comme
+# une notification déclenchée par la mutation en cours
+instrumenter(NotificationStrategy, "envoyer", "notifications.envoyer", envoi=True, sous_classes=True)
+instrumenter(NotificationStrategy, "envoyer_groupe", "notifications.envoyer_groupe", envoi=True, sous_classes=True)
+instrumenter(DistributeurAsynchrone, "_mettre_en_file", "notifications.soumettre", envoi=True)
+instrumenter(NotificationContext, "notifier", "notifications.notifier")
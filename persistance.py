@@ -0,0 +1,781 @@
+import mmap
+import os
+import struct
+from collections.abc import MutableSequence
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from gestion_projet import Projet
+from journal import (
+    BUDGET_DEFINI,
+    CHANGEMENT_ENREGISTRE,
+    JALON_AJOUTE,
+    MEMBRE_AJOUTE,
+    RISQUE_AJOUTE,
+    TACHE_AJOUTEE,
+)
+from modeles import Changement, Equipe, Jalon, Membre, Risque, Tache
+
+# Instantané : en-tête (avec la classe du projet), table des sections
+# (décalage, nombre d'éléments), puis les sections. Les enregistrements sont de taille fixe et les
+# chaînes dédupliquées dans une table commune, ce qui permet de lire
+# l'enregistrement i directement dans la projection mémoire.
+MAGIQUE = b"PRJT"
+VERSION_FORMAT = 2
+_ENTETE = struct.Struct("<4sHBx")
+_SECTION = struct.Struct("<QQ")
+_PROJET = struct.Struct("<IIqqBdq")
+_DECALAGE_CHAINE = struct.Struct("<Q")
+_MEMBRE = struct.Struct("<II")
+_TACHE = struct.Struct("<IIqqIIII")
+_DEPENDANCE = struct.Struct("<I")
+_EQUIPE = struct.Struct("<BI")
+_RISQUE = struct.Struct("<BIdI")
+_JALON = struct.Struct("<BIq")
+_CHANGEMENT = struct.Struct("<BIqq")
+
+# Classe du projet sauvegardé : celui de gestion_projet, ou celui de main
+# (équipe de Membre, changements versionnés)
+CLASSE_GESTION, CLASSE_PRINCIPALE = range(2)
+
+(
+    SECTION_PROJET,
+    SECTION_DECALAGES,
+    SECTION_CHAINES,
+    SECTION_MEMBRES,
+    SECTION_TACHES,
+    SECTION_DEPENDANCES,
+    SECTION_EQUIPE,
+    SECTION_RISQUES,
+    SECTION_JALONS,
+    SECTION_CHANGEMENTS,
+) = range(10)
+NB_SECTIONS = 10
+
+AUCUN = 0xFFFFFFFF
+_ORIGINE = datetime(1970, 1, 1)
+_MICROSECONDE = timedelta(microseconds=1)
+_JOUR = timedelta(days=1) // _MICROSECONDE
+
+# Journal des mutations : type (1 octet), longueur (4 octets), contenu
+_ENREGISTREMENT = struct.Struct("<BI")
+(
+    OP_MEMBRE_EQUIPE,
+    OP_DEFINITION_MEMBRE,
+    OP_TACHE,
+    OP_DEPENDANCE,
+    OP_DATES,
+    OP_STATUT,
+    OP_BUDGET,
+    OP_RISQUE,
+    OP_JALON,
+    OP_CHANGEMENT,
+) = range(10)
+
+
+def _en_entier(date: datetime) -> int:
+    return (date - _ORIGINE) // _MICROSECONDE
+
+
+def _en_date(valeur: int) -> datetime:
+    return _ORIGINE + valeur * _MICROSECONDE
+
+
+class SequenceParesseuse(MutableSequence):
+    # Séquence dont les `taille` premiers éléments sont construits à la
+    # demande depuis l'instantané puis gardés pour préserver leur identité ;
+    # les éléments ajoutés ensuite vivent dans une liste ordinaire.
+    def __init__(self, taille: int, construire: Callable[[int], object]):
+        self._taille = taille
+        self._construire = construire
+        self._construits: Dict[int, object] = {}
+        self._ajouts: List = []
+        self._liste: Optional[List] = None
+        self.a_la_creation: List[Callable[[object, int], None]] = []
+
+    def __len__(self) -> int:
+        if self._liste is not None:
+            return len(self._liste)
+        return self._taille + len(self._ajouts)
+
+    def _element(self, i: int):
+        if i >= self._taille:
+            return self._ajouts[i - self._taille]
+        element = self._construits.get(i)
+        if element is None:
+            element = self._construire(i)
+            if i not in self._construits:
+                self._memoriser(i, element)
+        return element
+
+    def _memoriser(self, i: int, element) -> None:
+        self._construits[i] = element
+        for rappel in self.a_la_creation:
+            rappel(element, i)
+
+    def __getitem__(self, i):
+        if self._liste is not None:
+            return self._liste[i]
+        if isinstance(i, slice):
+            return [self._element(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("index hors limites")
+        return self._element(i)
+
+    def __iter__(self):
+        if self._liste is not None:
+            yield from self._liste
+            return
+        for i in range(len(self)):
+            yield self._element(i)
+
+    def append(self, element) -> None:
+        if self._liste is not None:
+            self._liste.append(element)
+        else:
+            self._ajouts.append(element)
+
+    def _materialiser(self) -> List:
+        if self._liste is None:
+            self._liste = list(self)
+        return self._liste
+
+    def __setitem__(self, i, element) -> None:
+        self._materialiser()[i] = element
+
+    def __delitem__(self, i) -> None:
+        del self._materialiser()[i]
+
+    def insert(self, i: int, element) -> None:
+        self._materialiser().insert(i, element)
+
+    @property
+    def nb_construits(self) -> int:
+        return len(self._construits)
+
+
+class _Chaines:
+    def __init__(self):
+        self.identifiants: Dict[str, int] = {}
+        self.liste: List[bytes] = []
+
+    def __call__(self, chaine: str) -> int:
+        identifiant = self.identifiants.get(chaine)
+        if identifiant is None:
+            identifiant = self.identifiants[chaine] = len(self.liste)
+            self.liste.append(str(chaine).encode("utf-8"))
+        return identifiant
+
+
+def _morceaux(projet) -> Tuple[List[bytes], Dict[Membre, int]]:
+    # Instantané découpé en morceaux à écrire ou à concaténer tels quels
+    chaines = _Chaines()
+    membres: Dict[Membre, int] = {}
+    taches = list(projet.taches)
+    index = {tache: i for i, tache in enumerate(taches)}
+
+    taches_brutes = bytearray()
+    dependances = bytearray()
+    nb_dependances = 0
+    membres_bruts = bytearray()
+
+    def indice_membre(membre: Membre) -> int:
+        indice = membres.get(membre)
+        if indice is None:
+            indice = membres[membre] = len(membres)
+            membres_bruts.extend(_MEMBRE.pack(chaines(membre.nom), chaines(membre.role)))
+        return indice
+
+    for tache in taches:
+        if not isinstance(tache, Tache):
+            raise TypeError(f"Seules les tâches de type Tache sont sauvegardées: {tache!r}")
+        responsable = AUCUN
+        if tache.responsable is not None:
+            responsable = indice_membre(tache.responsable)
+        for dep in tache.dependances:
+            if dep not in index:
+                raise ValueError(f"La dépendance {dep.nom} n'appartient pas au projet")
+            dependances += _DEPENDANCE.pack(index[dep])
+        taches_brutes += _TACHE.pack(
+            chaines(tache.nom),
+            chaines(tache.description),
+            _en_entier(tache.date_debut),
+            _en_entier(tache.date_fin),
+            responsable,
+            chaines(tache.statut),
+            nb_dependances,
+            len(tache.dependances),
+        )
+        nb_dependances += len(tache.dependances)
+
+    # Le Projet de main tient une Equipe de Membre, rangés avec les
+    # responsables : un membre garde son rôle et son identité
+    membres_equipe = projet.equipe
+    if isinstance(membres_equipe, Equipe):
+        membres_equipe = membres_equipe.obtenir_membres()
+    equipe = b"".join(
+        _EQUIPE.pack(1, indice_membre(membre))
+        if isinstance(membre, Membre)
+        else _EQUIPE.pack(0, chaines(membre))
+        for membre in membres_equipe
+    )
+    risques = b"".join(
+        _RISQUE.pack(1, chaines(r.description), r.probabilite, chaines(r.impact))
+        if isinstance(r, Risque)
+        else _RISQUE.pack(0, chaines(r), 0.0, AUCUN)
+        for r in projet.risques
+    )
+    jalons = b"".join(
+        _JALON.pack(1, chaines(j.nom), _en_entier(j.date))
+        if isinstance(j, Jalon)
+        else _JALON.pack(0, chaines(j), 0)
+        for j in projet.jalons
+    )
+    changements = b"".join(
+        _CHANGEMENT.pack(1, chaines(c.description), c.version, _en_entier(c.date))
+        if isinstance(c, Changement)
+        else _CHANGEMENT.pack(0, chaines(c), 0, 0)
+        for c in projet.changements
+    )
+    budget = getattr(projet, "budget", None)
+    entete_projet = _PROJET.pack(
+        chaines(projet.nom),
+        chaines(projet.description),
+        _en_entier(projet.date_debut),
+        _en_entier(projet.date_fin),
+        budget is not None,
+        budget or 0.0,
+        getattr(projet, "version", 0),
+    )
+
+    decalages = bytearray()
+    position = 0
+    for chaine in chaines.liste:
+        decalages += _DECALAGE_CHAINE.pack(position)
+        position += len(chaine)
+    decalages += _DECALAGE_CHAINE.pack(position)
+
+    sections = [
+        (entete_projet, 1),
+        (decalages, len(chaines.liste) + 1),
+        (b"".join(chaines.liste), position),
+        (membres_bruts, len(membres)),
+        (taches_brutes, len(taches)),
+        (dependances, nb_dependances),
+        (equipe, len(membres_equipe)),
+        (risques, len(projet.risques)),
+        (jalons, len(projet.jalons)),
+        (changements, len(projet.changements)),
+    ]
+    classe = CLASSE_GESTION if isinstance(projet, Projet) else CLASSE_PRINCIPALE
+    morceaux = [_ENTETE.pack(MAGIQUE, VERSION_FORMAT, classe)]
+    position = _ENTETE.size + NB_SECTIONS * _SECTION.size
+    for donnees, nombre in sections:
+        morceaux.append(_SECTION.pack(position, nombre))
+        position += len(donnees)
+    morceaux.extend(bytes(donnees) for donnees, _ in sections)
+    return morceaux, membres
+
+
+def serialiser(projet) -> bytes:
+    # Forme compacte d'un projet, à relire avec Instantane(donnees)
+    morceaux, _ = _morceaux(projet)
+    return b"".join(morceaux)
+
+
+def ecrire_instantane(projet, chemin: str) -> Dict[Membre, int]:
+    morceaux, membres = _morceaux(projet)
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.writelines(morceaux)
+    os.replace(temporaire, chemin)
+    return membres
+
+
+class Instantane:
+    # Lecture d'un instantané projeté en mémoire (ou déjà en mémoire, reçu
+    # sous forme d'octets) ; rien n'est décodé avant d'être demandé.
+    def __init__(self, source: Union[str, bytes]):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._tampon = source
+        else:
+            with open(source, "rb") as fichier:
+                self._tampon = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        magique, version, self.classe = _ENTETE.unpack_from(self._tampon, 0)
+        if magique != MAGIQUE or version != VERSION_FORMAT:
+            origine = source if isinstance(source, str) else "Le tampon"
+            raise ValueError(f"{origine} n'est pas un instantané de projet valide")
+        self._sections = [
+            _SECTION.unpack_from(self._tampon, _ENTETE.size + i * _SECTION.size)
+            for i in range(NB_SECTIONS)
+        ]
+        self.membres = SequenceParesseuse(
+            self.nombre(SECTION_MEMBRES), self._construire_membre
+        )
+        self.taches = SequenceParesseuse(
+            self.nombre(SECTION_TACHES), self._construire_tache
+        )
+
+    def nombre(self, section: int) -> int:
+        return self._sections[section][1]
+
+    def _lire(self, section: int, structure: struct.Struct, i: int) -> tuple:
+        debut = self._sections[section][0] + i * structure.size
+        return structure.unpack_from(self._tampon, debut)
+
+    def chaine(self, identifiant: int) -> str:
+        debut, = self._lire(SECTION_DECALAGES, _DECALAGE_CHAINE, identifiant)
+        fin, = self._lire(SECTION_DECALAGES, _DECALAGE_CHAINE, identifiant + 1)
+        base = self._sections[SECTION_CHAINES][0]
+        return self._tampon[base + debut:base + fin].decode("utf-8")
+
+    def _construire_membre(self, i: int) -> Membre:
+        nom, role = self._lire(SECTION_MEMBRES, _MEMBRE, i)
+        return Membre(self.chaine(nom), self.chaine(role))
+
+    def _dependances(self, i: int) -> List[int]:
+        premiere, nombre = self._lire(SECTION_TACHES, _TACHE, i)[6:]
+        return [
+            self._lire(SECTION_DEPENDANCES, _DEPENDANCE, premiere + k)[0]
+            for k in range(nombre)
+        ]
+
+    def reseau(self) -> Tuple[List[int], List[List[int]]]:
+        # Durées (en jours) et dépendances de toutes les tâches, lues d'un
+        # bloc sans construire d'objet Tache
+        debut, nombre = self._sections[SECTION_DEPENDANCES]
+        liens = [
+            dep for dep, in _DEPENDANCE.iter_unpack(
+                memoryview(self._tampon)[debut:debut + nombre * _DEPENDANCE.size]
+            )
+        ]
+        debut, nombre = self._sections[SECTION_TACHES]
+        durees: List[int] = []
+        dependances: List[List[int]] = []
+        for _, _, date_debut, date_fin, _, _, premiere, nb in _TACHE.iter_unpack(
+            memoryview(self._tampon)[debut:debut + nombre * _TACHE.size]
+        ):
+            durees.append((date_fin - date_debut) // _JOUR)
+            dependances.append(liens[premiere:premiere + nb])
+        return durees, dependances
+
+    def nom_tache(self, i: int) -> str:
+        return self.chaine(self._lire(SECTION_TACHES, _TACHE, i)[0])
+
+    def _construire_tache(self, i: int) -> Tache:
+        # Une tâche a besoin de ses dépendances : on les construit d'abord,
+        # par un parcours en profondeur itératif (les chaînes peuvent être
+        # bien plus longues que la pile d'appels).
+        construits = self.taches._construits
+        en_cours = set()
+        pile = [i]
+        while pile:
+            j = pile[-1]
+            if j in construits:
+                pile.pop()
+                continue
+            dependances = self._dependances(j)
+            if j not in en_cours:
+                en_cours.add(j)
+                for dep in dependances:
+                    if dep in en_cours and dep not in construits:
+                        raise ValueError("Cycle de dépendances dans l'instantané")
+                    if dep not in construits:
+                        pile.append(dep)
+                continue
+            pile.pop()
+            nom, description, debut, fin, responsable, statut = self._lire(
+                SECTION_TACHES, _TACHE, j
+            )[:6]
+            tache = Tache(
+                self.chaine(nom),
+                self.chaine(description),
+                _en_date(debut),
+                _en_date(fin),
+                None if responsable == AUCUN else self.membres[responsable],
+                self.chaine(statut),
+            )
+            tache.dependances = tuple(construits[dep] for dep in dependances)
+            self.taches._memoriser(j, tache)
+        return construits[i]
+
+    def projet(self):
+        # Un projet de la classe sauvegardée
+        nom, description, debut, fin, a_budget, budget, version = self._lire(
+            SECTION_PROJET, _PROJET, 0
+        )
+        nom, description = self.chaine(nom), self.chaine(description)
+        if self.classe == CLASSE_PRINCIPALE:
+            return self._projet_principal(
+                nom, description, _en_date(debut), _en_date(fin), budget, version
+            )
+        projet = Projet(nom, description, _en_date(debut), _en_date(fin))
+        if a_budget:
+            projet.budget = budget
+        projet.taches = self.taches
+        # Les tâches lues plus tard sont surveillées dès leur construction
+        for tache in self.taches._construits.values():
+            projet._surveiller(tache)
+        self.taches.a_la_creation.append(lambda tache, _: projet._surveiller(tache))
+        projet.equipe = SequenceParesseuse(
+            self.nombre(SECTION_EQUIPE), self._construire_membre_equipe
+        )
+        projet.risques = SequenceParesseuse(
+            self.nombre(SECTION_RISQUES), self._construire_risque
+        )
+        projet.jalons = SequenceParesseuse(
+            self.nombre(SECTION_JALONS), self._construire_jalon
+        )
+        projet.changements = SequenceParesseuse(
+            self.nombre(SECTION_CHANGEMENTS), self._construire_changement
+        )
+        return projet
+
+    def _projet_principal(
+        self,
+        nom: str,
+        description: str,
+        debut: datetime,
+        fin: datetime,
+        budget: float,
+        version: int,
+    ):
+        # Le Projet de main tient son planning et son index à jour dès
+        # l'ajout : tout est construit d'un coup
+        from main import Projet as ProjetPrincipal
+        projet = ProjetPrincipal(nom, description, debut, fin)
+        projet.budget = budget
+        projet.version = version
+        for i in range(self.nombre(SECTION_EQUIPE)):
+            projet.equipe.ajouter_membre(self._construire_membre_equipe(i))
+        projet._inserer_taches(list(self.taches))
+        projet.risques.extend(
+            self._construire_risque(i) for i in range(self.nombre(SECTION_RISQUES))
+        )
+        for i in range(self.nombre(SECTION_JALONS)):
+            jalon = self._construire_jalon(i)
+            projet.jalons.append(jalon)
+            projet.index.ajouter_jalon(jalon)
+        projet.changements.extend(
+            self._construire_changement(i)
+            for i in range(self.nombre(SECTION_CHANGEMENTS))
+        )
+        return projet
+
+    def _construire_membre_equipe(self, i: int):
+        genre, valeur = self._lire(SECTION_EQUIPE, _EQUIPE, i)
+        if not genre:
+            return self.chaine(valeur)
+        return self.membres[valeur]
+
+    def _construire_changement(self, i: int):
+        genre, description, version, date = self._lire(
+            SECTION_CHANGEMENTS, _CHANGEMENT, i
+        )
+        if not genre:
+            return self.chaine(description)
+        return Changement(self.chaine(description), version, _en_date(date))
+
+    def _construire_risque(self, i: int):
+        genre, description, probabilite, impact = self._lire(SECTION_RISQUES, _RISQUE, i)
+        if not genre:
+            return self.chaine(description)
+        return Risque(self.chaine(description), probabilite, self.chaine(impact))
+
+    def _construire_jalon(self, i: int):
+        genre, nom, date = self._lire(SECTION_JALONS, _JALON, i)
+        if not genre:
+            return self.chaine(nom)
+        return Jalon(self.chaine(nom), _en_date(date))
+
+
+class _Ecrivain:
+    def __init__(self):
+        self.donnees = bytearray()
+
+    def entier(self, valeur: int) -> "_Ecrivain":
+        self.donnees += struct.pack("<q", valeur)
+        return self
+
+    def reel(self, valeur: float) -> "_Ecrivain":
+        self.donnees += struct.pack("<d", valeur)
+        return self
+
+    def chaine(self, valeur: str) -> "_Ecrivain":
+        donnees = str(valeur).encode("utf-8")
+        self.donnees += struct.pack("<I", len(donnees)) + donnees
+        return self
+
+    def date(self, valeur: datetime) -> "_Ecrivain":
+        return self.entier(_en_entier(valeur))
+
+
+class _Lecteur:
+    def __init__(self, donnees: bytes):
+        self.donnees = donnees
+        self.position = 0
+
+    def entier(self) -> int:
+        valeur, = struct.unpack_from("<q", self.donnees, self.position)
+        self.position += 8
+        return valeur
+
+    def reel(self) -> float:
+        valeur, = struct.unpack_from("<d", self.donnees, self.position)
+        self.position += 8
+        return valeur
+
+    def chaine(self) -> str:
+        longueur, = struct.unpack_from("<I", self.donnees, self.position)
+        debut = self.position + 4
+        self.position = debut + longueur
+        return self.donnees[debut:self.position].decode("utf-8")
+
+    def date(self) -> datetime:
+        return _en_date(self.entier())
+
+
+class Depot:
+    # Un dossier contenant un instantané et le journal des mutations
+    # survenues depuis. Chaque mutation du projet suivi ajoute un court
+    # enregistrement au journal ; `sauvegarder` compacte le tout dans un
+    # nouvel instantané.
+    def __init__(self, dossier: str):
+        os.makedirs(dossier, exist_ok=True)
+        self.chemin_instantane = os.path.join(dossier, "instantane.bin")
+        self.chemin_journal = os.path.join(dossier, "journal.bin")
+        self._journal = None
+        self._projet: Optional[Projet] = None
+        self._taches: Dict[Tache, int] = {}
+        self._membres: Dict[Membre, int] = {}
+        self._nb_membres = 0
+        self._observees = set()
+        # Dépendances vers des tâches pas encore ajoutées au projet
+        self._en_attente: Dict[Tache, List[Tache]] = {}
+
+    def sauvegarder(self, projet: Projet) -> None:
+        self._detacher()
+        self._membres = ecrire_instantane(projet, self.chemin_instantane)
+        self._nb_membres = len(self._membres)
+        self._taches = {}
+        for i, tache in enumerate(projet.taches):
+            self._observer_tache(tache, i)
+        self._journal = open(self.chemin_journal, "wb")
+        self._suivre(projet)
+
+    def charger(self) -> Projet:
+        self._detacher()
+        instantane = Instantane(self.chemin_instantane)
+        projet = instantane.projet()
+        membres = instantane.membres
+        self._membres = {}
+        self._nb_membres = len(membres)
+        self._taches = {}
+        membres.a_la_creation.append(self._membres.setdefault)
+        instantane.taches.a_la_creation.append(self._observer_tache)
+        if os.path.exists(self.chemin_journal):
+            self._rejouer(projet, membres)
+        self._journal = open(self.chemin_journal, "ab")
+        self._suivre(projet)
+        return projet
+
+    def _observer_tache(self, tache: Tache, i: int) -> None:
+        self._taches[tache] = i
+        if tache not in self._observees:
+            self._observees.add(tache)
+            tache.ajouter_observateur(self._sur_modification_tache)
+
+    def _suivre(self, projet: Projet) -> None:
+        self._projet = projet
+        projet.observateurs.append(self._sur_mutation)
+
+    def _detacher(self) -> None:
+        if self._projet is not None:
+            self._projet.observateurs.remove(self._sur_mutation)
+            self._projet = None
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._en_attente = {}
+
+    def synchroniser(self) -> None:
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    def fermer(self) -> None:
+        self.synchroniser()
+        self._detacher()
+
+    def _ecrire(self, operation: int, ecrivain: _Ecrivain) -> None:
+        self._journal.write(_ENREGISTREMENT.pack(operation, len(ecrivain.donnees)))
+        self._journal.write(ecrivain.donnees)
+
+    def _index_membre(self, membre: Optional[Membre]) -> int:
+        if membre is None:
+            return -1
+        index = self._membres.get(membre)
+        if index is None:
+            index = self._membres[membre] = self._nb_membres
+            self._nb_membres += 1
+            self._ecrire(
+                OP_DEFINITION_MEMBRE, _Ecrivain().chaine(membre.nom).chaine(membre.role)
+            )
+        return index
+
+    def _sur_mutation(self, code: int, objet) -> None:
+        if self._journal is None:
+            return
+        if code == MEMBRE_AJOUTE:
+            if isinstance(objet, Membre):
+                ecrivain = _Ecrivain().entier(1).entier(self._index_membre(objet))
+            else:
+                ecrivain = _Ecrivain().entier(0).chaine(objet)
+            self._ecrire(OP_MEMBRE_EQUIPE, ecrivain)
+        elif code == TACHE_AJOUTEE:
+            self._ajouter_tache(objet)
+        elif code == BUDGET_DEFINI:
+            self._ecrire(OP_BUDGET, _Ecrivain().reel(objet))
+        elif code == RISQUE_AJOUTE:
+            if isinstance(objet, Risque):
+                ecrivain = _Ecrivain().entier(1).chaine(objet.description)
+                ecrivain.reel(objet.probabilite).chaine(objet.impact)
+            else:
+                ecrivain = _Ecrivain().entier(0).chaine(objet)
+            self._ecrire(OP_RISQUE, ecrivain)
+        elif code == JALON_AJOUTE:
+            if isinstance(objet, Jalon):
+                ecrivain = _Ecrivain().entier(1).chaine(objet.nom).date(objet.date)
+            else:
+                ecrivain = _Ecrivain().entier(0).chaine(objet)
+            self._ecrire(OP_JALON, ecrivain)
+        elif code == CHANGEMENT_ENREGISTRE:
+            if isinstance(objet, Changement):
+                ecrivain = _Ecrivain().entier(1).chaine(objet.description)
+                ecrivain.entier(objet.version).date(objet.date)
+            else:
+                ecrivain = _Ecrivain().entier(0).chaine(objet)
+            self._ecrire(OP_CHANGEMENT, ecrivain)
+
+    def _ajouter_tache(self, tache) -> None:
+        if not isinstance(tache, Tache):
+            raise TypeError(f"Seules les tâches de type Tache sont sauvegardées: {tache!r}")
+        responsable = self._index_membre(tache.responsable)
+        connues = [dep for dep in tache.dependances if dep in self._taches]
+        for dep in tache.dependances:
+            if dep not in self._taches:
+                self._en_attente.setdefault(dep, []).append(tache)
+        ecrivain = _Ecrivain().chaine(tache.nom).chaine(tache.description)
+        ecrivain.date(tache.date_debut).date(tache.date_fin)
+        ecrivain.entier(responsable).chaine(tache.statut).entier(len(connues))
+        for dep in connues:
+            ecrivain.entier(self._taches[dep])
+        self._ecrire(OP_TACHE, ecrivain)
+        self._observer_tache(tache, len(self._projet.taches) - 1)
+        for successeur in self._en_attente.pop(tache, ()):
+            self._ecrire_dependance(successeur, tache)
+
+    def _ecrire_dependance(self, tache: Tache, dep: Tache) -> None:
+        if dep not in self._taches:
+            self._en_attente.setdefault(dep, []).append(tache)
+            return
+        self._ecrire(
+            OP_DEPENDANCE, _Ecrivain().entier(self._taches[tache]).entier(self._taches[dep])
+        )
+
+    def _sur_modification_tache(self, tache: Tache, attribut: str) -> None:
+        if self._journal is None or tache not in self._taches:
+            return
+        index = self._taches[tache]
+        if attribut == "dependances":
+            self._ecrire_dependance(tache, tache.dependances[-1])
+        elif attribut in ("date_debut", "date_fin"):
+            ecrivain = _Ecrivain().entier(index)
+            self._ecrire(OP_DATES, ecrivain.date(tache.date_debut).date(tache.date_fin))
+        elif attribut == "statut":
+            self._ecrire(OP_STATUT, _Ecrivain().entier(index).chaine(tache.statut))
+
+    def _rejouer(self, projet: Projet, membres: SequenceParesseuse) -> None:
+        with open(self.chemin_journal, "rb") as fichier:
+            donnees = fichier.read()
+        position = 0
+        while position + _ENREGISTREMENT.size <= len(donnees):
+            operation, longueur = _ENREGISTREMENT.unpack_from(donnees, position)
+            debut = position + _ENREGISTREMENT.size
+            if debut + longueur > len(donnees):
+                break
+            self._appliquer(
+                projet, membres, operation, _Lecteur(donnees[debut:debut + longueur])
+            )
+            position = debut + longueur
+        if position < len(donnees):
+            # Dernier enregistrement tronqué (arrêt brutal) : on l'écarte
+            with open(self.chemin_journal, "r+b") as fichier:
+                fichier.truncate(position)
+
+    def _appliquer(
+        self,
+        projet: Projet,
+        membres: SequenceParesseuse,
+        operation: int,
+        lecteur: _Lecteur,
+    ) -> None:
+        if operation == OP_MEMBRE_EQUIPE:
+            if lecteur.entier():
+                projet.equipe.append(membres[lecteur.entier()])
+            else:
+                projet.equipe.append(lecteur.chaine())
+        elif operation == OP_DEFINITION_MEMBRE:
+            membre = Membre(lecteur.chaine(), lecteur.chaine())
+            self._membres[membre] = len(membres)
+            membres.append(membre)
+        elif operation == OP_TACHE:
+            nom, description = lecteur.chaine(), lecteur.chaine()
+            debut, fin = lecteur.date(), lecteur.date()
+            responsable = lecteur.entier()
+            statut = lecteur.chaine()
+            tache = Tache(
+                nom,
+                description,
+                debut,
+                fin,
+                None if responsable < 0 else membres[responsable],
+                statut,
+            )
+            tache.dependances = tuple(
+                projet.taches[lecteur.entier()] for _ in range(lecteur.entier())
+            )
+            projet.taches.append(tache)
+            projet._surveiller(tache)
+            self._observer_tache(tache, len(projet.taches) - 1)
+        elif operation == OP_DEPENDANCE:
+            tache = projet.taches[lecteur.entier()]
+            tache.poser_dependance(projet.taches[lecteur.entier()])
+        elif operation == OP_DATES:
+            tache = projet.taches[lecteur.entier()]
+            tache.modifier_dates(lecteur.date(), lecteur.date())
+        elif operation == OP_STATUT:
+            projet.taches[lecteur.entier()].mettre_a_jour_statut(lecteur.chaine())
+        elif operation == OP_BUDGET:
+            projet.budget = lecteur.reel()
+        elif operation == OP_RISQUE:
+            if lecteur.entier():
+                projet.risques.append(
+                    Risque(lecteur.chaine(), lecteur.reel(), lecteur.chaine())
+                )
+            else:
+                projet.risques.append(lecteur.chaine())
+        elif operation == OP_JALON:
+            if lecteur.entier():
+                projet.jalons.append(Jalon(lecteur.chaine(), lecteur.date()))
+            else:
+                projet.jalons.append(lecteur.chaine())
+        elif operation == OP_CHANGEMENT:
+            if lecteur.entier():
+                projet.changements.append(
+                    Changement(lecteur.chaine(), lecteur.entier(), lecteur.date())
+                )
+            else:
+                projet.changements.append(lecteur.chaine())
@@ -0,0 +1,151 @@
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from chemin_critique import CycleDependancesError, calculer_cpm_indices
+from persistance import Instantane, serialiser
+
+
+class ResultatProjet(NamedTuple):
+    cle: Hashable
+    duree: Optional[int] = None
+    # Noms des tâches du chemin critique, dans l'ordre
+    chemin_critique: Tuple[str, ...] = ()
+    # Marge de chaque tâche, dans l'ordre de projet.taches
+    marges: Tuple[int, ...] = ()
+    rapport: Optional[str] = None
+    erreur: Optional[str] = None
+
+
+def _traiter_projet(cle: Hashable, donnees: Union[bytes, str], avec_rapport: bool) -> ResultatProjet:
+    try:
+        # Le planning se calcule directement sur les enregistrements de
+        # l'instantané ; seuls les noms du chemin critique sont décodés.
+        instantane = Instantane(donnees)
+        try:
+            resultat = calculer_cpm_indices(*instantane.reseau())
+        except CycleDependancesError as erreur:
+            raise CycleDependancesError([instantane.nom_tache(i) for i in erreur.cycle])
+        rapport = None
+        if avec_rapport:
+            rapport = instantane.projet().generer_rapport_performance()
+        return ResultatProjet(
+            cle,
+            resultat.duree,
+            tuple(instantane.nom_tache(i) for i in resultat.chemin_critique),
+            tuple(resultat.marge),
+            rapport,
+        )
+    except Exception:
+        # Un projet invalide ne doit pas emporter le reste du lot
+        return ResultatProjet(cle, erreur=traceback.format_exc())
+
+
+def _traiter_lot(lot: List[Tuple[Hashable, Union[bytes, str]]], avec_rapport: bool) -> List[ResultatProjet]:
+    return [_traiter_projet(cle, donnees, avec_rapport) for cle, donnees in lot]
+
+
+class Portefeuille:
+    # Calcule les plannings de nombreux projets sur un groupe de processus.
+    # Chaque projet voyage sous la forme de son instantané binaire plutôt
+    # que d'un graphe d'objets sérialisé par pickle ; les projets sont
+    # envoyés par lots pour amortir les échanges entre processus, et le
+    # nombre de lots en vol est borné pour que la sérialisation suive le
+    # rythme des calculs.
+    def __init__(
+        self,
+        nb_processus: Optional[int] = None,
+        taille_lot: int = 16,
+        rapports: bool = True,
+    ):
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.taille_lot = max(taille_lot, 1)
+        self.rapports = rapports
+        self._executeur: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executeur is None:
+            self._executeur = ProcessPoolExecutor(self.nb_processus)
+        return self._executeur
+
+    def _lots(self, projets) -> Iterator[Tuple[List[Tuple[Hashable, Union[bytes, str]]], List[ResultatProjet]]]:
+        # Les erreurs de sérialisation sont rendues comme résultats, sans
+        # interrompre le portefeuille
+        elements = projets.items() if isinstance(projets, Mapping) else enumerate(projets)
+        lot: List[Tuple[Hashable, Union[bytes, str]]] = []
+        echecs: List[ResultatProjet] = []
+        for cle, projet in elements:
+            try:
+                if isinstance(projet, (bytes, str)):
+                    # Instantané déjà sérialisé, ou fichier lu par le processus de calcul
+                    lot.append((cle, projet))
+                elif isinstance(projet, os.PathLike):
+                    lot.append((cle, os.fspath(projet)))
+                else:
+                    lot.append((cle, serialiser(projet)))
+            except Exception:
+                echecs.append(ResultatProjet(cle, erreur=traceback.format_exc()))
+            if len(lot) >= self.taille_lot:
+                yield lot, echecs
+                lot, echecs = [], []
+        if lot or echecs:
+            yield lot, echecs
+
+    def traiter(self, projets: Iterable) -> Iterator[ResultatProjet]:
+        # Résultats rendus dans l'ordre où ils se terminent. `projets` est un
+        # itérable (clé = position) ou un dictionnaire clé -> projet ; un
+        # projet peut aussi être donné par son instantané (octets ou chemin
+        # de fichier), ce qui évite de le sérialiser dans ce processus.
+        en_vol: Dict[Future, List[Tuple[Hashable, Union[bytes, str]]]] = {}
+        limite = 2 * self.nb_processus
+
+        def terminer(futurs) -> Iterator[ResultatProjet]:
+            for futur in futurs:
+                lot = en_vol.pop(futur)
+                try:
+                    yield from futur.result()
+                except BrokenProcessPool:
+                    # Un processus est mort (ex. manque de mémoire) : le lot est
+                    # perdu, le groupe de processus est recréé pour la suite
+                    self._executeur = None
+                    for cle, _ in lot:
+                        yield ResultatProjet(cle, erreur="Processus de calcul interrompu")
+                except Exception:
+                    erreur = traceback.format_exc()
+                    for cle, _ in lot:
+                        yield ResultatProjet(cle, erreur=erreur)
+
+        for lot, echecs in self._lots(projets):
+            yield from echecs
+            if not lot:
+                continue
+            while len(en_vol) >= limite:
+                faits, _ = wait(en_vol, return_when=FIRST_COMPLETED)
+                yield from terminer(faits)
+            try:
+                futur = self._pool().submit(_traiter_lot, lot, self.rapports)
+            except BrokenProcessPool:
+                self._executeur = None
+                futur = self._pool().submit(_traiter_lot, lot, self.rapports)
+            en_vol[futur] = lot
+        while en_vol:
+            faits, _ = wait(en_vol, return_when=FIRST_COMPLETED)
+            yield from terminer(faits)
+
+    def fermer(self) -> None:
+        if self._executeur is not None:
+            self._executeur.shutdown()
+            self._executeur = None
@@ -0,0 +1,301 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from calendrier import Calendrier
+from graphe_compact import GrapheCompact, _voisins
+from modeles import Impact, Risque
+
+LOIS = ("pert", "triangulaire")
+
+# Retard par défaut d'un risque, en fraction de la durée de la tâche touchée
+RETARDS_IMPACT = {Impact.FAIBLE: 0.1, Impact.MOYEN: 0.25, Impact.ELEVE: 0.5}
+
+# Éléments (échantillons x tâches) par lot : borne la mémoire de travail
+_ELEMENTS_PAR_LOT = 4_000_000
+
+# Au-delà de ce nombre de voisins, un noeud est réduit à part
+_SEUIL_DEGRE = 32
+
+# Résolution des tables de quantiles
+_POINTS_DENSITE = 16385
+_BITS_QUANTILES = 12
+_POINTS_QUANTILES = 1 << _BITS_QUANTILES
+
+
+def _plan_reduction(ptr: np.ndarray, idx: np.ndarray, noeuds: np.ndarray):
+    # Réduction des voisins de chaque noeud « par colonnes » : l'étape k
+    # combine le k-ième voisin de tous les noeuds qui en ont plus de k, soit
+    # des copies de lignes contiguës plutôt qu'un reduceat (lent sur l'axe
+    # 0). Les noeuds de très fort degré sont réduits un par un.
+    voisins, tailles = _voisins(ptr, idx, noeuds)
+    segments = np.cumsum(tailles) - tailles
+    avec = np.flatnonzero(tailles > 0)
+    petits = tailles <= _SEUIL_DEGRE
+    etapes = []
+    for k in range(1, int(tailles[petits].max(initial=0))):
+        lignes = np.flatnonzero(petits & (tailles > k))
+        etapes.append((lignes, voisins[segments[lignes] + k]))
+    gros = [
+        (int(i), voisins[segments[i]:segments[i] + tailles[i]])
+        for i in np.flatnonzero(~petits)
+    ]
+    return avec, voisins[segments[avec]], etapes, gros
+
+
+def _reduire(operation, valeurs: np.ndarray, source: np.ndarray, plan) -> None:
+    # valeurs[i] = operation(valeurs[i], source[voisins de i]) selon le plan
+    avec, premiers, etapes, gros = plan
+    if avec.size:
+        valeurs[avec] = operation(valeurs[avec], source[premiers])
+    for lignes, colonnes in etapes:
+        valeurs[lignes] = operation(valeurs[lignes], source[colonnes])
+    for i, voisins in gros:
+        valeurs[i] = operation(valeurs[i], operation.reduce(source[voisins], axis=0))
+
+
+class ResultatSimulation:
+    def __init__(
+        self,
+        durees: np.ndarray,
+        criticite: np.ndarray,
+        taches: Sequence,
+        origine,
+        calendrier: Optional[Calendrier] = None,
+    ):
+        # Durée du projet pour chaque scénario
+        self.durees = durees
+        # Fraction des scénarios où chaque tâche est critique
+        self.criticite = criticite
+        self.taches = taches
+        self.origine = origine
+        self.calendrier = calendrier
+
+    def percentile(self, p: float) -> float:
+        return float(np.percentile(self.durees, p))
+
+    def date_percentile(self, p: float) -> Optional[datetime]:
+        if self.origine is None:
+            return None
+        if self.calendrier is None:
+            return self.origine + timedelta(days=self.percentile(p))
+        # Un jour ouvré entamé compte en entier
+        return self.calendrier.decaler(self.origine, math.ceil(self.percentile(p)))
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p80(self) -> float:
+        return self.percentile(80)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    def indices_criticite(self) -> Dict:
+        return dict(zip(self.taches, self.criticite.tolist()))
+
+
+class Simulation:
+    # Monte-Carlo du planning : chaque scénario tire la durée des tâches dans
+    # leur loi (PERT ou triangulaire) et le déclenchement des risques, puis
+    # fait les passes CPM. Les scénarios sont traités par lots, sous forme
+    # d'une matrice échantillons x tâches, niveau topologique par niveau :
+    # une opération NumPy par niveau et par lot, pas une boucle Python par
+    # scénario.
+    def __init__(
+        self, taches: Iterable, graine: Optional[int] = None, calendrier: Optional[Calendrier] = None
+    ):
+        # Avec un calendrier, durées et retards sont en jours ouvrés
+        self.calendrier = calendrier
+        self.graphe = GrapheCompact.depuis_taches(list(taches), calendrier)
+        self.taches = self.graphe.taches
+        self._numeros = {tache: i for i, tache in enumerate(self.taches)}
+        n = len(self.taches)
+        fixes = self.graphe.durees.astype(np.float64)
+        self._optimiste = fixes.copy()
+        self._probable = fixes.copy()
+        self._pessimiste = fixes.copy()
+        self._loi = np.zeros(n, dtype=np.int8)
+        self._risques: List[tuple] = []
+        self._graines = np.random.SeedSequence(graine)
+
+    def distribution(
+        self, tache, optimiste: float, probable: float, pessimiste: float, loi: str = "pert"
+    ) -> None:
+        if loi not in LOIS:
+            raise ValueError(f"Loi inconnue: {loi} (attendu: {', '.join(LOIS)})")
+        if not optimiste <= probable <= pessimiste:
+            raise ValueError("Il faut optimiste <= probable <= pessimiste")
+        i = self._numeros[tache]
+        self._optimiste[i] = optimiste
+        self._probable[i] = probable
+        self._pessimiste[i] = pessimiste
+        self._loi[i] = LOIS.index(loi)
+
+    def risque(self, risque: Risque, taches: Iterable, retard: Optional[float] = None) -> None:
+        # Quand le risque survient (probabilité risque.probabilite, un seul
+        # tirage par scénario), chaque tâche touchée prend `retard` jours ;
+        # par défaut une fraction de sa durée selon l'impact.
+        numeros = np.array([self._numeros[tache] for tache in taches], dtype=np.int64)
+        if retard is None:
+            fraction = RETARDS_IMPACT.get(risque.impact, RETARDS_IMPACT[Impact.MOYEN])
+            retards = fraction * self._probable[numeros]
+        else:
+            retards = np.full(len(numeros), float(retard))
+        self._risques.append((risque.probabilite, numeros, retards))
+
+    def _preparer_tirages(self) -> None:
+        # Quantiles tabulés de chaque forme de loi, sur [0, 1] : le tirage
+        # devient une lecture dans une table à partir d'un uniforme, bien
+        # moins cher que numpy.beta. Les formes sont dédupliquées sur
+        # la position relative du mode, et les tâches regroupées par forme
+        # pour que chaque bloc de lignes lise une seule petite table.
+        a, m, b = self._optimiste, self._probable, self._pessimiste
+        variables = np.flatnonzero(b > a)
+        relatif = np.round((m - a)[variables] / (b - a)[variables], 3)
+        cles = relatif + 2 * self._loi[variables]
+        formes, numeros_formes = np.unique(cles, return_inverse=True)
+        tri = np.argsort(numeros_formes, kind="stable")
+        self._variables = variables = variables[tri]
+        self._en_ordre = variables.size > 0 and bool(np.array_equal(variables, np.arange(len(m))))
+        bornes = np.searchsorted(numeros_formes[tri], np.arange(len(formes) + 1))
+        grille = np.linspace(0, 1, _POINTS_DENSITE)
+        tables = np.empty((len(formes), _POINTS_QUANTILES), dtype=np.float32)
+        cibles = (np.arange(_POINTS_QUANTILES) + 0.5) / _POINTS_QUANTILES
+        for k, cle in enumerate(formes):
+            loi, mode = divmod(cle, 2)
+            if loi == 0:
+                # Bêta-PERT : alpha = 1 + 4 (m - a) / (b - a), beta = 1 + 4 (b - m) / (b - a)
+                densite = grille ** (4 * mode) * (1 - grille) ** (4 * (1 - mode))
+            else:
+                densite = np.where(
+                    grille <= mode,
+                    grille / max(mode, 1e-12),
+                    (1 - grille) / max(1 - mode, 1e-12),
+                )
+            repartition = np.concatenate(([0.0], np.cumsum((densite[1:] + densite[:-1]) / 2)))
+            repartition /= repartition[-1]
+            tables[k] = np.interp(cibles, repartition, grille)
+        self._blocs = [
+            (int(bornes[k]), int(bornes[k + 1]), tables[k]) for k in range(len(formes))
+        ]
+        self._minimums = a[variables].astype(np.float32)[:, None]
+        self._etendues = (b - a)[variables].astype(np.float32)[:, None]
+
+    def _tirer_durees(self, generateur: np.random.Generator, nb: int) -> np.ndarray:
+        # Matrice tâches x échantillons (une ligne contiguë par tâche)
+        variables = self._variables
+        n = len(self._probable)
+        if variables.size:
+            # Quantile au milieu de la case de l'uniforme : un seul accès à
+            # la table, l'erreur (1 / _POINTS_QUANTILES de l'étendue) reste
+            # très en deçà du bruit d'échantillonnage
+            rang = np.frombuffer(
+                generateur.bytes(2 * variables.size * nb), dtype=np.uint16
+            ).reshape(variables.size, nb) >> (16 - _BITS_QUANTILES)
+            quantile = np.empty((variables.size, nb), dtype=np.float32)
+            for debut, fin, table in self._blocs:
+                np.take(table, rang[debut:fin], out=quantile[debut:fin], mode="clip")
+            quantile *= self._etendues
+            quantile += self._minimums
+        if self._en_ordre:
+            durees = quantile
+        else:
+            durees = np.empty((n, nb), dtype=np.float32)
+            durees[:] = self._probable.astype(np.float32)[:, None]
+            if variables.size:
+                durees[variables] = quantile
+        for probabilite, numeros, retards in self._risques:
+            survenu = generateur.random(nb) < probabilite
+            if survenu.any():
+                durees[np.ix_(numeros, survenu)] += retards.astype(np.float32)[:, None]
+        return durees
+
+    def _structure(self):
+        # Pour chaque niveau, la réduction sur les prédécesseurs (passe
+        # avant) et sur les successeurs (passe arrière)
+        graphe = self.graphe
+        return [
+            (
+                niveau,
+                _plan_reduction(graphe.pred_ptr, graphe.pred_idx, niveau),
+                _plan_reduction(graphe.succ_ptr, graphe.succ_idx, niveau),
+            )
+            for niveau in graphe.niveaux()
+        ]
+
+    def _simuler_lot(self, generateur: np.random.Generator, nb: int, structure):
+        n = len(self.taches)
+        durees = self._tirer_durees(generateur, nb)
+
+        # Passe avant
+        fin_tot = np.empty((n, nb), dtype=np.float32)
+        for niveau, preds, _ in structure:
+            debut = np.zeros((len(niveau), nb), dtype=np.float32)
+            _reduire(np.maximum, debut, fin_tot, preds)
+            debut += durees[niveau]
+            fin_tot[niveau] = debut
+        duree_projet = fin_tot.max(axis=0) if n else np.zeros(nb, dtype=np.float32)
+
+        # Passe arrière : une tâche est critique quand sa fin au plus tard
+        # égale sa fin au plus tôt
+        debut_tard = np.empty((n, nb), dtype=np.float32)
+        for niveau, _, succs in reversed(structure):
+            fin_tard = np.empty((len(niveau), nb), dtype=np.float32)
+            fin_tard[:] = duree_projet
+            _reduire(np.minimum, fin_tard, debut_tard, succs)
+            fin_tard -= durees[niveau]
+            debut_tard[niveau] = fin_tard
+        debut_tard += durees
+        debut_tard -= fin_tot
+        critiques = debut_tard <= 1e-4 * np.maximum(duree_projet, 1)
+        return duree_projet, np.count_nonzero(critiques, axis=1)
+
+    def executer(
+        self,
+        nb_echantillons: int = 10_000,
+        taille_lot: Optional[int] = None,
+        nb_threads: Optional[int] = None,
+    ) -> ResultatSimulation:
+        # Les lots sont indépendants et NumPy relâche le GIL : ils tournent
+        # sur plusieurs threads. Chaque lot a son propre générateur, dérivé
+        # de la graine et du numéro du lot : le résultat ne dépend ni du
+        # nombre de threads ni des exécutions précédentes.
+        n = len(self.taches)
+        if taille_lot is None:
+            taille_lot = max(1, _ELEMENTS_PAR_LOT // max(n, 1))
+        structure = self._structure()
+        self._preparer_tirages()
+        premiers = range(0, nb_echantillons, taille_lot)
+        generateurs = [
+            np.random.default_rng(np.random.SeedSequence(self._graines.entropy, spawn_key=(k,)))
+            for k in range(len(premiers))
+        ]
+
+        durees_projet = np.empty(nb_echantillons, dtype=np.float64)
+        nb_critiques = np.zeros(n, dtype=np.int64)
+        with ThreadPoolExecutor(nb_threads or os.cpu_count() or 1) as executeur:
+            lots = executeur.map(
+                lambda k: self._simuler_lot(
+                    generateurs[k], min(taille_lot, nb_echantillons - premiers[k]), structure
+                ),
+                range(len(premiers)),
+            )
+            for premier, (duree_projet, critiques) in zip(premiers, lots):
+                durees_projet[premier:premier + len(duree_projet)] = duree_projet
+                nb_critiques += critiques
+
+        return ResultatSimulation(
+            durees_projet,
+            nb_critiques / max(nb_echantillons, 1),
+            self.taches,
+            self.graphe.origine,
+            self.calendrier,
+        )
@@ -0,0 +1,154 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from datetime import timedelta
+
+from aide_tests import DEBUT, creer_tache
+from cache import CacheLRU
+from main import Projet
+from modeles import Jalon, Membre, Risque
+
+
+def sortie_de(fonction, *args):
+    sortie = io.StringIO()
+    with redirect_stdout(sortie):
+        fonction(*args)
+    return sortie.getvalue()
+
+
+class TestCacheLRU(unittest.TestCase):
+    def test_version_et_eviction(self):
+        cache = CacheLRU(capacite=2)
+        appels = []
+
+        def calculer(valeur):
+            appels.append(valeur)
+            return valeur
+
+        self.assertEqual(cache.obtenir("a", 1, lambda: calculer("a1")), "a1")
+        self.assertEqual(cache.obtenir("a", 1, lambda: calculer("a1bis")), "a1")
+        self.assertEqual(cache.obtenir("a", 2, lambda: calculer("a2")), "a2")
+        cache.obtenir("b", 1, lambda: calculer("b1"))
+        # "a" vient d'être lu : c'est "b", le moins récent, qui est évincé
+        cache.obtenir("a", 2, lambda: calculer("a2bis"))
+        cache.obtenir("c", 1, lambda: calculer("c1"))
+        self.assertEqual(len(cache), 2)
+        cache.obtenir("b", 1, lambda: calculer("b1bis"))
+        self.assertEqual(appels, ["a1", "a2", "b1", "c1", "b1bis"])
+        self.assertEqual(cache.statistiques()["succes"], 2)
+
+
+class TestCacheProjet(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane", "Développeur")
+        self.projet = Projet("P", "", DEBUT, DEBUT + timedelta(days=365))
+        self.projet.cache = CacheLRU()
+        self.a = creer_tache("A", 3, self.membre)
+        self.b = creer_tache("B", 5, self.membre)
+        self.b.ajouter_dependance(self.a)
+        self.projet.ajouter_tache(self.a)
+        self.projet.ajouter_tache(self.b)
+        self.calculs = 0
+        calculer = self.projet._calculer_chemin_critique
+
+        def compter(vectorise):
+            self.calculs += 1
+            return calculer(vectorise)
+
+        self.projet._calculer_chemin_critique = compter
+
+    def test_chemin_critique_memorise(self):
+        premier = sortie_de(self.projet.calculer_chemin_critique)
+        second = sortie_de(self.projet.calculer_chemin_critique)
+        self.assertEqual(premier, second)
+        self.assertEqual(self.calculs, 1)
+        self.assertEqual(self.projet.chemin_critique, [self.a, self.b])
+
+        # Les mutations hors planning n'invalident pas le chemin critique
+        self.projet.ajouter_risque(Risque("R", 0.5, "Impact élevé"))
+        self.projet.definir_budget(1000)
+        self.b.mettre_a_jour_statut("En cours")
+        sortie_de(self.projet.calculer_chemin_critique)
+        self.assertEqual(self.calculs, 1)
+
+        self.a.date_fin = DEBUT + timedelta(days=10)
+        sortie = sortie_de(self.projet.calculer_chemin_critique)
+        self.assertEqual(self.calculs, 2)
+        self.assertIn("B (début : 10, fin : 15)", sortie)
+
+    def test_moteurs_distincts(self):
+        sortie_de(self.projet.calculer_chemin_critique)
+        sortie_de(self.projet.calculer_chemin_critique, True)
+        self.assertEqual(self.calculs, 2)
+        sortie_de(self.projet.calculer_chemin_critique, True)
+        sortie_de(self.projet.calculer_chemin_critique)
+        self.assertEqual(self.calculs, 2)
+
+    def test_dependance_hors_projet(self):
+        # C et D ne sont pas dans le projet mais repoussent A
+        c = creer_tache("C", 2, self.membre)
+        d = creer_tache("D", 1, self.membre)
+        c.ajouter_dependance(d)
+        self.a.ajouter_dependance(c)
+        self.assertIn("A (début : 3, fin : 6)", sortie_de(self.projet.calculer_chemin_critique))
+
+        d.date_fin = DEBUT + timedelta(days=4)
+        self.assertIn("A (début : 6, fin : 9)", sortie_de(self.projet.calculer_chemin_critique))
+        e = creer_tache("E", 5, self.membre)
+        d.ajouter_dependance(e)
+        self.assertIn("A (début : 11, fin : 14)", sortie_de(self.projet.calculer_chemin_critique))
+        e.date_fin = DEBUT + timedelta(days=6)
+        self.assertIn("A (début : 12, fin : 15)", sortie_de(self.projet.calculer_chemin_critique))
+        calculs = self.calculs
+        e.mettre_a_jour_statut("Terminée")
+        sortie_de(self.projet.calculer_chemin_critique)
+        self.assertEqual(self.calculs, calculs)
+
+    def test_rapport_invalide_par_section(self):
+        rapport = "".join(self.projet.flux_rapport_performance())
+        self.assertEqual("".join(self.projet.flux_rapport_performance()), rapport)
+        echecs = self.projet.cache.echecs
+
+        self.b.mettre_a_jour_statut("Terminée")
+        rapport = "".join(self.projet.flux_rapport_performance())
+        self.assertIn("- B: Terminée", rapport)
+        # Seule la section des tâches a été reconstruite
+        self.assertEqual(self.projet.cache.echecs, echecs + 1)
+
+        self.projet.ajouter_jalon(Jalon("J1", DEBUT))
+        self.projet.enregistrer_changement("Portée")
+        rapport = "".join(self.projet.flux_rapport_performance())
+        self.assertIn("- J1: 2024-01-01 00:00:00\n", rapport)
+        self.assertIn("Version: 2\n", rapport)
+        self.assertIn("- Portée: Version 1", rapport)
+
+    def test_modification_directe(self):
+        risque = Risque("Retard", 0.3, "Moyen")
+        jalon = Jalon("J1", DEBUT)
+        self.projet.ajouter_risque(risque)
+        self.projet.ajouter_jalon(jalon)
+        "".join(self.projet.flux_rapport_performance())
+        sortie_de(self.projet.calculer_chemin_critique)
+
+        risque.probabilite = 0.8
+        jalon.nom = "Lancement"
+        self.b.nom = "B2"
+        self.b.responsable = Membre("Mouhamed Koné", "Designer")
+        rapport = "".join(self.projet.flux_rapport_performance())
+        self.assertIn("- Retard: Probabilité 0.8", rapport)
+        self.assertIn("- Lancement: 2024-01-01", rapport)
+        self.assertIn("- B2: Non commencée", rapport)
+        self.assertIn("Responsable: Mouhamed Koné", rapport)
+        self.assertIn("B2 (début", sortie_de(self.projet.calculer_chemin_critique))
+
+    def test_projets_distincts(self):
+        autre = Projet("Q", "", DEBUT, DEBUT + timedelta(days=365))
+        autre.cache = self.projet.cache
+        self.assertNotEqual(
+            "".join(autre.flux_rapport_performance()),
+            "".join(self.projet.flux_rapport_performance()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+
+from calendrier import Calendrier
+from chemin_critique import CheminCritiqueIncremental, calculer_cpm
+from main import Projet
+from modeles import Membre, Tache
+from nivellement import niveler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FERIE = date(2024, 5, 1)
+LUNDI = datetime(2024, 4, 29)
+
+
+def compter(debut, fin):
+    # Référence naïve : un jour à la fois
+    jours = 0
+    while debut < fin:
+        if debut.weekday() < 5 and debut != FERIE:
+            jours += 1
+        debut += timedelta(days=1)
+    return jours
+
+
+class TestCalendrier(unittest.TestCase):
+    def setUp(self):
+        self.calendrier = Calendrier(feries=[FERIE])
+
+    def test_jours_ouvres_et_decalage(self):
+        generateur = random.Random(3)
+        for _ in range(500):
+            debut = date(2024, 1, 1) + timedelta(days=generateur.randint(-2000, 2000))
+            fin = debut + timedelta(days=generateur.randint(0, 400))
+            jours = self.calendrier.jours_ouvres_entre(debut, fin)
+            self.assertEqual(jours, compter(debut, fin))
+            self.assertEqual(self.calendrier.jours_ouvres_entre(fin, debut), -jours)
+            self.assertEqual(
+                self.calendrier.jours_ouvres_entre(debut, self.calendrier.decaler(debut, jours)),
+                jours,
+            )
+
+    def test_decaler_saute_week_end_et_feries(self):
+        # Lundi 29 avril + 3 jours ouvrés : lundi, mardi, jeudi (1er mai férié)
+        self.assertEqual(self.calendrier.decaler(LUNDI, 3), datetime(2024, 5, 3))
+        self.assertEqual(self.calendrier.decaler(LUNDI, 5), datetime(2024, 5, 7))
+
+    def test_rangs_stables(self):
+        rang = self.calendrier.rang(date(2024, 6, 3))
+        # Étend la plage loin dans le passé puis dans le futur
+        self.calendrier.rang(date(1990, 1, 1))
+        self.calendrier.rang(date(2060, 1, 1))
+        self.assertEqual(self.calendrier.rang(date(2024, 6, 3)), rang)
+        self.assertEqual(self.calendrier.jour_ouvre(rang), date(2024, 6, 3))
+
+
+class TestPlanningOuvre(unittest.TestCase):
+    def setUp(self):
+        self.calendrier = Calendrier(feries=[FERIE])
+        membre = Membre("Ousmane", "Développeur")
+        # A : lundi -> lundi suivant (5 jours ouvrés, dont 1 férié => 4)
+        self.a = Tache("A", "", LUNDI, LUNDI + timedelta(days=7), membre, "Non commencée")
+        self.b = Tache("B", "", LUNDI, LUNDI + timedelta(days=2), membre, "Non commencée")
+        self.b.ajouter_dependance(self.a)
+        self.taches = [self.a, self.b]
+
+    def test_cpm_en_jours_ouvres(self):
+        resultat = calculer_cpm(self.taches, self.calendrier)
+        self.assertEqual(resultat.fin_tot[self.a], 4)
+        self.assertEqual(resultat.duree, 6)
+
+        planning = CheminCritiqueIncremental()
+        for tache in self.taches:
+            planning.ajouter(tache)
+        self.assertEqual(planning.duree_projet(), 9)
+        planning.definir_calendrier(self.calendrier)
+        self.assertEqual(planning.duree_projet(), 6)
+        self.b.date_fin = LUNDI + timedelta(days=7)
+        self.assertEqual(planning.duree_projet(), 8)
+
+    @unittest.skipIf(numpy is None, "NumPy absent")
+    def test_cpm_vectorise_identique(self):
+        from graphe_compact import GrapheCompact
+
+        graphe = GrapheCompact.depuis_taches(self.taches, self.calendrier)
+        self.assertEqual(graphe.calculer_cpm().duree, calculer_cpm(self.taches, self.calendrier).duree)
+
+    def test_nivellement_et_rapport(self):
+        planning = niveler(self.taches, calendrier=self.calendrier)
+        self.assertEqual(planning.date_debut(self.b), datetime(2024, 5, 6))
+        self.assertEqual(planning.date_fin_projet, datetime(2024, 5, 8))
+
+        projet = Projet("P", "", LUNDI, LUNDI + timedelta(days=30))
+        for tache in self.taches:
+            projet.ajouter_tache(tache)
+        rapport = "".join(projet.flux_rapport_performance())
+        projet.definir_calendrier(self.calendrier)
+        with redirect_stdout(io.StringIO()):
+            projet.calculer_chemin_critique()
+        self.assertEqual(self.b.early_start, 4)
+        nouveau = "".join(projet.flux_rapport_performance())
+        self.assertNotEqual(rapport, nouveau)
+        self.assertIn("Durée: 4 jours ouvrés)", nouveau)
+        self.assertIn("Calendrier: 5 jours ouvrés par semaine, 1 jours fériés", nouveau)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+import random
+import time
+import unittest
+from datetime import timedelta
+from aide_tests import DEBUT, creer_tache
+from chemin_critique import (
+    CheminCritiqueIncremental,
+    CycleDependancesError,
+    calculer_cpm,
+    ordre_topologique,
+)
+from gestion_projet import Membre
+
+
+class TestCheminCritique(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def test_losange(self):
+        a = creer_tache("A", 3, self.membre)
+        b = creer_tache("B", 5, self.membre)
+        c = creer_tache("C", 2, self.membre)
+        d = creer_tache("D", 4, self.membre)
+        b.ajouter_dependance(a)
+        c.ajouter_dependance(a)
+        d.ajouter_dependance(b)
+        d.ajouter_dependance(c)
+
+        resultat = calculer_cpm([d, c, b, a])
+
+        self.assertEqual(resultat.duree, 12)
+        self.assertEqual(resultat.chemin_critique, [a, b, d])
+        self.assertEqual(resultat.debut_tot[c], 3)
+        self.assertEqual(resultat.fin_tot[c], 5)
+        self.assertEqual(resultat.debut_tard[c], 6)
+        self.assertEqual(resultat.fin_tard[c], 8)
+        self.assertEqual(resultat.marge[c], 3)
+        self.assertTrue(resultat.est_critique(b))
+        self.assertFalse(resultat.est_critique(c))
+
+    def test_dependance_hors_liste(self):
+        a = creer_tache("A", 3, self.membre)
+        b = creer_tache("B", 5, self.membre)
+        b.ajouter_dependance(a)
+        self.assertEqual(ordre_topologique([b]), [a, b])
+
+    def test_cycle(self):
+        a = creer_tache("A", 1, self.membre)
+        b = creer_tache("B", 1, self.membre)
+        c = creer_tache("C", 1, self.membre)
+        b.ajouter_dependance(a)
+        c.ajouter_dependance(b)
+        a.ajouter_dependance(c)
+        with self.assertRaises(CycleDependancesError) as erreur:
+            calculer_cpm([a, b, c])
+        self.assertEqual(len(erreur.exception.cycle), 4)
+        self.assertIs(erreur.exception.cycle[0], erreur.exception.cycle[-1])
+
+    def test_projet_vide(self):
+        resultat = calculer_cpm([])
+        self.assertEqual(resultat.duree, 0)
+        self.assertEqual(resultat.chemin_critique, [])
+
+    def test_grand_losange(self):
+        # 100 000 tâches en couches de losanges : l'ancienne énumération des
+        # chemins ne terminait jamais sur ce graphe.
+        taches = [creer_tache("T0", 1, self.membre)]
+        while len(taches) < 100_000:
+            precedente = taches[-1]
+            gauche = creer_tache(f"G{len(taches)}", 2, self.membre)
+            droite = creer_tache(f"D{len(taches)}", 1, self.membre)
+            jonction = creer_tache(f"J{len(taches)}", 1, self.membre)
+            gauche.ajouter_dependance(precedente)
+            droite.ajouter_dependance(precedente)
+            jonction.ajouter_dependance(gauche)
+            jonction.ajouter_dependance(droite)
+            taches.extend([gauche, droite, jonction])
+
+        debut = time.perf_counter()
+        resultat = calculer_cpm(taches)
+        ecoule = time.perf_counter() - debut
+
+        self.assertLess(ecoule, 1.0)
+        self.assertEqual(resultat.duree, 1 + 3 * (len(taches) - 1) // 3)
+        self.assertEqual(len(resultat.chemin_critique), 1 + 2 * (len(taches) - 1) // 3)
+
+
+class TestCheminCritiqueIncremental(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def verifier_identique(self, planning, taches):
+        attendu = calculer_cpm(taches)
+        self.assertEqual(planning.duree_projet(), attendu.duree)
+        for tache in taches:
+            self.assertEqual(planning.debut_tot(tache), attendu.debut_tot[tache])
+            self.assertEqual(planning.fin_tard(tache), attendu.fin_tard[tache])
+            self.assertEqual(planning.marge(tache), attendu.marge[tache])
+        chemin = planning.chemin_critique()
+        self.assertTrue(all(attendu.est_critique(tache) for tache in chemin))
+        self.assertEqual(
+            sum((t.date_fin - t.date_debut).days for t in chemin), attendu.duree
+        )
+
+    def test_modifications_aleatoires(self):
+        aleatoire = random.Random(11)
+        planning = CheminCritiqueIncremental()
+        taches = []
+        for i in range(300):
+            tache = creer_tache(f"T{i}", aleatoire.randint(1, 10), self.membre)
+            for dep in aleatoire.sample(taches, min(len(taches), 2)):
+                tache.ajouter_dependance(dep)
+            taches.append(tache)
+            planning.ajouter(tache)
+        self.verifier_identique(planning, taches)
+
+        for _ in range(200):
+            tache = aleatoire.choice(taches)
+            if aleatoire.random() < 0.5:
+                tache.date_fin = tache.date_debut + timedelta(days=aleatoire.randint(1, 30))
+            else:
+                rang = taches.index(tache)
+                if rang:
+                    tache.ajouter_dependance(taches[aleatoire.randrange(rang)])
+            self.verifier_identique(planning, taches)
+
+    def test_tache_finale_raccourcie(self):
+        a = creer_tache("A", 10, self.membre)
+        b = creer_tache("B", 5, self.membre)
+        planning = CheminCritiqueIncremental()
+        planning.ajouter(a)
+        planning.ajouter(b)
+        self.assertEqual(planning.chemin_critique(), [a])
+        a.date_fin = a.date_debut + timedelta(days=1)
+        self.assertEqual(planning.duree_projet(), 5)
+        self.assertEqual(planning.chemin_critique(), [b])
+        self.verifier_identique(planning, [a, b])
+
+        # Même cas par un changement de calendrier : A passe de 7 jours
+        # calendaires à 3 jours ouvrés (deux fériés), B reste à 5
+        from calendrier import Calendrier
+        b.modifier_dates(DEBUT + timedelta(days=7), DEBUT + timedelta(days=12))
+        a.modifier_dates(DEBUT, DEBUT + timedelta(days=7))
+        self.assertEqual(planning.chemin_critique(), [a])
+        feries = [DEBUT.date() + timedelta(days=1), DEBUT.date() + timedelta(days=2)]
+        planning.definir_calendrier(Calendrier(feries=feries))
+        self.assertEqual(planning.chemin_critique(), [b])
+        self.assertEqual(planning.duree_projet(), 5)
+
+    def test_raccourcissements_aleatoires(self):
+        # Petit graphe, durées qui montent et descendent : la tâche finale
+        # est souvent celle qui change
+        aleatoire = random.Random(4)
+        planning = CheminCritiqueIncremental()
+        taches = []
+        for i in range(12):
+            tache = creer_tache(f"T{i}", aleatoire.randint(1, 10), self.membre)
+            for dep in aleatoire.sample(taches, min(len(taches), aleatoire.randint(0, 1))):
+                tache.ajouter_dependance(dep)
+            taches.append(tache)
+            planning.ajouter(tache)
+        for _ in range(300):
+            tache = aleatoire.choice(taches)
+            tache.date_fin = tache.date_debut + timedelta(days=aleatoire.randint(0, 20))
+            self.verifier_identique(planning, taches)
+
+    def test_cycle_introduit(self):
+        a = creer_tache("A", 1, self.membre)
+        b = creer_tache("B", 1, self.membre)
+        b.ajouter_dependance(a)
+        planning = CheminCritiqueIncremental()
+        planning.ajouter(b)
+        self.assertEqual(planning.chemin_critique(), [a, b])
+        # L'arête est refusée sur-le-champ et le planning reste valide
+        with self.assertRaises(CycleDependancesError) as erreur:
+            a.ajouter_dependance(b)
+        self.assertEqual(erreur.exception.cycle, [b, a, b])
+        self.assertEqual(a.dependances, ())
+        self.assertEqual(planning.chemin_critique(), [a, b])
+
+
+class TestOrdreDynamique(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def verifier_ordre(self, planning, taches):
+        rang = {tache: i for i, tache in enumerate(planning.ordre())}
+        self.assertEqual(len(rang), len(taches))
+        for tache in taches:
+            for dep in tache.dependances:
+                self.assertLess(rang[dep], rang[tache])
+
+    @staticmethod
+    def depend_de(tache, cible) -> bool:
+        # Référence : parcours complet des dépendances
+        pile, vues = [tache], set()
+        while pile:
+            courante = pile.pop()
+            if courante is cible:
+                return True
+            for dep in courante.dependances:
+                if dep not in vues:
+                    vues.add(dep)
+                    pile.append(dep)
+        return False
+
+    def test_aretes_aleatoires(self):
+        aleatoire = random.Random(7)
+        taches = [creer_tache(f"T{i}", 1 + i % 4, self.membre) for i in range(60)]
+        planning = CheminCritiqueIncremental()
+        for tache in taches:
+            planning.ajouter(tache)
+        refusees = 0
+        for _ in range(400):
+            tache, dep = aleatoire.sample(taches, 2)
+            if dep in tache.dependances:
+                continue
+            attendu = self.depend_de(dep, tache)
+            try:
+                tache.ajouter_dependance(dep)
+            except CycleDependancesError as erreur:
+                self.assertTrue(attendu)
+                cycle = erreur.cycle
+                self.assertIs(cycle[0], cycle[-1])
+                for precedente, suivante in zip(cycle, cycle[1:]):
+                    self.assertTrue(
+                        precedente in suivante.dependances
+                        or (precedente is dep and suivante is tache)
+                    )
+                refusees += 1
+            else:
+                self.assertFalse(attendu)
+            self.verifier_ordre(planning, taches)
+        self.assertGreater(refusees, 0)
+        self.assertEqual(calculer_cpm(planning.ordre(), ordonnees=True).duree, calculer_cpm(taches).duree)
+
+    def test_cycle_par_tache_non_suivie(self):
+        a = creer_tache("A", 1, self.membre)
+        planning = CheminCritiqueIncremental()
+        planning.ajouter(a)
+        x = creer_tache("X", 1, self.membre)
+        y = creer_tache("Y", 1, self.membre)
+        y.ajouter_dependance(a)
+        x.ajouter_dependance(y)
+        with self.assertRaises(CycleDependancesError) as erreur:
+            a.ajouter_dependance(x)
+        self.assertEqual(erreur.exception.cycle, [a, y, x, a])
+        self.assertNotIn(x, planning)
+
+        b = creer_tache("B", 2, self.membre)
+        a.ajouter_dependance(b)
+        self.assertEqual(planning.ordre(), [b, a])
+
+
+if __name__ == "__main__":
+    unittest.main()
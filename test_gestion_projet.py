@@ -1,5 +1,10 @@
+import io
+import tracemalloc
 import unittest
+from contextlib import redirect_stdout
 from datetime import datetime
+from calendrier import Calendrier
+from chemin_critique import CycleDependancesError
 from gestion_projet import (
     Projet,
     Membre,
@@ -11,6 +16,7 @@ from gestion_projet import (
     SMSNotificationStrategy,
     PushNotificationStrategy,
 )
+from journal import TACHE_AJOUTEE
 
 
 class TestProjet(unittest.TestCase):
@@ -65,6 +71,32 @@ class TestProjet(unittest.TestCase):
         rapport = self.projet.generer_rapport_performance()
         self.assertIn("Rapport d'activité du projet", rapport)
 
+    def test_ecrire_rapport_performance(self):
+        self.projet.definir_budget(700000)
+        fichier = io.StringIO()
+        self.projet.ecrire_rapport_performance(fichier)
+        self.assertEqual(fichier.getvalue(), self.projet.generer_rapport_performance())
+        self.assertIn("- Budget défini: 700000 Unité Monétaire\n", fichier.getvalue())
+
+    def test_flux_rapport_memoire_bornee(self):
+        class Compteur:
+            taille = 0
+
+            def writelines(self, lignes):
+                for ligne in lignes:
+                    self.taille += len(ligne)
+
+        # Le journal déverse sur disque : la lecture reste bornée elle aussi
+        for i in range(100_000):
+            self.projet.activites.enregistrer(TACHE_AJOUTEE, f"Tâche {i}")
+        compteur = Compteur()
+        tracemalloc.start()
+        self.projet.ecrire_rapport_performance(compteur)
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertGreater(compteur.taille, 2_000_000)
+        self.assertLess(pic, 2_000_000)
+
     def test_set_notification_strategy(self):
         self.projet.set_notification_strategy(SMSNotificationStrategy())
         self.assertIsInstance(
@@ -108,6 +140,85 @@ class TestProjet(unittest.TestCase):
         chemin_critique = self.projet.calculer_chemin_critique()
         self.assertEqual(chemin_critique, ["Tâche 1", "Tâche 2", "Tâche 3"])
 
+    def test_calculer_chemin_critique_apres_modification(self):
+        tache1 = Tache(
+            "Tâche 1",
+            "Description de la tâche 1",
+            datetime(2024, 2, 1),
+            datetime(2024, 3, 1),
+            self.membre1,
+            "Non commencée",
+        )
+        tache2 = Tache(
+            "Tâche 2",
+            "Description de la tâche 2",
+            datetime(2024, 2, 1),
+            datetime(2024, 2, 10),
+            self.membre2,
+            "Non commencée",
+        )
+        self.projet.ajouter_tache(tache1)
+        self.projet.ajouter_tache(tache2)
+        self.assertEqual(self.projet.calculer_chemin_critique(), ["Tâche 1"])
+        tache2.date_fin = datetime(2024, 4, 1)
+        self.assertEqual(self.projet.calculer_chemin_critique(), ["Tâche 2"])
+        tache1.ajouter_dependance(tache2)
+        self.assertEqual(
+            self.projet.calculer_chemin_critique(), ["Tâche 2", "Tâche 1"]
+        )
+
+    def test_chemin_critique_vectorise(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy n'est pas installé")
+        # Le moteur NumPy suit le même calendrier que le planning
+        self.projet.definir_calendrier(Calendrier())
+        tache1 = Tache("Tâche 1", "", datetime(2024, 1, 5), datetime(2024, 1, 9), self.membre1, "Non commencée")
+        tache2 = Tache("Tâche 2", "", datetime(2024, 1, 5), datetime(2024, 1, 7), self.membre2, "Non commencée")
+        tache3 = Tache("Tâche 3", "", datetime(2024, 1, 9), datetime(2024, 1, 11), self.membre3, "Non commencée")
+        tache3.ajouter_dependance(tache1)
+        tache3.ajouter_dependance(tache2)
+        for tache in (tache1, tache2, tache3):
+            self.projet.ajouter_tache(tache)
+        sorties = []
+        for vectorise in (False, True):
+            sortie = io.StringIO()
+            with redirect_stdout(sortie):
+                chemin = self.projet.calculer_chemin_critique(vectorise=vectorise)
+            self.assertEqual(chemin, ["Tâche 1", "Tâche 3"])
+            sorties.append(sortie.getvalue())
+        self.assertEqual(sorties[1], sorties[0])
+        self.assertIn("avec une durée de 4 jours", sorties[0])
+
+    def test_cycle_refuse_sans_planning(self):
+        taches = [
+            Tache(nom, "", datetime(2024, 2, 1), datetime(2024, 2, 5), self.membre1, "Non commencée")
+            for nom in ("A", "B", "C")
+        ]
+        a, b, c = taches
+        for tache in taches:
+            self.projet.ajouter_tache(tache)
+        b.ajouter_dependance(a)
+        c.ajouter_dependance(b)
+        with self.assertRaises(CycleDependancesError) as erreur:
+            a.ajouter_dependance(c)
+        self.assertEqual(erreur.exception.cycle, [a, b, c, a])
+        self.assertEqual(a.dependances, ())
+        with self.assertRaises(CycleDependancesError):
+            a.ajouter_dependance(a)
+        # Le planning, resté à construire, n'a rien vu passer
+        self.assertIsNone(self.projet._planning)
+
+        # Tâches importées
+        self.projet.importer_taches(
+            io.StringIO("nom,date_debut,date_fin,dependances\nD,2024-02-05,2024-02-08,C\n"), "csv"
+        )
+        d = self.projet.trouver_tache("D")
+        with self.assertRaises(CycleDependancesError):
+            a.ajouter_dependance(d)
+        self.assertEqual(self.projet.calculer_chemin_critique(), ["A", "B", "C", "D"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+import random
+import time
+import unittest
+from aide_tests import creer_reseau
+from chemin_critique import CycleDependancesError, calculer_cpm
+from gestion_projet import Membre
+
+try:
+    import numpy as np
+    from graphe_compact import GrapheCompact
+except ImportError:  # NumPy est optionnel
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy n'est pas installé")
+class TestGrapheCompact(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def test_identique_au_moteur_objet(self):
+        taches = creer_reseau(500, 7, self.membre, decalage_max=30, duree_max=20)
+        random.Random(7).shuffle(taches)
+        attendu = calculer_cpm(taches)
+        graphe = GrapheCompact.depuis_taches(taches)
+        resultat = graphe.calculer_cpm()
+
+        self.assertEqual(graphe.durees.dtype, np.int32)
+        self.assertEqual(graphe.debuts.dtype, np.int64)
+        self.assertEqual(resultat.duree, attendu.duree)
+        for i, tache in enumerate(graphe.taches):
+            self.assertEqual(resultat.debut_tot[i], attendu.debut_tot[tache])
+            self.assertEqual(resultat.fin_tard[i], attendu.fin_tard[tache])
+            self.assertEqual(resultat.marge[i], attendu.marge[tache])
+        chemin = graphe.chemin_critique(resultat)
+        self.assertTrue(all(attendu.est_critique(tache) for tache in chemin))
+        self.assertEqual(
+            sum((t.date_fin - t.date_debut).days for t in chemin), attendu.duree
+        )
+
+    def test_cycle(self):
+        graphe = GrapheCompact(np.ones(3), [0, 1, 2], [1, 2, 0])
+        with self.assertRaises(CycleDependancesError) as erreur:
+            graphe.niveaux()
+        self.assertEqual(erreur.exception.cycle[0], erreur.exception.cycle[-1])
+        self.assertEqual(len(erreur.exception.cycle), 4)
+
+    def test_million_de_taches(self):
+        # 1 000 niveaux de 1 000 tâches, deux dépendances vers le niveau précédent
+        largeur, hauteur = 1000, 1000
+        n = largeur * hauteur
+        generateur = np.random.default_rng(3)
+        durees = generateur.integers(1, 10, n, dtype=np.int32)
+        cibles = np.repeat(np.arange(largeur, n), 2)
+        sources = (cibles // largeur - 1) * largeur + generateur.integers(
+            0, largeur, cibles.size
+        )
+
+        debut = time.perf_counter()
+        graphe = GrapheCompact(durees, sources, cibles)
+        resultat = graphe.calculer_cpm()
+        ecoule = time.perf_counter() - debut
+
+        self.assertLess(ecoule, 10.0)
+        self.assertEqual(len(graphe.niveaux()), hauteur)
+        self.assertTrue((resultat.marge >= 0).all())
+        self.assertEqual(len(resultat.chemin_critique), hauteur)
+        self.assertEqual(int(durees[resultat.chemin_critique].sum()), resultat.duree)
+
+
+if __name__ == "__main__":
+    unittest.main()
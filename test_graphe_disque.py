@@ -0,0 +1,132 @@
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta
+
+from chemin_critique import CycleDependancesError, calculer_cpm
+from gestion_projet import Membre, Tache
+
+try:
+    import numpy as np
+    from graphe_compact import GrapheCompact
+    from graphe_disque import ARETE, RESULTAT, TACHE, GrapheDisque
+except ImportError:  # NumPy est optionnel
+    np = None
+
+
+DEBUT = datetime(2024, 1, 1)
+
+
+@unittest.skipIf(np is None, "NumPy n'est pas installé")
+class TestGrapheDisque(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+
+    def chemin(self, nom: str) -> str:
+        return os.path.join(self.dossier.name, nom)
+
+    def ecrire(self, durees, sources, cibles):
+        np.asarray(durees, dtype=TACHE["duree"]).tofile(self.chemin("taches.bin"))
+        aretes = np.empty(len(sources), dtype=ARETE)
+        aretes["source"] = sources
+        aretes["cible"] = cibles
+        aretes.tofile(self.chemin("aretes.bin"))
+
+    def test_identique_au_moteur_objet(self):
+        aleatoire = random.Random(7)
+        membre = Membre("Ousmane Mbathie", "Manager")
+        taches = []
+        for i in range(500):
+            debut = DEBUT + timedelta(days=aleatoire.randint(0, 30))
+            tache = Tache(
+                f"T{i}", "", debut, debut + timedelta(days=aleatoire.randint(1, 20)),
+                membre, "Non commencée",
+            )
+            for dep in aleatoire.sample(taches, min(len(taches), aleatoire.randint(0, 3))):
+                tache.ajouter_dependance(dep)
+            taches.append(tache)
+        # Une tâche qui attend toutes les autres : plus d'arêtes qu'un bloc
+        fin = Tache("Fin", "", DEBUT, DEBUT + timedelta(days=1), membre, "Non commencée")
+        for tache in taches:
+            fin.ajouter_dependance(tache)
+        taches.append(fin)
+        aleatoire.shuffle(taches)
+        attendu = calculer_cpm(taches)
+
+        # Blocs de 16 éléments : des centaines de vagues et de paquets
+        graphe, ordre = GrapheDisque.depuis_taches(taches, self.dossier.name, memoire=16 * 128)
+        resultat = graphe.calculer_cpm(self.chemin("resultat.bin"))
+
+        self.assertEqual(graphe.bloc, 16)
+        self.assertEqual(resultat.duree, attendu.duree)
+        for i, tache in enumerate(ordre):
+            self.assertEqual(resultat.debut_tot[i], attendu.debut_tot[tache])
+            self.assertEqual(resultat.fin_tot[i], attendu.fin_tot[tache])
+            self.assertEqual(resultat.debut_tard[i], attendu.debut_tard[tache])
+            self.assertEqual(resultat.fin_tard[i], attendu.fin_tard[tache])
+            self.assertEqual(resultat.marge[i], attendu.marge[tache])
+        chemin = [ordre[i] for i in resultat.chemin_critique]
+        self.assertTrue(all(attendu.est_critique(tache) for tache in chemin))
+        self.assertEqual(chemin[-1], fin)
+        self.assertEqual(sum((t.date_fin - t.date_debut).days for t in chemin), attendu.duree)
+
+        # Le fichier de sortie se relit sans le moteur
+        relu = np.fromfile(self.chemin("resultat.bin"), dtype=RESULTAT)
+        self.assertTrue((relu["marge"] == resultat.marge).all())
+
+    def test_cycle(self):
+        self.ecrire([1, 1, 1, 1], [0, 1, 2, 3], [1, 2, 3, 1])
+        graphe = GrapheDisque(self.chemin("taches.bin"), self.chemin("aretes.bin"))
+        with self.assertRaises(CycleDependancesError) as erreur:
+            graphe.calculer_cpm(self.chemin("resultat.bin"))
+        cycle = erreur.exception.cycle
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(sorted(cycle[:-1]), [1, 2, 3])
+
+    def test_arete_invalide(self):
+        self.ecrire([1, 1], [0], [5])
+        graphe = GrapheDisque(self.chemin("taches.bin"), self.chemin("aretes.bin"))
+        with self.assertRaisesRegex(ValueError, "tâche inexistante"):
+            graphe.calculer_cpm(self.chemin("resultat.bin"))
+
+    def test_graphe_plus_grand_que_la_memoire(self):
+        # 400 niveaux de 500 tâches, deux dépendances vers le niveau précédent
+        largeur, hauteur = 500, 400
+        n = largeur * hauteur
+        plafond = 1024 * 1024
+        generateur = np.random.default_rng(3)
+        durees = generateur.integers(1, 10, n, dtype=np.int32)
+        cibles = np.repeat(np.arange(largeur, n), 2)
+        sources = (cibles // largeur - 1) * largeur + generateur.integers(0, largeur, cibles.size)
+        self.ecrire(durees, sources, cibles)
+        attendu = GrapheCompact(durees, sources, cibles).calculer_cpm()
+        taille = os.path.getsize(self.chemin("taches.bin")) + os.path.getsize(self.chemin("aretes.bin"))
+        self.assertGreater(taille, 3 * plafond)
+
+        tracemalloc.start()
+        try:
+            graphe = GrapheDisque(
+                self.chemin("taches.bin"), self.chemin("aretes.bin"),
+                memoire=plafond, dossier_travail=self.dossier.name,
+            )
+            resultat = graphe.calculer_cpm(self.chemin("resultat.bin"))
+            _, pic = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Les projections ne passent pas par l'allocateur : seul le travail
+        # par blocs est compté, et le chemin critique rendu
+        self.assertLess(pic, plafond)
+        self.assertEqual(resultat.duree, attendu.duree)
+        self.assertTrue((resultat.debut_tot == attendu.debut_tot).all())
+        self.assertTrue((resultat.fin_tard == attendu.fin_tard).all())
+        self.assertTrue((resultat.marge == attendu.marge).all())
+        self.assertEqual(len(resultat.chemin_critique), hauteur)
+        self.assertEqual(int(durees[resultat.chemin_critique].sum()), resultat.duree)
+
+
+if __name__ == "__main__":
+    unittest.main()
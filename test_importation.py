@@ -0,0 +1,127 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import gestion_projet
+from chemin_critique import CycleDependancesError
+from importation import ErreurImportation, lire_taches
+from journal import MEMBRE_AJOUTE, TACHE_AJOUTEE
+from main import Projet
+from modeles import Membre
+from notifications import NotificationStrategy
+
+CSV = """nom,description,date_debut,date_fin,responsable,statut,dependances
+Tests,,2024-01-20,2024-01-25,Oumar,,Développement
+Développement,Code,2024-01-05,2024-01-20,Ousmane,En cours,Analyse
+Analyse,,2024-01-01,2024-01-05,Ousmane,,
+Recette,,2024-01-25,2024-01-30,,,Tests;Développement
+"""
+
+JSONL = """{"nom": "A", "date_debut": "2024-01-01", "date_fin": "2024-01-03", "dependances": ["B"]}
+
+{"nom": "B", "date_debut": "2024-01-01", "date_fin": "2024-01-02"}
+"""
+
+
+class Collecteur(NotificationStrategy):
+    def __init__(self):
+        self.messages = []
+
+    def envoyer(self, message, destinataire):
+        self.messages.append((message, destinataire))
+
+
+class TestLecture(unittest.TestCase):
+    def test_references_en_avant(self):
+        taches = lire_taches(io.StringIO(CSV), "csv")
+        tests, developpement, analyse, recette = taches
+        self.assertEqual([t.nom for t in taches], ["Tests", "Développement", "Analyse", "Recette"])
+        self.assertEqual(tests.dependances, (developpement,))
+        self.assertEqual(developpement.dependances, (analyse,))
+        self.assertEqual(recette.dependances, (tests, developpement))
+        self.assertEqual(developpement.statut, "En cours")
+        self.assertIs(developpement.responsable, analyse.responsable)
+        self.assertIsNone(recette.responsable)
+
+    def test_jsonl_depuis_fichier(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "plan.jsonl")
+            with open(chemin, "w", encoding="utf-8") as fichier:
+                fichier.write(JSONL)
+            a, b = lire_taches(chemin)
+        self.assertEqual(a.dependances, (b,))
+        self.assertEqual(b.date_fin, datetime(2024, 1, 2))
+
+    def test_erreurs(self):
+        with self.assertRaises(CycleDependancesError):
+            lire_taches(io.StringIO(
+                "nom,date_debut,date_fin,dependances\n"
+                "A,2024-01-01,2024-01-02,B\n"
+                "B,2024-01-01,2024-01-02,A\n"
+            ), "csv")
+        with self.assertRaisesRegex(ErreurImportation, "Ligne 2: dépendance inconnue: Z"):
+            lire_taches(io.StringIO("nom,date_debut,date_fin,dependances\nA,2024-01-01,2024-01-02,Z\n"), "csv")
+        with self.assertRaisesRegex(ErreurImportation, "Ligne 3: tâche en double"):
+            lire_taches(io.StringIO("nom,date_debut,date_fin\nA,2024-01-01,2024-01-02\nA,2024-01-01,2024-01-02\n"), "csv")
+        with self.assertRaisesRegex(ErreurImportation, "date invalide"):
+            lire_taches(io.StringIO("nom,date_debut,date_fin\nA,hier,2024-01-02\n"), "csv")
+
+
+class TestImportProjet(unittest.TestCase):
+    def test_main_une_notification(self):
+        projet = Projet("P", "", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        collecteur = Collecteur()
+        projet.set_notification_strategy(collecteur)
+        ousmane = Membre("Ousmane", "Développeur")
+        projet.ajouter_membre_equipe(ousmane)
+        collecteur.messages.clear()
+
+        self.assertEqual(projet.importer_taches(io.StringIO(CSV), "csv"), 4)
+        # Oumar, responsable inconnu jusque-là, a rejoint l'équipe
+        oumar = projet.trouver_tache("Tests").responsable
+        self.assertEqual(projet.equipe.obtenir_membres(), [ousmane, oumar])
+        self.assertEqual(
+            collecteur.messages,
+            [("4 tâches importées", "Ousmane"), ("4 tâches importées", "Oumar")],
+        )
+        self.assertIs(projet.trouver_tache("Analyse").responsable, ousmane)
+        self.assertEqual(projet.planning.duree_projet(), 29)
+
+        # Les noms déjà présents dans le projet sont résolus
+        projet.importer_taches(io.StringIO("nom,date_debut,date_fin,dependances\nBilan,2024-01-30,2024-02-01,Recette\n"), "csv")
+        self.assertEqual(projet.planning.duree_projet(), 31)
+
+        # Un nom déjà pris dans le projet est refusé
+        with self.assertRaisesRegex(ErreurImportation, "Ligne 2: tâche déjà présente dans le projet: Analyse"):
+            projet.importer_taches(io.StringIO("nom,date_debut,date_fin\nAnalyse,2024-03-01,2024-03-02\n"), "csv")
+        self.assertEqual(len(projet.taches), 5)
+
+    def test_gestion_projet_un_lot(self):
+        projet = gestion_projet.Projet("P", "", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        collecteur = Collecteur()
+        projet.set_notification_strategy(collecteur)
+        projet.ajouter_membre_equipe("Ousmane")
+        collecteur.messages.clear()
+        codes = []
+        projet.observateurs.append(lambda code, objet: codes.append(code))
+
+        projet.importer_taches(io.StringIO(CSV), "csv")
+        # Oumar, responsable inconnu jusque-là, a rejoint l'équipe
+        self.assertEqual(projet.equipe, ["Ousmane", "Oumar"])
+        self.assertEqual(codes, [MEMBRE_AJOUTE] + [TACHE_AJOUTEE] * 4)
+        self.assertEqual(
+            collecteur.messages,
+            [("4 tâches importées", "Ousmane"), ("4 tâches importées", "Oumar")],
+        )
+        self.assertEqual(projet.calculer_planning().duree, 29)
+
+        # Un second import reprend les responsables déjà connus
+        projet.importer_taches(io.StringIO("nom,date_debut,date_fin,responsable\nBilan,2024-01-30,2024-02-01,Oumar\n"), "csv")
+        self.assertIs(projet.trouver_tache("Bilan").responsable, projet.trouver_tache("Tests").responsable)
+        self.assertEqual(projet.equipe, ["Ousmane", "Oumar"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from gestion_projet import Jalon, Membre, Projet, Tache
+
+
+DEBUT = datetime(2024, 1, 1)
+
+
+class TestIndexProjet(unittest.TestCase):
+    def setUp(self):
+        self.projet = Projet("FRAISEN", "", DEBUT, datetime(2024, 12, 31))
+        self.membres = [
+            Membre("Ousmane Mbathie", "Manager"),
+            Membre("Oumar boune Khatabe Thiam", "Développeur"),
+            Membre("Mouhamed Koné", "Designer"),
+        ]
+        aleatoire = random.Random(5)
+        self.aleatoire = aleatoire
+        for i in range(500):
+            debut = DEBUT + timedelta(days=aleatoire.randint(0, 300))
+            self.projet.ajouter_tache(
+                Tache(
+                    f"Tâche {i}",
+                    "",
+                    debut,
+                    debut + timedelta(days=aleatoire.randint(1, 40)),
+                    aleatoire.choice(self.membres),
+                    aleatoire.choice(["Non commencée", "En cours", "Terminée"]),
+                )
+            )
+
+    def actives_attendues(self, debut, fin):
+        return {
+            t for t in self.projet.taches if t.date_debut <= fin and t.date_fin >= debut
+        }
+
+    def test_nom_responsable_statut(self):
+        self.assertIs(self.projet.trouver_tache("Tâche 42"), self.projet.taches[42])
+        self.assertIsNone(self.projet.trouver_tache("Inconnue"))
+        membre = self.membres[1]
+        self.assertEqual(
+            set(self.projet.taches_de(membre)),
+            {t for t in self.projet.taches if t.responsable is membre},
+        )
+        tache = self.projet.taches[0]
+        tache.mettre_a_jour_statut("Bloquée")
+        self.assertEqual(self.projet.taches_par_statut("Bloquée"), [tache])
+        self.assertEqual(
+            set(self.projet.taches_par_statut("En cours")),
+            {t for t in self.projet.taches if t.statut == "En cours"},
+        )
+
+    def test_taches_actives(self):
+        for _ in range(50):
+            debut = DEBUT + timedelta(days=self.aleatoire.randint(0, 350))
+            fin = debut + timedelta(days=self.aleatoire.randint(0, 20))
+            actives = self.projet.taches_actives(debut, fin)
+            self.assertEqual(len(actives), len(set(actives)))
+            self.assertEqual(set(actives), self.actives_attendues(debut, fin))
+
+            # Les modifications de dates sont reprises par l'index
+            tache = self.aleatoire.choice(self.projet.taches)
+            tache.date_fin = tache.date_debut + timedelta(days=self.aleatoire.randint(1, 90))
+
+    def test_jalons_entre(self):
+        jalons = [Jalon(f"Jalon {i}", DEBUT + timedelta(days=30 * (i % 6))) for i in range(12)]
+        for jalon in jalons:
+            self.projet.ajouter_jalon(jalon)
+        trouves = self.projet.jalons_entre(datetime(2024, 1, 31), datetime(2024, 3, 1))
+        self.assertEqual(
+            trouves, [jalons[1], jalons[7], jalons[2], jalons[8]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
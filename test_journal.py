@@ -0,0 +1,78 @@
+import gc
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from gestion_projet import Projet
+from journal import (
+    BUDGET_DEFINI,
+    MEMBRE_AJOUTE,
+    TACHE_AJOUTEE,
+    JournalActivites,
+)
+
+
+class TestJournalActivites(unittest.TestCase):
+    def test_formatage_a_la_lecture(self):
+        journal = JournalActivites()
+        journal.enregistrer(MEMBRE_AJOUTE, "Ousmane Mbathie")
+        journal.enregistrer(BUDGET_DEFINI, 700000)
+        self.assertEqual(
+            list(journal),
+            ["Membre ajouté: Ousmane Mbathie", "Budget défini: 700000 Unité Monétaire"],
+        )
+        self.assertEqual(next(journal.evenements()).code, MEMBRE_AJOUTE)
+
+    def test_deversement_sur_disque(self):
+        journal = JournalActivites(capacite=100)
+        for i in range(1000):
+            journal.enregistrer(TACHE_AJOUTEE, f"Tâche {i}")
+        self.assertEqual(len(journal), 1000)
+        self.assertLess(len(journal._memoire), 100)
+        self.assertEqual(
+            list(journal), [f"Tâche ajoutée: Tâche {i}" for i in range(1000)]
+        )
+        journal.fermer()
+
+    def test_fichier_ferme_avec_le_projet(self):
+        projet = Projet("P", "", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        projet.activites = JournalActivites(capacite=10)
+        for i in range(25):
+            projet.ajouter_risque(f"Risque {i}")
+        fichier = projet.activites._fichier
+        self.assertFalse(fichier.closed)
+        del projet
+        gc.collect()
+        self.assertTrue(fichier.closed)
+
+    def test_parcours_pendant_ajouts(self):
+        journal = JournalActivites(capacite=10)
+        for i in range(25):
+            journal.enregistrer(TACHE_AJOUTEE, i)
+        parcours = iter(journal)
+        premier = next(parcours)
+        for i in range(25, 60):
+            journal.enregistrer(TACHE_AJOUTEE, i)
+        lus = [premier] + list(parcours)
+        self.assertEqual(lus, [f"Tâche ajoutée: {i}" for i in range(25)])
+        self.assertEqual(len(list(journal)), 60)
+
+    def test_fichier_persistant(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "activites.journal")
+            journal = JournalActivites(capacite=4, chemin=chemin)
+            for i in range(9):
+                journal.enregistrer(MEMBRE_AJOUTE, f"Membre {i}")
+            journal.fermer()
+
+            repris = JournalActivites(capacite=4, chemin=chemin)
+            self.assertEqual(len(repris), 9)
+            repris.enregistrer(MEMBRE_AJOUTE, "Membre 9")
+            self.assertEqual(
+                list(repris), [f"Membre ajouté: Membre {i}" for i in range(10)]
+            )
+            repris.fermer()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import main
+from gestion_projet import Jalon, Membre, Projet, Risque, Tache
+from persistance import ecrire_instantane
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestDemarrage(unittest.TestCase):
+    def test_import_sans_effet_de_bord(self):
+        # Ni affichage, ni dépendance lourde chargée à l'import
+        code = (
+            "import sys, main, gestion_projet\n"
+            "lourds = {'argparse', 'numpy', 'persistance', 'graphe_compact', 'graphe_disque', 'tempfile'}\n"
+            "print(sorted(lourds & set(sys.modules)), end='')\n"
+        )
+        sortie = subprocess.run(
+            [sys.executable, "-c", code], cwd=RACINE, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(sortie.stdout, "[]")
+
+    def test_budget_import(self):
+        sortie = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main, gestion_projet"],
+            cwd=RACINE,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cumuls = {}
+        for ligne in sortie.stderr.splitlines():
+            colonnes = ligne.split("|")
+            if len(colonnes) == 3 and colonnes[1].strip().isdigit():
+                cumuls[colonnes[2].strip()] = int(colonnes[1]) / 1000
+        # Budget large : la machine de test peut être lente
+        self.assertLess(cumuls["main"] + cumuls["gestion_projet"], 250)
+
+
+class TestLigneDeCommande(unittest.TestCase):
+    def setUp(self):
+        projet = Projet("CLI", "Projet de test", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        membre = Membre("Ousmane", "Développeur")
+        projet.equipe.append("Ousmane")
+        a = Tache("A", "", datetime(2024, 1, 1), datetime(2024, 1, 4), membre, "En cours")
+        b = Tache("B", "", datetime(2024, 1, 4), datetime(2024, 1, 6), membre, "En cours")
+        c = Tache("C", "", datetime(2024, 1, 4), datetime(2024, 1, 5), membre, "En cours")
+        b.ajouter_dependance(a)
+        c.ajouter_dependance(a)
+        projet.taches.extend([a, b, c])
+        projet.ajouter_risque(Risque("Retard fournisseur", 0.3, "Moyen"))
+        projet.ajouter_jalon(Jalon("Recette", datetime(2024, 2, 1)))
+        projet.enregistrer_changement("Portée élargie", 2)
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = os.path.join(self.dossier.name, "projet.bin")
+        ecrire_instantane(projet, self.chemin)
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def executer(self, *arguments) -> str:
+        sortie = io.StringIO()
+        with redirect_stdout(sortie):
+            self.assertEqual(main.main(list(arguments)), 0)
+        return sortie.getvalue()
+
+    def test_chemin_critique(self):
+        self.assertIn("A -> B avec une durée de 5 jours", self.executer("chemin-critique", self.chemin))
+
+    def test_chemin_critique_vectorise(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy n'est pas installé")
+        self.assertEqual(
+            self.executer("chemin-critique", self.chemin, "--vectorise"),
+            self.executer("chemin-critique", self.chemin),
+        )
+
+    def test_chemin_critique_disque(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy n'est pas installé")
+        taches = os.path.join(self.dossier.name, "taches.bin")
+        aretes = os.path.join(self.dossier.name, "aretes.bin")
+        np.array([3, 2, 1], dtype="<i4").tofile(taches)
+        np.array([0, 1, 0, 2], dtype="<u4").tofile(aretes)
+        sortie = self.executer(
+            "chemin-critique-disque", taches, aretes,
+            "-o", os.path.join(self.dossier.name, "temps.bin"), "--memoire", "1",
+        )
+        self.assertEqual(sortie, "Chemin critique: 0 -> 1 avec une durée de 5 jours\n")
+
+    def test_rapport_dans_un_fichier(self):
+        cible = os.path.join(self.dossier.name, "rapport.txt")
+        self.assertEqual(self.executer("rapport", self.chemin, "-o", cible), "")
+        with open(cible, encoding="utf-8") as fichier:
+            self.assertTrue(fichier.readline().startswith("Rapport d'activité du projet 'CLI'"))
+            rapport = fichier.read()
+        # Le journal n'est pas sauvegardé : le contenu vient de l'instantané
+        for ligne in (
+            "- Ousmane\n",
+            "- B: En cours (Début: 2024-01-04 00:00:00, Fin: 2024-01-06 00:00:00, Responsable: Ousmane)\n",
+            "- Retard fournisseur: Probabilité 0.3, Impact Moyen\n",
+            "- Recette: 2024-02-01 00:00:00\n",
+            "- Portée élargie (version 2)\n",
+        ):
+            self.assertIn(ligne, rapport)
+
+    def test_notifier(self):
+        sortie = self.executer("notifier", self.chemin, "Livraison", "--canal", "push")
+        self.assertEqual(sortie, "Notification envoyée à Ousmane par push notification: Livraison\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
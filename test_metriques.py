@@ -0,0 +1,111 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import metriques
+from gestion_projet import Projet, Membre, Tache, SMSNotificationStrategy
+from metriques import ProfileurEchantillonnage, Registre
+
+DEBUT = datetime(2024, 1, 1)
+
+
+class TestMetriques(unittest.TestCase):
+    def setUp(self):
+        self.original = Projet.ajouter_tache
+        self.registre = metriques.activer(Registre())
+        self.projet = Projet("Mesuré", "", DEBUT, DEBUT + timedelta(days=90))
+        self.membre = Membre("Ousmane", "Développeur")
+
+    def tearDown(self):
+        metriques.desactiver()
+
+    def peupler(self):
+        with redirect_stdout(io.StringIO()):
+            for nom in ("Ousmane", "Oumar", "Mouhamed"):
+                self.projet.ajouter_membre_equipe(nom)
+            precedente = None
+            for i in range(4):
+                tache = Tache(f"T{i}", "", DEBUT, DEBUT + timedelta(days=2), self.membre, "En cours")
+                if precedente is not None:
+                    tache.ajouter_dependance(precedente)
+                self.projet.ajouter_tache(tache)
+                precedente = tache
+            self.projet.calculer_chemin_critique()
+
+    def test_mutations_et_notifications(self):
+        self.peupler()
+        mesures = self.registre.instantane()["mesures"]
+        self.assertEqual(mesures["projet.ajouter_tache.secondes"]["nombre"], 4)
+        # Chaque tâche notifie les trois membres
+        self.assertEqual(mesures["projet.ajouter_tache.envois"]["somme"], 12)
+        self.assertEqual(mesures["projet.ajouter_tache.envois"]["max"], 3)
+        self.assertEqual(mesures["projet.ajouter_membre_equipe.envois"]["somme"], 1 + 2 + 3)
+        self.assertEqual(mesures["notifications.envoyer.EmailNotificationStrategy.secondes"]["nombre"], 18)
+        self.assertEqual(mesures["projet.calculer_chemin_critique.secondes"]["nombre"], 1)
+        self.assertEqual(mesures["cpm.incremental.secondes"]["nombre"], 1)
+
+    def test_envois_asynchrones_attribues_a_la_mutation(self):
+        self.projet.set_notification_strategy(SMSNotificationStrategy())
+        distributeur = self.projet.activer_notifications_asynchrones()
+        with redirect_stdout(io.StringIO()):
+            self.projet.ajouter_membre_equipe("Ousmane")
+            self.projet.ajouter_membre_equipe("Oumar")
+            distributeur.close()
+        mesures = self.registre.instantane()["mesures"]
+        self.assertEqual(mesures["projet.ajouter_membre_equipe.envois"]["somme"], 3)
+        self.assertEqual(mesures["notifications.envoyer.SMSNotificationStrategy.secondes"]["nombre"], 3)
+
+    def test_taille_du_rapport(self):
+        self.peupler()
+        rapport = self.projet.generer_rapport_performance()
+        mesure = self.registre.instantane()["mesures"]["projet.rapport.taille"]
+        self.assertEqual(mesure["somme"], len(rapport))
+
+    def test_exports(self):
+        self.peupler()
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_json = os.path.join(dossier, "metriques.json")
+            chemin_prometheus = os.path.join(dossier, "metriques.prom")
+            self.registre.exporter_json(chemin_json)
+            self.registre.exporter_prometheus(chemin_prometheus)
+            with open(chemin_json, encoding="utf-8") as fichier:
+                self.assertIn("projet.ajouter_tache.secondes", json.load(fichier)["mesures"])
+            with open(chemin_prometheus, encoding="utf-8") as fichier:
+                texte = fichier.read()
+        self.assertIn("# TYPE projet_ajouter_tache_secondes summary\n", texte)
+        self.assertIn("projet_ajouter_tache_secondes_count 4\n", texte)
+
+    def test_desactiver_remet_les_methodes_d_origine(self):
+        self.assertIsNot(Projet.ajouter_tache, self.original)
+        metriques.desactiver()
+        self.assertIs(Projet.ajouter_tache, self.original)
+        self.assertFalse(metriques.est_actif())
+
+
+class TestProfileur(unittest.TestCase):
+    def test_echantillons(self):
+        arret = threading.Event()
+
+        def occupe():
+            while not arret.is_set():
+                sum(range(1000))
+
+        thread = threading.Thread(target=occupe)
+        thread.start()
+        profileur = ProfileurEchantillonnage(intervalle=0.001).demarrer()
+        time.sleep(0.1)
+        piles = profileur.arreter()
+        arret.set()
+        thread.join()
+        self.assertTrue(any("occupe" in pile for pile in piles))
+        self.assertTrue(profileur.fonctions_chaudes(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
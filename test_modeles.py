@@ -0,0 +1,71 @@
+import unittest
+
+from aide_tests import creer_tache
+from modeles import Impact, Membre, Risque, Role, Statut
+
+
+class TestModeles(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def test_valeurs_internees(self):
+        statut = "".join(["Non ", "commencée"])
+        tache1 = creer_tache("Tâche 1", 14, self.membre, statut=statut)
+        tache2 = creer_tache("Tâche 2", 14, self.membre)
+        self.assertIs(tache1.statut, tache2.statut)
+        self.assertIs(tache1.statut, Statut.NON_COMMENCEE)
+        self.assertEqual(tache1.statut, "Non commencée")
+        self.assertIs(self.membre.role, Role.MANAGER)
+        self.assertIs(Risque("Retard", 0.3, "Moyen").impact, Impact.MOYEN)
+        self.assertIsNot(Statut("Moyen"), Impact("Moyen"))
+
+        tache1.mettre_a_jour_statut("En cours")
+        self.assertIs(tache1.statut, Statut.EN_COURS)
+
+    def test_objets_sans_dictionnaire(self):
+        tache = creer_tache("Tâche 1", 14, self.membre)
+        self.assertFalse(hasattr(tache, "__dict__"))
+        self.assertFalse(hasattr(self.membre, "__dict__"))
+        with self.assertRaises(AttributeError):
+            tache.attribut_inconnu = 1
+        tache.early_start = 0
+        self.assertEqual(tache.early_start, 0)
+
+    def test_dependances_compactes(self):
+        tache1 = creer_tache("Tâche 1", 14, self.membre)
+        tache2 = creer_tache("Tâche 2", 14, self.membre)
+        self.assertEqual(tache2.dependances, ())
+        tache2.ajouter_dependance(tache1)
+        self.assertEqual(tache2.dependances, (tache1,))
+
+    def test_nombreuses_dependances(self):
+        # Fort nombre de prédécesseurs : ajouts en temps amorti constant,
+        # vue en lecture seule comparable à un tuple
+        fin = creer_tache("Fin", 14, self.membre)
+        taches = [creer_tache(f"Tâche {i}", 14, self.membre) for i in range(20_000)]
+        vus = []
+        fin.ajouter_observateur(lambda tache, attribut: vus.append(attribut))
+        for tache in taches:
+            fin.ajouter_dependance(tache)
+        self.assertEqual(fin.dependances, tuple(taches))
+        self.assertIs(fin.dependances[-1], taches[-1])
+        self.assertEqual(fin.dependances[-2:], tuple(taches[-2:]))
+        self.assertNotIsInstance(fin.dependances, list)
+        with self.assertRaises(TypeError):
+            fin.dependances[0] = fin
+        self.assertEqual(len(vus), 2 * len(taches))
+
+        def refuser(tache, attribut):
+            if attribut == "dependance_proposee":
+                raise ValueError("refusée")
+
+        fin.ajouter_observateur(refuser)
+        refusee = creer_tache("Refusée", 14, self.membre)
+        with self.assertRaises(ValueError):
+            fin.ajouter_dependance(refusee)
+        self.assertNotIn(refusee, fin.dependances)
+        self.assertEqual(len(fin.dependances), len(taches))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import random
+import time
+import unittest
+from datetime import timedelta
+
+from aide_tests import DEBUT, creer_tache
+from chemin_critique import calculer_cpm
+from main import Projet
+from modeles import Membre
+from nivellement import niveler
+
+
+class TestNivellement(unittest.TestCase):
+    def setUp(self):
+        self.ousmane = Membre("Ousmane", "Développeur")
+        self.oumar = Membre("Oumar", "Testeur")
+
+    def verifier_faisable(self, taches, planning):
+        for tache in taches:
+            for dep in tache.dependances:
+                self.assertGreaterEqual(planning.debut[tache], planning.fin[dep])
+        par_membre = {}
+        for tache in taches:
+            if tache.responsable is None:
+                continue
+            par_membre.setdefault(tache.responsable, []).append(
+                (planning.debut[tache], planning.fin[tache])
+            )
+        for intervalles in par_membre.values():
+            intervalles.sort()
+            for (_, fin), (debut, _) in zip(intervalles, intervalles[1:]):
+                self.assertLessEqual(fin, debut)
+
+    def test_taches_paralleles_du_meme_responsable(self):
+        # A (5 j) et B (2 j) ne dépendent de rien mais sont à la même personne ;
+        # C suit A : A est critique et passe en premier
+        a = creer_tache("A", 5, self.ousmane)
+        b = creer_tache("B", 2, self.ousmane)
+        c = creer_tache("C", 3, self.oumar)
+        c.ajouter_dependance(a)
+        planning = niveler([a, b, c])
+
+        self.assertEqual(planning.debut[a], 0)
+        self.assertEqual(planning.debut[b], 5)
+        self.assertEqual(planning.debut[c], 5)
+        self.assertEqual(planning.duree, 8)
+        self.assertEqual(planning.date_fin_projet, DEBUT + timedelta(days=8))
+
+    def test_sans_conflit_identique_au_chemin_critique(self):
+        a = creer_tache("A", 2, self.ousmane)
+        b = creer_tache("B", 4, self.oumar)
+        b.ajouter_dependance(a)
+        planning = niveler([a, b])
+        cpm = calculer_cpm([a, b])
+        self.assertEqual(planning.duree, cpm.duree)
+        self.assertEqual(planning.debut, cpm.debut_tot)
+
+    def test_graphe_aleatoire_faisable(self):
+        aleatoire = random.Random(3)
+        membres = [Membre(f"M{i}", "Développeur") for i in range(15)]
+        taches = []
+        for i in range(2000):
+            tache = creer_tache(f"T{i}", aleatoire.randint(0, 6), aleatoire.choice(membres + [None]))
+            for dep in aleatoire.sample(taches[-30:], min(len(taches), aleatoire.randint(0, 3))):
+                tache.ajouter_dependance(dep)
+            taches.append(tache)
+        for priorite in ("debut_tard", "marge"):
+            planning = niveler(taches, priorite)
+            self.assertEqual(len(planning.ordre), len(taches))
+            self.assertGreaterEqual(planning.duree, calculer_cpm(taches).duree)
+            self.verifier_faisable(taches, planning)
+
+    def test_appliquer(self):
+        a = creer_tache("A", 3, self.ousmane)
+        b = creer_tache("B", 1, self.ousmane)
+        niveler([a, b]).appliquer()
+        self.assertEqual((b.date_debut, b.date_fin), (DEBUT + timedelta(days=3), DEBUT + timedelta(days=4)))
+
+    def test_projet(self):
+        projet = Projet("Nivellement", "", DEBUT, DEBUT + timedelta(days=30))
+        projet.ajouter_membre_equipe(self.ousmane)
+        for nom in ("A", "B", "C"):
+            projet.ajouter_tache(creer_tache(nom, 2, self.ousmane))
+        planning = projet.niveler_ressources()
+        self.assertEqual(sorted(planning.debut.values()), [0, 2, 4])
+        self.assertEqual(planning.date_fin_projet, DEBUT + timedelta(days=6))
+
+    def test_priorite_inconnue(self):
+        with self.assertRaises(ValueError):
+            niveler([], priorite="hasard")
+
+    def test_100k_taches(self):
+        aleatoire = random.Random(5)
+        membres = [Membre(f"M{i}", "Développeur") for i in range(1000)]
+        taches = []
+        for i in range(100_000):
+            tache = creer_tache(f"T{i}", aleatoire.randint(1, 5), membres[aleatoire.randrange(1000)])
+            if i:
+                tache.ajouter_dependance(taches[aleatoire.randrange(max(0, i - 500), i)])
+            taches.append(tache)
+        debut = time.perf_counter()
+        planning = niveler(taches)
+        self.assertLess(time.perf_counter() - debut, 3.0)
+        self.assertEqual(len(planning.ordre), len(taches))
+
+
+if __name__ == "__main__":
+    unittest.main()
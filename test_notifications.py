@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+import unittest
+from datetime import datetime
+from gestion_projet import Projet
+from notifications import (
+    DistributeurAsynchrone,
+    NotificationContext,
+    NotificationStrategy,
+)
+
+
+class StrategieLente(NotificationStrategy):
+    def __init__(self, delai: float = 0.05):
+        self.delai = delai
+        self.recus = []
+        self.en_cours = 0
+        self.en_cours_max = 0
+        self._verrou = threading.Lock()
+
+    def envoyer(self, message: str, destinataire: str) -> None:
+        with self._verrou:
+            self.en_cours += 1
+            self.en_cours_max = max(self.en_cours_max, self.en_cours)
+        time.sleep(self.delai)
+        with self._verrou:
+            self.en_cours -= 1
+            self.recus.append((destinataire, message))
+
+
+class StrategieComptage(NotificationStrategy):
+    def __init__(self):
+        self.recus = []
+
+    def envoyer(self, message: str, destinataire: str) -> None:
+        self.recus.append((destinataire, message))
+
+
+class StrategieGroupee(StrategieComptage):
+    def __init__(self):
+        super().__init__()
+        self.groupes = []
+
+    def envoyer_groupe(self, message: str, destinataires) -> None:
+        self.groupes.append((tuple(destinataires), message))
+
+
+class StrategieDefaillante(NotificationStrategy):
+    def envoyer(self, message: str, destinataire: str) -> None:
+        raise ConnectionError("canal indisponible")
+
+
+class TestDistributeurAsynchrone(unittest.TestCase):
+    def test_mutation_non_bloquante(self):
+        projet = Projet("FRAISEN", "", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        strategie = StrategieLente()
+        projet.set_notification_strategy(strategie)
+        distributeur = projet.activer_notifications_asynchrones(
+            DistributeurAsynchrone(nb_workers=8, concurrence_par_strategie=8)
+        )
+        projet.equipe.extend(f"Membre {i}" for i in range(20))
+
+        debut = time.perf_counter()
+        projet.definir_budget(700000)
+        self.assertLess(time.perf_counter() - debut, strategie.delai)
+
+        projet.notification_context.flush()
+        self.assertEqual(len(strategie.recus), 20)
+        statistiques = distributeur.statistiques()
+        self.assertEqual(statistiques["envoyes"], 20)
+        self.assertEqual(statistiques["profondeur"], 0)
+        self.assertGreater(statistiques["latence_max"], 0)
+        distributeur.close()
+
+    def test_concurrence_par_strategie(self):
+        distributeur = DistributeurAsynchrone(nb_workers=6, concurrence_par_strategie=2)
+        strategie = StrategieLente(0.02)
+        contexte = NotificationContext(strategie, distributeur)
+        contexte.notifier("Message", [f"Membre {i}" for i in range(12)])
+        contexte.close()
+        self.assertEqual(len(strategie.recus), 12)
+        self.assertLessEqual(strategie.en_cours_max, 2)
+
+    def test_contre_pression(self):
+        distributeur = DistributeurAsynchrone(nb_workers=1, taille_file=1)
+        strategie = StrategieLente(0.2)
+        distributeur.soumettre(strategie, "1", "A")
+        time.sleep(0.05)
+        distributeur.soumettre(strategie, "2", "B")
+        with self.assertRaises(queue.Full):
+            distributeur.soumettre(strategie, "3", "C", timeout=0.01)
+        distributeur.close()
+        self.assertEqual(distributeur.statistiques()["envoyes"], 2)
+        with self.assertRaises(RuntimeError):
+            distributeur.soumettre(strategie, "4", "D")
+
+    def test_envoi_groupe_en_file(self):
+        distributeur = DistributeurAsynchrone(nb_workers=2)
+        strategie = StrategieGroupee()
+        contexte = NotificationContext(strategie, distributeur)
+        contexte.notifier("Message", ["A", "B", "C"])
+        contexte.close()
+        self.assertEqual(strategie.groupes, [(("A", "B", "C"), "Message")])
+        self.assertEqual(strategie.recus, [])
+        self.assertEqual(distributeur.statistiques()["envoyes"], 3)
+
+    def test_echecs_isoles(self):
+        distributeur = DistributeurAsynchrone(nb_workers=2)
+        contexte = NotificationContext(StrategieDefaillante(), distributeur)
+        contexte.notifier("Message", ["A", "B", "C"])
+        contexte.close()
+        self.assertEqual(distributeur.statistiques()["echecs"], 3)
+
+
+class TestRegroupement(unittest.TestCase):
+    def test_recapitulatif_par_destinataire(self):
+        strategie = StrategieComptage()
+        contexte = NotificationContext(strategie)
+        with contexte.regrouper():
+            contexte.notifier("Premier", ["A", "B"])
+            contexte.notifier("Second", ["A"])
+            self.assertEqual(strategie.recus, [])
+        self.assertEqual(len(strategie.recus), 2)
+        recus = dict(strategie.recus)
+        self.assertIn("- Premier", recus["A"])
+        self.assertIn("- Second", recus["A"])
+        self.assertEqual(recus["B"], "Premier")
+
+    def test_par_strategie(self):
+        email, sms = StrategieComptage(), StrategieComptage()
+        contexte = NotificationContext(email)
+        with contexte.regrouper():
+            contexte.notifier("Premier", ["A"])
+            contexte.set_strategy(sms)
+            contexte.notifier("Second", ["A"])
+        self.assertEqual(email.recus, [("A", "Premier")])
+        self.assertEqual(sms.recus, [("A", "Second")])
+
+    def test_batch_projet(self):
+        projet = Projet("FRAISEN", "", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        strategie = StrategieComptage()
+        projet.set_notification_strategy(strategie)
+        with projet.batch():
+            for i in range(50):
+                projet.ajouter_membre_equipe(f"Membre {i}")
+            with projet.batch():
+                projet.definir_budget(700000)
+            self.assertEqual(len(projet.activites), 0)
+        self.assertEqual(len(strategie.recus), 50)
+        self.assertEqual(len(projet.activites), 51)
+        self.assertEqual(next(iter(projet.activites)), "Membre ajouté: Membre 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
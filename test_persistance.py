@@ -0,0 +1,168 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from aide_tests import DEBUT, creer_tache
+from chemin_critique import CycleDependancesError
+from gestion_projet import Jalon, Membre, Projet, Risque, Tache
+from persistance import Depot, Instantane, ecrire_instantane
+
+
+class TestPersistance(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.depot = Depot(self.dossier.name)
+        self.projet = Projet("FRAISEN", "Réseau FRAISEN", DEBUT, datetime(2024, 12, 31))
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+        self.projet.ajouter_membre_equipe("Ousmane Mbathie")
+        self.projet.definir_budget(700000)
+        self.projet.ajouter_risque(Risque("Retard de livraison", 0.3, "Moyen"))
+        self.projet.ajouter_jalon(Jalon("Phase 1 terminée", datetime(2024, 6, 1)))
+        self.projet.enregistrer_changement("Changement de la portée du projet", 2)
+        precedente = None
+        for i in range(50):
+            tache = creer_tache(f"Tâche {i}", 3, self.membre, DEBUT + timedelta(days=i))
+            if precedente is not None:
+                tache.ajouter_dependance(precedente)
+            self.projet.ajouter_tache(tache)
+            precedente = tache
+
+    def tearDown(self):
+        self.depot.fermer()
+        self.dossier.cleanup()
+
+    def verifier_identique(self, projet: Projet, attendu: Projet):
+        self.assertEqual(projet.nom, attendu.nom)
+        self.assertEqual(projet.budget, attendu.budget)
+        self.assertEqual(list(projet.equipe), list(attendu.equipe))
+        self.assertEqual(list(projet.changements), list(attendu.changements))
+        self.assertEqual(
+            [(r.description, r.probabilite, r.impact) for r in projet.risques],
+            [(r.description, r.probabilite, r.impact) for r in attendu.risques],
+        )
+        self.assertEqual(
+            [(getattr(j, "nom", j), getattr(j, "date", None)) for j in projet.jalons],
+            [(getattr(j, "nom", j), getattr(j, "date", None)) for j in attendu.jalons],
+        )
+        self.assertEqual(len(projet.taches), len(attendu.taches))
+        for tache, modele in zip(projet.taches, attendu.taches):
+            self.assertEqual(
+                (tache.nom, tache.date_debut, tache.date_fin, tache.statut),
+                (modele.nom, modele.date_debut, modele.date_fin, modele.statut),
+            )
+            self.assertEqual(
+                [d.nom for d in tache.dependances], [d.nom for d in modele.dependances]
+            )
+            self.assertEqual(tache.responsable.nom, modele.responsable.nom)
+
+    def test_instantane_paresseux(self):
+        self.depot.sauvegarder(self.projet)
+        charge = Depot(self.dossier.name).charger()
+        self.assertEqual(charge.taches.nb_construits, 0)
+        derniere = charge.taches[-1]
+        self.assertEqual(derniere.nom, "Tâche 49")
+        self.assertIs(derniere.dependances[0], charge.taches[48])
+        self.assertIs(charge.taches[3].responsable, charge.taches[4].responsable)
+        self.verifier_identique(charge, self.projet)
+        # Les cycles sont refusés avant même la construction du planning
+        with self.assertRaises(CycleDependancesError):
+            charge.taches[0].ajouter_dependance(derniere)
+        self.assertEqual(charge.taches[0].dependances, ())
+        self.assertEqual(
+            charge.calculer_chemin_critique(), self.projet.calculer_chemin_critique()
+        )
+
+    def test_journal_incremental(self):
+        self.depot.sauvegarder(self.projet)
+        taille_instantane = os.path.getsize(self.depot.chemin_instantane)
+
+        nouvelle = creer_tache("Tâche 50", 3, self.membre, DEBUT + timedelta(days=60))
+        nouvelle.ajouter_dependance(self.projet.taches[10])
+        self.projet.ajouter_tache(nouvelle)
+        self.projet.taches[5].mettre_a_jour_statut("Terminée")
+        self.projet.taches[7].date_fin = DEBUT + timedelta(days=40)
+        self.projet.taches[20].ajouter_dependance(nouvelle)
+        self.projet.ajouter_membre_equipe("Mouhamed Koné")
+        autre = Tache("Tâche 51", "", DEBUT, DEBUT + timedelta(days=1), Membre("Mouhamed Koné", "Designer"), "En cours")
+        self.projet.ajouter_tache(autre)
+        self.projet.definir_budget(800000)
+        self.projet.ajouter_jalon("Phase 2 terminée")
+        self.depot.synchroniser()
+
+        self.assertEqual(os.path.getsize(self.depot.chemin_instantane), taille_instantane)
+        self.assertGreater(os.path.getsize(self.depot.chemin_journal), 0)
+
+        depot = Depot(self.dossier.name)
+        charge = depot.charger()
+        self.verifier_identique(charge, self.projet)
+        self.assertEqual(charge.taches[51].responsable.role, "Designer")
+        with self.assertRaises(CycleDependancesError):
+            charge.taches[10].ajouter_dependance(charge.taches[50])
+
+        # Les mutations du projet chargé sont journalisées à leur tour
+        charge.taches[0].mettre_a_jour_statut("En cours")
+        depot.fermer()
+        self.assertEqual(Depot(self.dossier.name).charger().taches[0].statut, "En cours")
+
+    def test_projet_principal(self):
+        import main
+        projet = main.Projet("FRAISEN", "Réseau FRAISEN", DEBUT, datetime(2024, 12, 31))
+        projet.ajouter_membre_equipe(self.membre)
+        projet.ajouter_membre_equipe(Membre("Mouhamed Koné", "Designer"))
+        projet.definir_budget(700000)
+        projet.ajouter_risque(Risque("Retard de livraison", 0.3, "Moyen"))
+        projet.ajouter_jalon(Jalon("Phase 1 terminée", datetime(2024, 6, 1)))
+        for tache in self.projet.taches[:5]:
+            projet.ajouter_tache(tache)
+        projet.enregistrer_changement("Changement de la portée du projet")
+        projet.enregistrer_changement("Nouveau périmètre")
+        chemin = os.path.join(self.dossier.name, "principal.bin")
+        ecrire_instantane(projet, chemin)
+
+        charge = Instantane(chemin).projet()
+        self.assertIs(type(charge), main.Projet)
+        self.assertEqual(
+            (charge.nom, charge.description, charge.date_debut, charge.date_fin),
+            (projet.nom, projet.description, projet.date_debut, projet.date_fin),
+        )
+        self.assertEqual((charge.budget, charge.version), (700000, 3))
+        self.assertEqual(
+            [(m.nom, m.role) for m in charge.equipe.obtenir_membres()],
+            [("Ousmane Mbathie", "Manager"), ("Mouhamed Koné", "Designer")],
+        )
+        self.assertIs(charge.taches[0].responsable, charge.equipe.obtenir_membres()[0])
+        self.assertEqual(
+            [(c.description, c.version, c.date) for c in charge.changements],
+            [(c.description, c.version, c.date) for c in projet.changements],
+        )
+        self.assertEqual(
+            [(r.description, r.probabilite, r.impact) for r in charge.risques],
+            [(r.description, r.probabilite, r.impact) for r in projet.risques],
+        )
+        self.assertEqual(
+            [(j.nom, j.date) for j in charge.jalons_entre(DEBUT, datetime(2024, 12, 31))],
+            [(j.nom, j.date) for j in projet.jalons],
+        )
+        for tache, modele in zip(charge.taches, projet.taches):
+            self.assertEqual(
+                (tache.nom, tache.description, tache.date_debut, tache.date_fin, tache.statut),
+                (modele.nom, modele.description, modele.date_debut, modele.date_fin, modele.statut),
+            )
+            self.assertEqual(
+                [d.nom for d in tache.dependances], [d.nom for d in modele.dependances]
+            )
+        self.assertEqual(len(charge.taches), 5)
+        self.assertIs(charge.trouver_tache("Tâche 4"), charge.taches[4])
+
+    def test_enregistrement_tronque(self):
+        self.depot.sauvegarder(self.projet)
+        self.projet.definir_budget(1)
+        self.projet.definir_budget(2)
+        self.depot.fermer()
+        with open(self.depot.chemin_journal, "r+b") as fichier:
+            fichier.truncate(os.path.getsize(self.depot.chemin_journal) - 3)
+        self.assertEqual(Depot(self.dossier.name).charger().budget, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from chemin_critique import calculer_cpm
+from gestion_projet import Jalon, Membre, Projet, Risque, Tache
+from persistance import ecrire_instantane, serialiser
+from portefeuille import Portefeuille
+
+DEBUT = datetime(2024, 1, 1)
+
+
+def projet_synthetique(numero: int) -> Projet:
+    projet = Projet(f"Réseau {numero}", "", DEBUT, DEBUT + timedelta(days=365))
+    membre = Membre("Ousmane", "Développeur")
+    precedentes = []
+    for i in range(20):
+        tache = Tache(
+            f"T{i}", "", DEBUT, DEBUT + timedelta(days=1 + (i * numero) % 5), membre, "En cours"
+        )
+        for dep in precedentes[-2:]:
+            tache.ajouter_dependance(dep)
+        projet.taches.append(tache)
+        precedentes.append(tache)
+    projet.jalons.append(Jalon("Phase 1", datetime(2024, 6, 1)))
+    projet.risques.append(Risque("Sous-traitant", 0.2, "Élevé"))
+    return projet
+
+
+class TestPortefeuille(unittest.TestCase):
+    def setUp(self):
+        self.portefeuille = Portefeuille(nb_processus=2, taille_lot=3)
+
+    def tearDown(self):
+        self.portefeuille.fermer()
+
+    def test_resultats_identiques_au_calcul_sequentiel(self):
+        projets = {f"p{i}": projet_synthetique(i) for i in range(10)}
+        resultats = {r.cle: r for r in self.portefeuille.traiter(projets)}
+        self.assertEqual(set(resultats), set(projets))
+        for cle, projet in projets.items():
+            attendu = calculer_cpm(projet.taches)
+            resultat = resultats[cle]
+            self.assertIsNone(resultat.erreur)
+            self.assertEqual(resultat.duree, attendu.duree)
+            self.assertEqual(
+                resultat.chemin_critique, tuple(t.nom for t in attendu.chemin_critique)
+            )
+            self.assertEqual(resultat.marges, tuple(attendu.marge[t] for t in projet.taches))
+            self.assertTrue(resultat.rapport.startswith(f"Rapport d'activité du projet '{projet.nom}'"))
+            # Les sections viennent du contenu de l'instantané
+            for tache in projet.taches:
+                self.assertIn(f"- {tache.nom}: En cours (Début: {tache.date_debut}", resultat.rapport)
+            self.assertIn("- Phase 1: 2024-06-01 00:00:00\n", resultat.rapport)
+            self.assertIn("- Sous-traitant: Probabilité 0.2, Impact Élevé\n", resultat.rapport)
+
+    def test_erreurs_isolees_par_projet(self):
+        cyclique = projet_synthetique(1)
+        cyclique.taches[0].ajouter_dependance(cyclique.taches[-1])
+        invalide = Projet("Textes", "", DEBUT, DEBUT)
+        invalide.taches.append("Analyse des besoins")
+        projets = [projet_synthetique(2), cyclique, invalide, projet_synthetique(3)]
+
+        resultats = {r.cle: r for r in self.portefeuille.traiter(projets)}
+        self.assertEqual(sorted(resultats), [0, 1, 2, 3])
+        self.assertIsNone(resultats[0].erreur)
+        self.assertIn("CycleDependancesError", resultats[1].erreur)
+        self.assertIn("TypeError", resultats[2].erreur)
+        self.assertIsNone(resultats[3].erreur)
+
+    def test_instantanes_deja_serialises(self):
+        projet = projet_synthetique(4)
+        attendu = calculer_cpm(projet.taches)
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "projet.bin")
+            ecrire_instantane(projet, chemin)
+            resultats = list(self.portefeuille.traiter({"octets": serialiser(projet), "fichier": chemin}))
+        self.assertEqual(len(resultats), 2)
+        for resultat in resultats:
+            self.assertEqual(resultat.duree, attendu.duree)
+
+
+if __name__ == "__main__":
+    unittest.main()
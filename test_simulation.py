@@ -0,0 +1,106 @@
+import time
+import unittest
+from datetime import timedelta
+from aide_tests import DEBUT, creer_reseau, creer_tache
+from chemin_critique import calculer_cpm
+from modeles import Membre, Risque
+
+try:
+    import numpy as np
+    from simulation import Simulation
+except ImportError:  # NumPy est optionnel
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy n'est pas installé")
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.membre = Membre("Ousmane Mbathie", "Manager")
+
+    def test_durees_fixes_identiques_au_cpm(self):
+        taches = creer_reseau(500, 1, self.membre)
+        resultat = Simulation(taches, graine=0).executer(200)
+        attendu = calculer_cpm(taches)
+        self.assertEqual(resultat.p50, attendu.duree)
+        self.assertEqual(resultat.p95, attendu.duree)
+        criticite = resultat.indices_criticite()
+        for tache in taches:
+            self.assertEqual(criticite[tache], 1.0 if attendu.marge[tache] == 0 else 0.0)
+
+    def test_moyennes_des_lois(self):
+        pert = creer_tache("PERT", 1, self.membre)
+        triangulaire = creer_tache("Triangulaire", 1, self.membre)
+        simulation = Simulation([pert, triangulaire], graine=3)
+        simulation.distribution(pert, 2, 4, 12)
+        simulation.distribution(triangulaire, 2, 4, 12, loi="triangulaire")
+        simulation._preparer_tirages()
+        durees = simulation._tirer_durees(np.random.default_rng(0), 200_000)
+        numeros = {tache: i for i, tache in enumerate(simulation.taches)}
+        self.assertAlmostEqual(durees[numeros[pert]].mean(), (2 + 4 * 4 + 12) / 6, delta=0.02)
+        self.assertAlmostEqual(durees[numeros[triangulaire]].mean(), (2 + 4 + 12) / 3, delta=0.02)
+        self.assertGreaterEqual(durees.min(), 2)
+        self.assertLessEqual(durees.max(), 12)
+
+    def test_risques(self):
+        a = creer_tache("A", 10, self.membre)
+        b = creer_tache("B", 5, self.membre)
+        b.ajouter_dependance(a)
+        simulation = Simulation([a, b], graine=1)
+        simulation.risque(Risque("Retard fournisseur", 1.0, "Élevé"), [a])
+        simulation.risque(Risque("Grève", 0.0, "Élevé"), [b], retard=100)
+        resultat = simulation.executer(100)
+        # Impact élevé : la moitié de la durée de A
+        self.assertEqual(resultat.p50, 20)
+
+        simulation = Simulation([a, b], graine=1)
+        simulation.risque(Risque("Pluie", 0.3, "Faible"), [a, b], retard=10)
+        resultat = simulation.executer(20_000)
+        self.assertAlmostEqual(float(np.mean(resultat.durees == 35)), 0.3, delta=0.02)
+        self.assertEqual(resultat.p95, 35)
+        self.assertEqual(resultat.date_percentile(50), DEBUT + timedelta(days=15))
+
+    def test_reproductible_quel_que_soit_le_nombre_de_threads(self):
+        taches = creer_reseau(300, 2, self.membre)
+        resultats = []
+        for nb_threads in (1, 3):
+            simulation = Simulation(taches, graine=42)
+            for tache in taches:
+                jours = (tache.date_fin - tache.date_debut).days
+                simulation.distribution(tache, jours * 0.5, jours, jours * 2)
+            resultats.append(simulation.executer(1000, taille_lot=128, nb_threads=nb_threads))
+        np.testing.assert_array_equal(resultats[0].durees, resultats[1].durees)
+        np.testing.assert_array_equal(resultats[0].criticite, resultats[1].criticite)
+        # Une nouvelle exécution de la même simulation refait les mêmes tirages
+        relance = simulation.executer(1000, taille_lot=128)
+        np.testing.assert_array_equal(relance.durees, resultats[1].durees)
+        self.assertLessEqual(resultats[0].p50, resultats[0].p80)
+        self.assertLessEqual(resultats[0].p80, resultats[0].p95)
+
+    def test_sans_tache(self):
+        resultat = Simulation([], graine=0).executer(50)
+        np.testing.assert_array_equal(resultat.durees, np.zeros(50))
+        self.assertEqual(resultat.p95, 0)
+        self.assertEqual(resultat.indices_criticite(), {})
+
+    def test_parametres_invalides(self):
+        tache = creer_tache("A", 3, self.membre)
+        simulation = Simulation([tache])
+        with self.assertRaises(ValueError):
+            simulation.distribution(tache, 5, 3, 8)
+        with self.assertRaises(ValueError):
+            simulation.distribution(tache, 1, 3, 8, loi="normale")
+
+    def test_10k_taches(self):
+        taches = creer_reseau(10_000, 4, self.membre)
+        simulation = Simulation(taches, graine=0)
+        for tache in taches:
+            jours = (tache.date_fin - tache.date_debut).days
+            simulation.distribution(tache, jours * 0.8, jours, jours * 1.5)
+        debut = time.perf_counter()
+        resultat = simulation.executer(5_000)
+        self.assertLess(time.perf_counter() - debut, 10.0)
+        self.assertEqual(len(resultat.durees), 5_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
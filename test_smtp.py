@@ -0,0 +1,205 @@
+import email
+import email.policy
+import smtplib
+import socketserver
+import threading
+import time
+import unittest
+
+from notifications import NotificationContext, SMTPNotificationStrategy
+
+
+class _Session(socketserver.StreamRequestHandler):
+    # Juste assez du protocole SMTP pour smtplib
+    def repondre(self, *lignes: str) -> None:
+        # Une réponse multiligne part en une seule écriture, comme chez un
+        # vrai serveur (sinon Nagle et l'ACK retardé ajoutent 40 ms)
+        self.wfile.write("".join(ligne + "\r\n" for ligne in lignes).encode("ascii"))
+
+    def handle(self):
+        serveur = self.server
+        with serveur.verrou:
+            serveur.connexions += 1
+        self.repondre("220 localhost ESMTP")
+        enveloppe = []
+        transactions = 0
+        while True:
+            ligne = self.rfile.readline()
+            if not ligne:
+                return
+            commande = ligne.decode("ascii").strip()
+            verbe = commande[:4].upper()
+            if serveur.latence:
+                time.sleep(serveur.latence)
+            if verbe == "EHLO":
+                self.repondre("250-localhost", "250 8BITMIME")
+            elif verbe == "HELO":
+                self.repondre("250 localhost")
+            elif verbe == "MAIL":
+                enveloppe = []
+                with serveur.verrou:
+                    indisponible = serveur.indisponible > 0
+                    serveur.indisponible -= indisponible
+                self.repondre("451 Reessayez plus tard" if indisponible else "250 OK")
+            elif verbe == "RCPT":
+                adresse = commande.split(":", 1)[1].strip().strip("<>")
+                if adresse in serveur.refuses:
+                    self.repondre("550 Destinataire inconnu")
+                else:
+                    enveloppe.append(adresse)
+                    self.repondre("250 OK")
+            elif verbe == "DATA":
+                self.repondre("354 Fin par <CRLF>.<CRLF>")
+                lignes = []
+                while True:
+                    ligne = self.rfile.readline()
+                    if ligne in (b".\r\n", b""):
+                        break
+                    lignes.append(ligne[1:] if ligne.startswith(b"..") else ligne)
+                with serveur.verrou:
+                    serveur.recus.append((list(enveloppe), b"".join(lignes)))
+                self.repondre("250 OK")
+                transactions += 1
+                if serveur.coupure and transactions >= serveur.coupure:
+                    # Le serveur ferme la session sans prévenir
+                    return
+            elif verbe in ("RSET", "NOOP"):
+                self.repondre("250 OK")
+            elif verbe == "QUIT":
+                self.repondre("221 Au revoir")
+                return
+            else:
+                self.repondre("502 Commande non gérée")
+
+
+class ServeurSMTPLocal(socketserver.ThreadingTCPServer):
+    # Serveur SMTP de substitution, dans un thread, sur un port libre
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latence: float = 0.0, coupure: int = 0):
+        super().__init__(("127.0.0.1", 0), _Session)
+        self.latence = latence
+        # Ferme chaque session après ce nombre de messages (0 : jamais)
+        self.coupure = coupure
+        self.refuses = set()
+        # Nombre de transactions encore refusées temporairement (4xx)
+        self.indisponible = 0
+        self.recus = []
+        self.connexions = 0
+        self.verrou = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class TestSMTP(unittest.TestCase):
+    def test_sessions_reutilisees_et_destinataires_groupes(self):
+        with ServeurSMTPLocal() as serveur:
+            strategie = SMTPNotificationStrategy(
+                "127.0.0.1", serveur.port, annuaire={"Ousmane": "ousmane@exemple.sn"},
+                max_destinataires=2,
+            )
+            contexte = NotificationContext(strategie)
+            contexte.notifier("Budget défini", ["Ousmane", "oumar@exemple.sn", "mouhamed@exemple.sn"])
+            strategie.envoyer("Tâche ajoutée", "Ousmane")
+            strategie.close()
+        self.assertEqual(serveur.connexions, 1)
+        self.assertEqual(
+            [enveloppe for enveloppe, _ in serveur.recus],
+            [["ousmane@exemple.sn", "oumar@exemple.sn"], ["mouhamed@exemple.sn"], ["ousmane@exemple.sn"]],
+        )
+        courriel = email.message_from_bytes(serveur.recus[0][1], policy=email.policy.default)
+        self.assertEqual(courriel.get_content().strip(), "Budget défini")
+
+    def test_reconnexion_apres_coupure(self):
+        with ServeurSMTPLocal(coupure=2) as serveur:
+            strategie = SMTPNotificationStrategy("127.0.0.1", serveur.port, taille_pool=1)
+            for i in range(5):
+                strategie.envoyer(f"Message {i}", "a@exemple.sn")
+            strategie.close()
+        self.assertEqual(len(serveur.recus), 5)
+        self.assertEqual(serveur.connexions, 3)
+        self.assertEqual(strategie.reconnexions, 2)
+
+    def test_refus_temporaire_sans_reconnexion(self):
+        with ServeurSMTPLocal() as serveur:
+            serveur.indisponible = 1
+            strategie = SMTPNotificationStrategy("127.0.0.1", serveur.port)
+            strategie.envoyer("Message", "a@exemple.sn")
+            strategie.close()
+        # Nouvelle tentative sur la même session
+        self.assertEqual(len(serveur.recus), 1)
+        self.assertEqual(serveur.connexions, 1)
+        self.assertEqual(strategie.reconnexions, 0)
+
+    def test_refus_definitif_et_adresse_inconnue(self):
+        with ServeurSMTPLocal() as serveur:
+            serveur.refuses.add("inconnu@exemple.sn")
+            strategie = SMTPNotificationStrategy("127.0.0.1", serveur.port)
+            with self.assertRaises(smtplib.SMTPRecipientsRefused):
+                strategie.envoyer("Message", "inconnu@exemple.sn")
+            with self.assertRaisesRegex(ValueError, "Adresse email inconnue"):
+                strategie.envoyer("Message", "Ousmane")
+            strategie.envoyer("Message", "a@exemple.sn")
+            # Refus partiel : les autres destinataires sont servis
+            strategie.envoyer_groupe("Message", ["b@exemple.sn", "inconnu@exemple.sn"])
+            strategie.close()
+        self.assertEqual(strategie.reconnexions, 0)
+        # Le refus n'a pas coûté la session
+        self.assertEqual(serveur.connexions, 1)
+        self.assertEqual(len(serveur.recus), 2)
+        self.assertEqual(serveur.recus[1][0], ["b@exemple.sn"])
+        self.assertEqual(list(strategie.refus), ["inconnu@exemple.sn"])
+        self.assertEqual(strategie.refus["inconnu@exemple.sn"][0], 550)
+
+    def test_pool_borne_et_debit(self):
+        with ServeurSMTPLocal(latence=0.01) as serveur:
+            strategie = SMTPNotificationStrategy(
+                "127.0.0.1", serveur.port,
+                taille_pool=2, messages_par_seconde=50,
+            )
+            debut = time.perf_counter()
+            threads = [
+                threading.Thread(target=strategie.envoyer, args=(f"Message {i}", "a@exemple.sn"))
+                for i in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            duree = time.perf_counter() - debut
+            strategie.close()
+        self.assertEqual(len(serveur.recus), 10)
+        self.assertLessEqual(serveur.connexions, 2)
+        # 10 messages à 50 par seconde : au moins 9 intervalles de 20 ms
+        self.assertGreaterEqual(duree, 0.18)
+
+    def test_debit_propre_a_chaque_strategie(self):
+        with ServeurSMTPLocal() as serveur:
+            lente = SMTPNotificationStrategy("127.0.0.1", serveur.port, messages_par_seconde=2)
+            rapide = SMTPNotificationStrategy("127.0.0.1", serveur.port, messages_par_seconde=100)
+            lente.envoyer("Message", "a@exemple.sn")
+            debut = time.perf_counter()
+            for i in range(4):
+                rapide.envoyer(f"Message {i}", "b@exemple.sn")
+            duree = time.perf_counter() - debut
+            lente.close()
+            rapide.close()
+        self.assertEqual(len(serveur.recus), 5)
+        # Avec le débit de la plus lente, il faudrait au moins 1,5 s
+        self.assertLess(duree, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import random
+import time
+import unittest
+from datetime import timedelta
+
+from aide_tests import DEBUT, creer_tache
+from chemin_critique import CycleDependancesError
+from main import Projet
+from modeles import Jalon, Membre, Risque, Tache
+from versions import CartePersistante, VecteurPersistant
+
+
+class CleFaible:
+    # Hachage volontairement pauvre pour forcer les collisions
+    def __init__(self, valeur: int):
+        self.valeur = valeur
+
+    def __hash__(self) -> int:
+        return self.valeur % 7
+
+    def __eq__(self, autre) -> bool:
+        return isinstance(autre, CleFaible) and autre.valeur == self.valeur
+
+    def __lt__(self, autre) -> bool:
+        return self.valeur < autre.valeur
+
+
+class TestCartePersistante(unittest.TestCase):
+    def verifier_contre_dict(self, fabriquer_cle):
+        aleatoire = random.Random(5)
+        carte = CartePersistante()
+        reference = {}
+        historique = []
+        for _ in range(2000):
+            cle = fabriquer_cle(aleatoire.randrange(400))
+            if aleatoire.random() < 0.3:
+                carte = carte.dissocier(cle)
+                reference.pop(cle, None)
+            else:
+                valeur = aleatoire.randrange(10)
+                carte = carte.associer(cle, valeur)
+                reference[cle] = valeur
+            historique.append((carte, dict(reference)))
+        # Chaque version intermédiaire est restée intacte
+        for ancienne, attendu in historique[::97]:
+            self.assertEqual(len(ancienne), len(attendu))
+            self.assertEqual(dict(ancienne.items()), attendu)
+            for cle, valeur in attendu.items():
+                self.assertEqual(ancienne[cle], valeur)
+        # Différences exactes entre deux versions quelconques
+        for _ in range(20):
+            (avant, dict_avant), (apres, dict_apres) = aleatoire.sample(historique, 2)
+            attendu = {
+                cle: (dict_avant.get(cle), dict_apres.get(cle))
+                for cle in dict_avant.keys() | dict_apres.keys()
+                if dict_avant.get(cle) != dict_apres.get(cle)
+            }
+            obtenu = {cle: (a, b) for cle, a, b in avant.differences(apres)}
+            self.assertEqual(obtenu, attendu)
+        # Construction d'un bloc, et différences avec la carte bâtie clé à clé
+        en_bloc = CartePersistante(reference.items())
+        self.assertEqual(len(en_bloc), len(reference))
+        self.assertEqual(dict(en_bloc.items()), reference)
+        self.assertEqual(list(en_bloc.differences(carte)), [])
+
+    def test_identique_a_un_dict(self):
+        self.verifier_contre_dict(lambda i: f"T{i}")
+
+    def test_collisions(self):
+        self.verifier_contre_dict(CleFaible)
+
+    def test_partage_et_differences_proportionnelles(self):
+        grande = CartePersistante((f"T{i}", i) for i in range(200_000))
+        modifiee = grande.associer("T17", -1).dissocier("T42").associer("Nouvelle", 0)
+        self.assertIs(grande.associer("T5", 5), grande)
+        self.assertIs(grande.dissocier("absente"), grande)
+
+        debut = time.perf_counter()
+        differences = sorted(grande.differences(modifiee))
+        ecoule = time.perf_counter() - debut
+        self.assertEqual(
+            differences,
+            [("Nouvelle", None, 0), ("T17", 17, -1), ("T42", 42, None)],
+        )
+        # Parcourir les 200 000 entrées prendrait bien plus longtemps
+        self.assertLess(ecoule, 0.01)
+
+    def test_vecteur(self):
+        vecteur = VecteurPersistant("abc")
+        plus_long = vecteur.ajouter("d").remplacer(0, "z")
+        self.assertEqual(list(vecteur), ["a", "b", "c"])
+        self.assertEqual(list(plus_long), ["z", "b", "c", "d"])
+        self.assertEqual(plus_long[-1], "d")
+        self.assertEqual(vecteur.differences(plus_long), [(0, "a", "z"), (3, None, "d")])
+        with self.assertRaises(IndexError):
+            vecteur[3]
+
+
+class TestVersionsProjet(unittest.TestCase):
+    def setUp(self):
+        self.debut = DEBUT
+        self.projet = Projet("Versions", "Projet versionné", self.debut, self.debut + timedelta(days=90))
+        self.membre = Membre("Ousmane", "Développeur")
+        self.projet.ajouter_membre_equipe(self.membre)
+        self.a = creer_tache("A", 3, self.membre)
+        self.b = creer_tache("B", 2, self.membre, self.debut + timedelta(days=3))
+        self.projet.ajouter_tache(self.a)
+        self.projet.ajouter_tache(self.b)
+        self.b.ajouter_dependance(self.a)
+
+    def test_versions_figees(self):
+        self.projet.enregistrer_changement("Planning initial")
+        self.b.date_fin = self.debut + timedelta(days=10)
+        self.b.mettre_a_jour_statut("En cours")
+        self.projet.ajouter_risque(Risque("Retard", 0.3, "Moyen"))
+        self.projet.definir_budget(1000)
+        self.projet.enregistrer_changement("Replanification")
+
+        v1 = self.projet.instantane(1)
+        v2 = self.projet.instantane(2)
+        self.assertEqual(v1.tache("B").date_fin, self.debut + timedelta(days=5))
+        self.assertEqual(v1.tache("B").statut, "Non commencée")
+        self.assertEqual(v1.tache("B").dependances, ("A",))
+        self.assertEqual(v2.tache("B").date_fin, self.debut + timedelta(days=10))
+        self.assertEqual(len(v1.risques), 0)
+        self.assertEqual([c.description for c in v2.changements], ["Planning initial", "Replanification"])
+        # Ce qui n'a pas changé est partagé, pas copié
+        self.assertIs(v1.tache("A"), v2.tache("A"))
+        self.assertIs(self.projet.instantane().taches, v2.taches)
+
+        differences = self.projet.comparer_versions(1, 2)
+        self.assertEqual(differences.taches_modifiees(), ["B"])
+        self.assertEqual(differences.proprietes, {"numero": (1, 2), "budget": (0.0, 1000)})
+        self.assertEqual(len(differences.risques), 1)
+        self.assertEqual(len(differences.changements), 1)
+        self.assertFalse(self.projet.comparer_versions(2, 2))
+        with self.assertRaisesRegex(ValueError, "Version inconnue"):
+            self.projet.instantane(7)
+
+    def test_branche_sans_effet_sur_le_projet(self):
+        self.projet.enregistrer_changement("Planning initial")
+        branche = self.projet.brancher(1)
+        branche.modifier_dates("A", self.debut, self.debut + timedelta(days=8))
+        branche.ajouter_tache(Tache("C", "", self.debut, self.debut + timedelta(days=2), self.membre, "Non commencée"))
+        branche.ajouter_dependance("C", "B")
+        branche.ajouter_jalon(Jalon("Recette", self.debut + timedelta(days=20)))
+        version = branche.enregistrer_changement("Scénario long")
+
+        self.assertEqual(version.numero, 2)
+        self.assertEqual(self.a.date_fin, self.debut + timedelta(days=3))
+        self.assertIsNone(self.projet.instantane().tache("C"))
+        self.assertEqual(self.projet.instantane(1).calculer_cpm().duree, 5)
+        planning = version.calculer_cpm()
+        self.assertEqual(planning.duree, 12)
+        self.assertEqual(planning.chemin_critique, ["A", "B", "C"])
+
+        differences = branche.differences()
+        self.assertEqual(differences.taches_ajoutees(), ["C"])
+        self.assertEqual(differences.taches_modifiees(), ["A"])
+        self.assertEqual(len(differences.jalons), 1)
+
+        with self.assertRaises(CycleDependancesError) as erreur:
+            branche.ajouter_dependance("A", "C")
+        self.assertEqual(erreur.exception.cycle, ["A", "C", "B", "A"])
+        self.assertEqual(branche.etat.tache("A").dependances, ())
+
+    def test_noms_en_double(self):
+        autre_b = creer_tache("B", 2, self.membre)
+        self.projet.ajouter_tache(autre_b)
+        self.projet.enregistrer_changement("Planning initial")
+        self.b.date_fin = self.debut + timedelta(days=6)
+        autre_b.date_fin = self.debut + timedelta(days=4)
+        self.projet.enregistrer_changement("Décalage")
+
+        for numero, fin_b, fin_autre in ((1, 5, 2), (2, 6, 4)):
+            version = self.projet.instantane(numero)
+            self.assertEqual(len(version.taches), 3)
+            self.assertEqual(version.tache("B").date_fin, self.debut + timedelta(days=fin_b))
+            self.assertEqual(version.tache("B#2").date_fin, self.debut + timedelta(days=fin_autre))
+            self.assertEqual(version.tache("B#2").nom, "B")
+        self.assertEqual(self.projet.comparer_versions(1, 2).taches_modifiees(), ["B", "B#2"])
+
+    def test_branche_noms_en_double(self):
+        branche = self.projet.brancher()
+        autre_a = Tache("A", "", self.debut, self.debut + timedelta(days=9), self.membre, "Non commencée")
+        autre_a.ajouter_dependance(self.b)
+        branche.ajouter_tache(autre_a)
+        # Clés attribuées comme dans le projet, sans écraser la première A
+        self.assertEqual(branche.etat.tache("A").date_fin, self.debut + timedelta(days=3))
+        self.assertEqual(branche.etat.tache("A#2").dependances, ("B",))
+        self.assertEqual(branche.differences().taches_ajoutees(), ["A#2"])
+        with self.assertRaisesRegex(ValueError, "Tâche déjà présente dans la branche: A$"):
+            branche.ajouter_tache(self.a)
+        with self.assertRaisesRegex(ValueError, "Tâche déjà présente dans la branche: A#2"):
+            branche.ajouter_tache(autre_a)
+        self.assertNotIn(autre_a, self.projet._cles)
+
+    def test_dependance_hors_projet(self):
+        # X n'est pas dans le projet : la version la fige avec A
+        x = Tache("X", "", self.debut, self.debut + timedelta(days=2), self.membre, "Non commencée")
+        self.a.ajouter_dependance(x)
+        self.projet.enregistrer_changement("Planning initial")
+        x.date_fin = self.debut + timedelta(days=4)
+        self.projet.enregistrer_changement("X rallongée")
+
+        self.assertEqual(self.projet.instantane(1).calculer_cpm().duree, 7)
+        planning = self.projet.instantane(2).calculer_cpm()
+        self.assertEqual(planning.duree, 9)
+        self.assertEqual(planning.chemin_critique, ["X", "A", "B"])
+        self.assertEqual(self.projet.comparer_versions(1, 2).taches_modifiees(), ["X"])
+
+
+if __name__ == "__main__":
+    unittest.main()
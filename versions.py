@@ -0,0 +1,565 @@
+from datetime import datetime
+from operator import attrgetter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from chemin_critique import CycleDependancesError, ResultatCPM, calculer_cpm_indices, duree
+from modeles import Changement, Jalon, Membre, Risque, Statut, Tache
+
+# Trie à table de hachage compressée (HAMT) : chaque noeud couvre 5 bits
+# du hachage, un masque de bits dit quelles branches existent et seules
+# celles-ci sont stockées dans un tuple. Une modification recopie le seul
+# chemin de la racine à la feuille (O(log32 n)) et partage tout le reste.
+_BITS = 5
+_MASQUE = (1 << _BITS) - 1
+_HACHAGE = (1 << 64) - 1
+
+
+class _Noeud:
+    __slots__ = ("bitmap", "enfants")
+
+    def __init__(self, bitmap: int, enfants: tuple):
+        self.bitmap = bitmap
+        self.enfants = enfants
+
+
+class _Collision:
+    # Clés distinctes de même hachage : une liste de paires, rare
+    __slots__ = ("hachage", "paires")
+
+    def __init__(self, hachage: int, paires: tuple):
+        self.hachage = hachage
+        self.paires = paires
+
+
+# Une feuille est un tuple (hachage, clé, valeur)
+_VIDE = _Noeud(0, ())
+
+
+def _hacher(cle) -> int:
+    return hash(cle) & _HACHAGE
+
+
+def _fusionner(a, hachage_a: int, b, hachage_b: int, decalage: int) -> _Noeud:
+    # Deux entrées de hachages différents sous un nouveau noeud ; on
+    # descend tant que leurs bits coïncident
+    i = (hachage_a >> decalage) & _MASQUE
+    j = (hachage_b >> decalage) & _MASQUE
+    if i == j:
+        return _Noeud(1 << i, (_fusionner(a, hachage_a, b, hachage_b, decalage + _BITS),))
+    return _Noeud((1 << i) | (1 << j), (a, b) if i < j else (b, a))
+
+
+def _associer(noeud: _Noeud, decalage: int, hachage: int, cle, valeur):
+    # Rend (noeud, clé ajoutée) ; le noeud d'origine si rien ne change
+    bit = 1 << ((hachage >> decalage) & _MASQUE)
+    i = (noeud.bitmap & (bit - 1)).bit_count()
+    enfants = noeud.enfants
+    if not noeud.bitmap & bit:
+        feuille = (hachage, cle, valeur)
+        return _Noeud(noeud.bitmap | bit, enfants[:i] + (feuille,) + enfants[i:]), True
+    enfant = enfants[i]
+    if type(enfant) is _Noeud:
+        nouveau, ajout = _associer(enfant, decalage + _BITS, hachage, cle, valeur)
+        if nouveau is enfant:
+            return noeud, False
+    elif type(enfant) is _Collision:
+        if enfant.hachage != hachage:
+            nouveau, ajout = _fusionner(enfant, enfant.hachage, (hachage, cle, valeur), hachage, decalage + _BITS), True
+        else:
+            paires = tuple(paire for paire in enfant.paires if paire[0] != cle)
+            ajout = len(paires) == len(enfant.paires)
+            nouveau = _Collision(hachage, paires + ((cle, valeur),))
+    else:
+        hachage_feuille, cle_feuille, valeur_feuille = enfant
+        if hachage_feuille != hachage:
+            nouveau, ajout = _fusionner(enfant, hachage_feuille, (hachage, cle, valeur), hachage, decalage + _BITS), True
+        elif cle_feuille is cle or cle_feuille == cle:
+            if valeur_feuille is valeur:
+                return noeud, False
+            nouveau, ajout = (hachage, cle, valeur), False
+        else:
+            nouveau, ajout = _Collision(hachage, ((cle_feuille, valeur_feuille), (cle, valeur))), True
+    return _Noeud(noeud.bitmap, enfants[:i] + (nouveau,) + enfants[i + 1:]), ajout
+
+
+def _dissocier(noeud: _Noeud, decalage: int, hachage: int, cle):
+    # Rend le noeud sans la clé : le même s'il ne la contenait pas, None
+    # s'il devient vide, sa dernière feuille s'il n'en reste qu'une
+    bit = 1 << ((hachage >> decalage) & _MASQUE)
+    if not noeud.bitmap & bit:
+        return noeud
+    i = (noeud.bitmap & (bit - 1)).bit_count()
+    enfant = noeud.enfants[i]
+    if type(enfant) is _Noeud:
+        nouveau = _dissocier(enfant, decalage + _BITS, hachage, cle)
+        if nouveau is enfant:
+            return noeud
+    elif type(enfant) is _Collision:
+        paires = tuple(paire for paire in enfant.paires if paire[0] != cle)
+        if len(paires) == len(enfant.paires):
+            return noeud
+        nouveau = (hachage,) + paires[0] if len(paires) == 1 else _Collision(hachage, paires)
+    else:
+        if enfant[0] != hachage or not (enfant[1] is cle or enfant[1] == cle):
+            return noeud
+        nouveau = None
+    if nouveau is None:
+        enfants = noeud.enfants[:i] + noeud.enfants[i + 1:]
+        if not enfants:
+            return None
+        if len(enfants) == 1 and type(enfants[0]) is not _Noeud and decalage:
+            return enfants[0]
+        return _Noeud(noeud.bitmap & ~bit, enfants)
+    return _Noeud(noeud.bitmap, noeud.enfants[:i] + (nouveau,) + noeud.enfants[i + 1:])
+
+
+def _construire(feuilles: List[Tuple], decalage: int) -> _Noeud:
+    # Noeud d'un lot de feuilles (hachage, clé, valeur) de clés distinctes,
+    # bâti en une passe par niveau au lieu d'une insertion à la fois
+    groupes: Dict[int, List[Tuple]] = {}
+    for feuille in feuilles:
+        groupes.setdefault((feuille[0] >> decalage) & _MASQUE, []).append(feuille)
+    bitmap = 0
+    enfants = []
+    for position in sorted(groupes):
+        bitmap |= 1 << position
+        groupe = groupes[position]
+        if len(groupe) == 1:
+            enfants.append(groupe[0])
+        elif all(feuille[0] == groupe[0][0] for feuille in groupe):
+            enfants.append(_Collision(groupe[0][0], tuple((cle, valeur) for _, cle, valeur in groupe)))
+        else:
+            enfants.append(_construire(groupe, decalage + _BITS))
+    return _Noeud(bitmap, tuple(enfants))
+
+
+def _entrees(element) -> Iterator[Tuple]:
+    if type(element) is _Noeud:
+        for enfant in element.enfants:
+            yield from _entrees(enfant)
+    elif type(element) is _Collision:
+        yield from element.paires
+    else:
+        yield element[1], element[2]
+
+
+def _comparer(avant, apres) -> Iterator[Tuple]:
+    # Deux sous-arbres de formes différentes : ils sont petits (ou font
+    # partie des différences), on compare leurs entrées directement
+    anciennes = dict(_entrees(avant)) if avant is not None else {}
+    nouvelles = dict(_entrees(apres)) if apres is not None else {}
+    for cle, valeur in anciennes.items():
+        autre = nouvelles.get(cle)
+        if cle not in nouvelles:
+            yield cle, valeur, None
+        elif autre is not valeur and autre != valeur:
+            yield cle, valeur, autre
+    for cle, valeur in nouvelles.items():
+        if cle not in anciennes:
+            yield cle, None, valeur
+
+
+def _differences(avant, apres) -> Iterator[Tuple]:
+    # Les sous-arbres partagés (le même objet) sont sautés sans être lus
+    if avant is apres:
+        return
+    if type(avant) is not _Noeud or type(apres) is not _Noeud:
+        yield from _comparer(avant, apres)
+        return
+    union = avant.bitmap | apres.bitmap
+    while union:
+        bit = union & -union
+        union ^= bit
+        gauche = droite = None
+        if avant.bitmap & bit:
+            gauche = avant.enfants[(avant.bitmap & (bit - 1)).bit_count()]
+        if apres.bitmap & bit:
+            droite = apres.enfants[(apres.bitmap & (bit - 1)).bit_count()]
+        yield from _differences(gauche, droite)
+
+
+class CartePersistante:
+    # Dictionnaire immuable : associer() et dissocier() rendent une nouvelle
+    # carte qui partage avec l'ancienne tout ce qui n'a pas changé
+    __slots__ = ("_racine", "_taille")
+
+    def __init__(self, elements: Iterable[Tuple[Hashable, object]] = ()):
+        self._taille = 0
+        self._racine, self._taille = self._fusionner_lot(elements)
+
+    def _fusionner_lot(self, elements: Iterable[Tuple[Hashable, object]]) -> Tuple[_Noeud, int]:
+        # Sur une carte vide, le lot est bâti d'un bloc ; sinon inséré clé à clé
+        if not self._taille:
+            lot = dict(elements)
+            if not lot:
+                return _VIDE, 0
+            return _construire([(_hacher(cle), cle, valeur) for cle, valeur in lot.items()], 0), len(lot)
+        racine, taille = self._racine, self._taille
+        for cle, valeur in elements:
+            racine, ajout = _associer(racine, 0, _hacher(cle), cle, valeur)
+            taille += ajout
+        return racine, taille
+
+    @classmethod
+    def _depuis(cls, racine: _Noeud, taille: int) -> "CartePersistante":
+        carte = cls.__new__(cls)
+        carte._racine = racine
+        carte._taille = taille
+        return carte
+
+    def __len__(self) -> int:
+        return self._taille
+
+    def __iter__(self) -> Iterator:
+        return (cle for cle, _ in _entrees(self._racine))
+
+    def __contains__(self, cle) -> bool:
+        return self.obtenir(cle, _VIDE) is not _VIDE
+
+    def __getitem__(self, cle):
+        valeur = self.obtenir(cle, _VIDE)
+        if valeur is _VIDE:
+            raise KeyError(cle)
+        return valeur
+
+    def items(self) -> Iterator[Tuple]:
+        return _entrees(self._racine)
+
+    def obtenir(self, cle, defaut=None):
+        hachage = _hacher(cle)
+        noeud = self._racine
+        decalage = 0
+        while True:
+            bit = 1 << ((hachage >> decalage) & _MASQUE)
+            if not noeud.bitmap & bit:
+                return defaut
+            noeud = noeud.enfants[(noeud.bitmap & (bit - 1)).bit_count()]
+            if type(noeud) is _Noeud:
+                decalage += _BITS
+            elif type(noeud) is _Collision:
+                return next((v for c, v in noeud.paires if c == cle), defaut)
+            elif noeud[0] == hachage and (noeud[1] is cle or noeud[1] == cle):
+                return noeud[2]
+            else:
+                return defaut
+
+    def associer(self, cle, valeur) -> "CartePersistante":
+        racine, ajout = _associer(self._racine, 0, _hacher(cle), cle, valeur)
+        if racine is self._racine:
+            return self
+        return self._depuis(racine, self._taille + ajout)
+
+    def mettre_a_jour(self, elements: Iterable[Tuple[Hashable, object]]) -> "CartePersistante":
+        racine, taille = self._fusionner_lot(elements)
+        return self if racine is self._racine else self._depuis(racine, taille)
+
+    def dissocier(self, cle) -> "CartePersistante":
+        racine = _dissocier(self._racine, 0, _hacher(cle), cle)
+        if racine is self._racine:
+            return self
+        return self._depuis(racine or _VIDE, self._taille - 1)
+
+    def differences(self, autre: "CartePersistante") -> Iterator[Tuple]:
+        # (clé, avant, après), None du côté où la clé est absente ; le coût
+        # suit le nombre de différences, pas la taille des cartes
+        return _differences(self._racine, autre._racine)
+
+
+class VecteurPersistant:
+    # Liste immuable sur la même structure, indexée par position : les
+    # petits entiers étant leur propre hachage, le trie est celui d'un
+    # vecteur persistant classique
+    __slots__ = ("_carte",)
+
+    def __init__(self, elements: Iterable = ()):
+        self._carte = CartePersistante(enumerate(elements))
+
+    def __len__(self) -> int:
+        return len(self._carte)
+
+    def __getitem__(self, position: int):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._carte.obtenir(position)
+
+    def __iter__(self) -> Iterator:
+        return (self._carte.obtenir(i) for i in range(len(self)))
+
+    def _avec(self, carte: CartePersistante) -> "VecteurPersistant":
+        vecteur = VecteurPersistant.__new__(VecteurPersistant)
+        vecteur._carte = carte
+        return vecteur
+
+    def ajouter(self, valeur) -> "VecteurPersistant":
+        return self._avec(self._carte.associer(len(self), valeur))
+
+    def etendre(self, valeurs: Iterable) -> "VecteurPersistant":
+        carte = self._carte
+        for valeur in valeurs:
+            carte = carte.associer(len(carte), valeur)
+        return self if carte is self._carte else self._avec(carte)
+
+    def remplacer(self, position: int, valeur) -> "VecteurPersistant":
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._avec(self._carte.associer(position, valeur))
+
+    def differences(self, autre: "VecteurPersistant") -> List[Tuple]:
+        return sorted(self._carte.differences(autre._carte), key=lambda difference: difference[0])
+
+
+# États figés des éléments du projet. Les tâches sont rangées sous une clé
+# stable, leur nom (suffixé « #2 », « #3 »… quand une autre tâche le porte
+# déjà), et référencent leurs dépendances par clé : une version ne retient
+# aucun objet modifiable.
+class EtatTache(NamedTuple):
+    nom: str
+    description: str
+    date_debut: datetime
+    date_fin: datetime
+    responsable: Optional[Membre]
+    statut: str
+    dependances: Tuple[str, ...]
+
+    @classmethod
+    def depuis(cls, tache: Tache, cle: Callable[[Tache], str] = attrgetter("nom")) -> "EtatTache":
+        return cls(
+            tache.nom, tache.description, tache.date_debut, tache.date_fin,
+            tache.responsable, tache.statut,
+            tuple(map(cle, tache.dependances)),
+        )
+
+
+class EtatRisque(NamedTuple):
+    description: str
+    probabilite: float
+    impact: str
+
+    @classmethod
+    def depuis(cls, risque: Risque) -> "EtatRisque":
+        return cls(risque.description, risque.probabilite, risque.impact)
+
+
+class EtatJalon(NamedTuple):
+    nom: str
+    date: datetime
+
+    @classmethod
+    def depuis(cls, jalon: Jalon) -> "EtatJalon":
+        return cls(jalon.nom, jalon.date)
+
+
+class EtatChangement(NamedTuple):
+    description: str
+    version: int
+    date: datetime
+
+    @classmethod
+    def depuis(cls, changement: Changement) -> "EtatChangement":
+        return cls(changement.description, changement.version, changement.date)
+
+
+_PROPRIETES = ("numero", "nom", "description", "date_debut", "date_fin", "budget")
+_COLLECTIONS = ("equipe", "risques", "jalons", "changements")
+
+
+class Version(NamedTuple):
+    # Projet figé. Deux versions voisines partagent presque toute leur
+    # structure : en créer une coûte le nombre d'éléments modifiés.
+    numero: int
+    nom: str
+    description: str
+    date_debut: datetime
+    date_fin: datetime
+    budget: float
+    equipe: VecteurPersistant
+    taches: CartePersistante
+    risques: VecteurPersistant
+    jalons: VecteurPersistant
+    changements: VecteurPersistant
+
+    def tache(self, cle: str) -> Optional[EtatTache]:
+        return self.taches.obtenir(cle)
+
+    def differences(self, autre: "Version") -> "Differences":
+        proprietes = {
+            champ: (getattr(self, champ), getattr(autre, champ))
+            for champ in _PROPRIETES
+            if getattr(self, champ) != getattr(autre, champ)
+        }
+        return Differences(
+            proprietes,
+            sorted(self.taches.differences(autre.taches), key=lambda difference: difference[0]),
+            *(getattr(self, champ).differences(getattr(autre, champ)) for champ in _COLLECTIONS),
+        )
+
+    def calculer_cpm(self, calendrier=None) -> ResultatCPM:
+        # Planning de la version, indexé par clé de tâche
+        entrees = list(self.taches.items())
+        cles = [cle for cle, _ in entrees]
+        etats = [etat for _, etat in entrees]
+        index = {cle: i for i, cle in enumerate(cles)}
+        if calendrier is None:
+            durees = [duree(etat) for etat in etats]
+        else:
+            durees = calendrier.durees(etats)
+        calcul = calculer_cpm_indices(
+            durees, [[index[dep] for dep in etat.dependances] for etat in etats]
+        )
+        resultat = ResultatCPM([cles[i] for i in calcul.ordre])
+        resultat.duree = calcul.duree
+        if etats:
+            for champ in ("debut_tot", "fin_tot", "debut_tard", "fin_tard", "marge"):
+                setattr(resultat, champ, dict(zip(cles, getattr(calcul, champ))))
+        resultat.chemin_critique = [cles[i] for i in calcul.chemin_critique]
+        return resultat
+
+
+class Differences:
+    # Écarts entre deux versions. Les listes contiennent des triplets
+    # (clé, avant, après) : nom de tâche ou position dans la collection,
+    # None du côté où l'élément n'existe pas.
+    __slots__ = ("proprietes", "taches") + _COLLECTIONS
+
+    def __init__(self, proprietes: Dict, taches: List, equipe: List, risques: List, jalons: List, changements: List):
+        self.proprietes = proprietes
+        self.taches = taches
+        self.equipe = equipe
+        self.risques = risques
+        self.jalons = jalons
+        self.changements = changements
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, champ) for champ in self.__slots__)
+
+    def __len__(self) -> int:
+        return sum(len(getattr(self, champ)) for champ in self.__slots__)
+
+    def taches_ajoutees(self) -> List[str]:
+        return [nom for nom, avant, _ in self.taches if avant is None]
+
+    def taches_supprimees(self) -> List[str]:
+        return [nom for nom, _, apres in self.taches if apres is None]
+
+    def taches_modifiees(self) -> List[str]:
+        return [nom for nom, avant, apres in self.taches if avant is not None and apres is not None]
+
+
+def version_vide(numero: int, nom: str, description: str, date_debut: datetime, date_fin: datetime) -> Version:
+    return Version(
+        numero, nom, description, date_debut, date_fin, 0.0,
+        VecteurPersistant(), CartePersistante(), VecteurPersistant(), VecteurPersistant(), VecteurPersistant(),
+    )
+
+
+class Branche:
+    # Scénario « et si » : des modifications appliquées en copie sur écriture
+    # à une version, sans toucher au projet d'origine ni à ses tâches
+    def __init__(
+        self, origine: Version, numero: Optional[int] = None, cles: Optional[Dict[Tache, str]] = None
+    ):
+        self.origine = origine
+        self.etat = origine if numero is None else origine._replace(numero=numero)
+        self.versions: Dict[int, Version] = {}
+        # Clés des tâches déjà attribuées par le projet, lues sans y toucher ;
+        # celles des tâches nouvelles restent propres à la branche
+        self._cles_origine: Dict[Tache, str] = {} if cles is None else cles
+        self._cles: Dict[Tache, str] = {}
+
+    def _cle(self, tache: Tache) -> str:
+        # Même règle que le projet : le nom, suffixé s'il est déjà pris
+        cle = self._cles.get(tache) or self._cles_origine.get(tache)
+        if cle is None:
+            cle, n = tache.nom, 1
+            while self.etat.taches.obtenir(cle) is not None:
+                n += 1
+                cle = f"{tache.nom}#{n}"
+            self._cles[tache] = cle
+        return cle
+
+    def _tache(self, nom: str) -> EtatTache:
+        etat = self.etat.taches.obtenir(nom)
+        if etat is None:
+            raise KeyError(f"Tâche inconnue: {nom}")
+        return etat
+
+    def _remplacer_tache(self, nom: str, etat: EtatTache) -> None:
+        self.etat = self.etat._replace(taches=self.etat.taches.associer(nom, etat))
+
+    def ajouter_tache(self, tache: Tache) -> None:
+        cle = self._cle(tache)
+        if self.etat.taches.obtenir(cle) is not None:
+            raise ValueError(f"Tâche déjà présente dans la branche: {cle}")
+        etat = EtatTache.depuis(tache, self._cle)
+        for dep in etat.dependances:
+            self._tache(dep)
+        self._remplacer_tache(cle, etat)
+
+    def modifier_dates(self, nom: str, date_debut: datetime, date_fin: datetime) -> None:
+        self._remplacer_tache(nom, self._tache(nom)._replace(date_debut=date_debut, date_fin=date_fin))
+
+    def mettre_a_jour_statut(self, nom: str, statut: str) -> None:
+        self._remplacer_tache(nom, self._tache(nom)._replace(statut=Statut(statut)))
+
+    def ajouter_dependance(self, nom: str, dependance: str) -> None:
+        etat = self._tache(nom)
+        self._tache(dependance)
+        # Refusée si `nom` précède déjà `dependance`, comme dans le planning
+        chemin = self._chemin(dependance, nom)
+        if chemin is not None:
+            raise CycleDependancesError([nom] + chemin)
+        self._remplacer_tache(nom, etat._replace(dependances=etat.dependances + (dependance,)))
+
+    def _chemin(self, depart: str, arrivee: str) -> Optional[List[str]]:
+        # Chemin de dépendances depuis `depart` jusqu'à `arrivee`, s'il existe
+        taches = self.etat.taches
+        parents = {depart: None}
+        pile = [depart]
+        while pile:
+            nom = pile.pop()
+            if nom == arrivee:
+                chemin = []
+                while nom is not None:
+                    chemin.append(nom)
+                    nom = parents[nom]
+                chemin.reverse()
+                return chemin
+            for dep in taches.obtenir(nom).dependances:
+                if dep not in parents:
+                    parents[dep] = nom
+                    pile.append(dep)
+        return None
+
+    def retirer_dependance(self, nom: str, dependance: str) -> None:
+        etat = self._tache(nom)
+        self._remplacer_tache(
+            nom, etat._replace(dependances=tuple(dep for dep in etat.dependances if dep != dependance))
+        )
+
+    def definir_budget(self, budget: float) -> None:
+        self.etat = self.etat._replace(budget=budget)
+
+    def ajouter_membre_equipe(self, membre: Membre) -> None:
+        self.etat = self.etat._replace(equipe=self.etat.equipe.ajouter(membre))
+
+    def ajouter_risque(self, risque: Risque) -> None:
+        self.etat = self.etat._replace(risques=self.etat.risques.ajouter(EtatRisque.depuis(risque)))
+
+    def ajouter_jalon(self, jalon: Jalon) -> None:
+        self.etat = self.etat._replace(jalons=self.etat.jalons.ajouter(EtatJalon.depuis(jalon)))
+
+    def enregistrer_changement(self, description: str) -> Version:
+        # Fige la version courante de la branche, comme le projet
+        changement = EtatChangement(description, self.etat.numero, datetime.now())
+        version = self.etat._replace(changements=self.etat.changements.ajouter(changement))
+        self.versions[version.numero] = version
+        self.etat = version._replace(numero=version.numero + 1)
+        return version
+
+    def differences(self) -> Differences:
+        # Ce que la branche a changé depuis son origine
+        return self.origine.differences(self.etat)